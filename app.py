@@ -3,27 +3,47 @@ Job Shop Scheduling - Aplicación Flask
 Aplicación web para resolver problemas de Job Shop Scheduling usando MiniZinc
 """
 import os
+import gzip
 import json
+import uuid
 import datetime
 import minizinc
 from flask import Flask, render_template, request, redirect, url_for, flash, session, Response
 from werkzeug.utils import secure_filename
 
-from helpers.data_helper import load_env, allowed_file, get_test_files, parse_durations_from_dzn, get_test_path_for_model
-from helpers.minizinc_helper import solve_model
-from helpers.visualization_helper import generate_gantt_chart, generate_comparison_chart, generate_imbalance_chart
-from helpers.csv_helper import generate_single_result_csv, generate_comparison_csv
-from helpers.pdf_helper import generate_single_result_pdf, generate_comparison_pdf
+from helpers.data_helper import load_env, allowed_file, parse_durations_from_dzn, get_test_path_for_model
+from helpers.minizinc_helper import solve_model, parse_solve_options, describe_solve_options, OPTIMISATION_LEVELS
+from helpers.core_budget_helper import get_core_budget
+from helpers.admission_helper import get_admission_controller, current_client, current_max_wait, AdmissionRejected
+from helpers.process_limits_helper import current_run_token, cancel_run, peak_rss_from_result
+from helpers.warmstart_helper import (build_warm_start, build_history_start, parse_history_bound, bounded_outcome,
+                                      describe_history_start, strict_bound, fallback_results,
+                                      HISTORY_BOUND_MODES)
+from helpers.preflight_helper import preflight_check
+from helpers.history_helper import record_solve, best_known, strategy_summary
+from helpers.schedule_helper import pack_results, unpack_results, schedule_payload
+from helpers.upload_helper import (ingest_stream, ingest_file, instance_path, load_instance_metadata,
+                                   read_instance_preview, get_max_upload_bytes, UploadRejected)
+from helpers.http_cache_helper import (ensure_plotly_js, is_vendor_asset, mark_immutable, serve_precompressed,
+                                       compress_response, conditional_response, export_etag, not_modified)
+from helpers.flatten_helper import build_flatten_report, format_bytes, DEFAULT_TARGET_JOBS
+from helpers.registry_helper import MODELS, SOLVERS, model_supports_solver
+from helpers.catalogue_helper import get_instance_catalogue, CATALOGUE_ORDERS
+from helpers.selection_helper import select_configuration, describe_selection
 from controllers.controller_oplimit import extract_oplimit_results
 from controllers.controller_workers import extract_workers_results
 from controllers.controller_maintenance import extract_maintenance_results
-from controllers.controller_comparison import run_comparison_parallel
+from controllers.controller_comparison import (run_comparison_parallel, run_comparison_racing,
+                                               run_comparison_cooperative)
+from controllers.controller_rolling_horizon import run_rolling_horizon, parse_window_options
+from controllers.controller_selection import run_selection_plan
 
 load_env()
 
 UPLOAD_FOLDER = 'uploads'
 MODELS_FOLDER = 'models'
 ALLOWED_EXTENSIONS = {'dzn'}
+DEFAULT_TIMEOUT = 60
 
 app = Flask(__name__)
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
@@ -31,86 +51,128 @@ app.config['MODELS_FOLDER'] = MODELS_FOLDER
 app.config['SECRET_KEY'] = 'jobshop-scheduling-secret-key'
 app.config['SESSION_TYPE'] = 'filesystem'
 app.config['PERMANENT_SESSION_LIFETIME'] = 3600  # 1 hora
+# Margen sobre el tamaño máximo del .dzn para las cabeceras multipart
+app.config['MAX_CONTENT_LENGTH'] = get_max_upload_bytes() + 64 * 1024
+
+# Catálogo de tests precargados (dimensiones, cotas y mejor conocida), se refresca por mtime
+instance_catalogue = get_instance_catalogue(MODELS_FOLDER, MODELS)
+
+# Páginas y exportaciones con ETag y respuesta 304 a peticiones condicionales
+# Las exportaciones de comparación no se incluyen: son deliberadamente no cacheables
+CONDITIONAL_ENDPOINTS = {'show_results', 'compare', 'export_csv', 'export_pdf'}
+
+
+@app.before_request
+def identify_client():
+    """Asocia las resoluciones de la petición al cliente (reparto justo de huecos)"""
+    if 'client_id' not in session:
+        session['client_id'] = uuid.uuid4().hex
+    current_client.set(session['client_id'])
+    # Espera en cola corta por defecto (run_comparison la amplía)
+    current_max_wait.set(None)
+    # Token generado por el formulario para poder cancelar sus resoluciones
+    current_run_token.set(request.form.get('run_token') if request.method == 'POST' else None)
+
+
+@app.after_request
+def apply_http_caching(response):
+    """Caché inmutable de recursos versionados, ETag/304 y compresión de respuestas"""
+    if is_vendor_asset(request.path, app.static_url_path):
+        mark_immutable(response)
+        static_path = os.path.join(app.static_folder, request.path[len(app.static_url_path) + 1:])
+        return serve_precompressed(response, static_path, request.accept_encodings)
+    if request.method == 'GET' and request.endpoint in CONDITIONAL_ENDPOINTS:
+        response = conditional_response(response, request)
+    return compress_response(response, request.accept_encodings)
+
+
+@app.context_processor
+def inject_plotly_js():
+    """
+    URL del plotly.js local para las plantillas con gráficos
+
+    Se expone como función: plotly solo se importa (y el bundle se copia a
+    static/vendor) la primera vez que una plantilla con gráficos la llama.
+    """
+    return {'plotly_js_url': lambda: url_for('static', filename=ensure_plotly_js(app.static_folder))}
+
+
+@app.errorhandler(AdmissionRejected)
+def handle_admission_rejected(error):
+    """Responde 503 en lugar de lanzar más solvers cuando el servidor está saturado"""
+    response = app.make_response((
+        render_template('busy.html', message=str(error), retry_after=error.retry_after,
+                        admission=get_admission_controller().status()),
+        503
+    ))
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+
+@app.errorhandler(413)
+def handle_upload_too_large(error):
+    """Subida que excede MAX_CONTENT_LENGTH (Werkzeug la corta sin leerla entera)"""
+    flash(f'El archivo supera el tamaño máximo ({get_max_upload_bytes() // 1024} KB).', 'error')
+    return redirect(url_for('index'))
+
 
-MODELS = {
-    'jobshop_op_limit_1': {
-        'name': 'Operarios Limitados - Búsqueda Libre',
-        'file': 'jobshop_op_limit/jobshop_op_limit_1.mzn',
-        'description': 'Job Shop con k operarios. Búsqueda sin seq_search.',
-        'type': 'op_limit',
-        'category': 'Operarios Limitados'
-    },
-    'jobshop_op_limit_2': {
-        'name': 'Operarios Limitados - dom_w_deg + first_fail',
-        'file': 'jobshop_op_limit/jobshop_op_limit_2.mzn',
-        'description': 'Búsqueda: tiempo con dom_w_deg, operarios con first_fail.',
-        'type': 'op_limit',
-        'category': 'Operarios Limitados'
-    },
-    'jobshop_op_limit_3': {
-        'name': 'Operarios Limitados - Operario Primero',
-        'file': 'jobshop_op_limit/jobshop_op_limit_3.mzn',
-        'description': 'Búsqueda: operario primero con first_fail.',
-        'type': 'op_limit',
-        'category': 'Operarios Limitados'
-    },
-    'jobshop_workers_skills_1': {
-        'name': 'Habilidades de Operarios - Búsqueda Libre',
-        'file': 'jobshop_workers_skills/jobshop_workers_skills_1.mzn',
-        'description': 'Operarios especializados según habilidades. Búsqueda libre.',
-        'type': 'workers_skills',
-        'category': 'Habilidades de Operarios'
-    },
-    'jobshop_workers_skills_2': {
-        'name': 'Habilidades de Operarios - dom_w_deg + first_fail',
-        'file': 'jobshop_workers_skills/jobshop_workers_skills_2.mzn',
-        'description': 'Búsqueda: tiempo con dom_w_deg, asignación con first_fail.',
-        'type': 'workers_skills',
-        'category': 'Habilidades de Operarios'
-    },
-    'jobshop_maintenance_1': {
-        'name': 'Mantenimiento - Solución Directa',
-        'file': 'jobshop_maintenance/jobshop_maintenance_1.mzn',
-        'description': 'Job Shop con ventanas de mantenimiento. Búsqueda directa.',
-        'type': 'maintenance',
-        'category': 'Mantenimiento de Máquinas'
-    },
-    'jobshop_maintenance_2': {
-        'name': 'Mantenimiento - First-Fail',
-        'file': 'jobshop_maintenance/jobshop_maintenance_2.mzn',
-        'description': 'Con mantenimiento. Búsqueda: first_fail con indomain_min.',
-        'type': 'maintenance',
-        'category': 'Mantenimiento de Máquinas'
-    },
-    'jobshop_maintenance_3': {
-        'name': 'Mantenimiento - Input Order Random',
-        'file': 'jobshop_maintenance/jobshop_maintenance_3.mzn',
-        'description': 'Con mantenimiento. Búsqueda: input_order con indomain_random.',
-        'type': 'maintenance',
-        'category': 'Mantenimiento de Máquinas'
-    },
-    'jobshop_maintenance_4': {
-        'name': 'Mantenimiento - Búsqueda por Jobs',
-        'file': 'jobshop_maintenance/jobshop_maintenance_4.mzn',
-        'description': 'Con mantenimiento. Búsqueda secuencial por cada job.',
-        'type': 'maintenance',
-        'category': 'Mantenimiento de Máquinas'
+def get_session_data_path():
+    """Ruta del .dzn cargado en la sesión (almacén por contenido) o None"""
+    instance_hash = session.get('instance_hash')
+    if not instance_hash:
+        return None
+    try:
+        return instance_path(app.config['UPLOAD_FOLDER'], instance_hash)
+    except UploadRejected:
+        return None
+
+
+@app.route('/api/cancel/<run_token>', methods=['POST'])
+def cancel_run_request(run_token):
+    """
+    Cancela las resoluciones de una petición (el navegador lo envía al cerrar la pestaña)
+
+    Solo el cliente de la sesión que lanzó la petición puede cancelarla; con
+    cualquier otro el token no existe (404).
+    """
+    cancelled = cancel_run(run_token, session.get('client_id'))
+    if cancelled is None:
+        return {'error': 'Resolución no encontrada'}, 404
+    return {'cancelled': cancelled}
+
+
+@app.route('/api/history/<instance_hash>')
+def instance_history(instance_hash):
+    """Mejor solución conocida y resumen por estrategia de una instancia"""
+    return {
+        'best_known': best_known(instance_hash, request.args.get('model_type')),
+        'strategies': strategy_summary(instance_hash)
     }
-}
 
-SOLVERS = {
-    'org.gecode.gecode': 'Gecode',
-    'org.chuffed.chuffed': 'Chuffed',
-    'org.minizinc.mip.coin-bc': 'COIN-BC',
-    'org.minizinc.mip.highs': 'HiGHS',
-}
+
+@app.route('/health')
+def health():
+    """Comprobación de vida barata: no carga exportadores ni consulta MiniZinc"""
+    return {'status': 'ok', 'models': len(MODELS), 'solvers': len(SOLVERS)}
+
+
+@app.route('/api/admission_status')
+def admission_status():
+    """API con la ocupación de huecos de solver y la cola de espera"""
+    return get_admission_controller().status()
 
 
 @app.route('/')
 def index():
     """Página principal"""
     uploaded_file = session.get('uploaded_file', None)
-    uploaded_content = session.get('uploaded_content', None)
+    instance_hash = session.get('instance_hash', None)
+    dzn_content = read_instance_preview(app.config['UPLOAD_FOLDER'], instance_hash) if instance_hash else None
+    if instance_hash and dzn_content is None:
+        # La instancia ya no está en el almacén
+        session.pop('instance_hash', None)
+        session.pop('uploaded_file', None)
+        uploaded_file = None
     
     # Obtener modelo de la URL o de la sesión
     selected_model = request.args.get('model', None) or session.get('selected_model', None)
@@ -122,25 +184,64 @@ def index():
     model_info = MODELS.get(selected_model, None) if selected_model else None
     
     test_files = []
-    if selected_model:
-        test_files = get_test_files(app.config['MODELS_FOLDER'], selected_model, MODELS)
+    if model_info:
+        test_files = [entry['name'] for entry in instance_catalogue.instances(model_info['type'])]
+    
+    # El arranque en caliente requiere un resultado previo de la misma familia
+    previous_results = session.get('results')
+    warm_start_available = bool(
+        previous_results and model_info and previous_results.get('model_type') == model_info['type']
+    )
+    
+    # Mejor solución conocida de la instancia cargada (cota histórica)
+    history_best = None
+    if dzn_content is not None and model_info:
+        history_best = best_known(instance_hash, model_info['type'])
+    
+    # Configuración que elegiría la selección automática (con segunda opción)
+    auto_selection = None
+    if dzn_content is not None and model_info:
+        try:
+            with open(instance_path(app.config['UPLOAD_FOLDER'], instance_hash), 'r') as f:
+                auto_selection = select_configuration(f.read(), model_info['type'], MODELS, SOLVERS,
+                                                      DEFAULT_TIMEOUT, second_choice=True)
+        except (OSError, ValueError, UploadRejected):
+            auto_selection = None
     
     return render_template('index.html', 
                           models=MODELS, 
                           solvers=SOLVERS,
                           uploaded_file=uploaded_file,
-                          uploaded_content=uploaded_content,
-                          dzn_content=uploaded_content,  # Agregar alias para template
+                          instance_info=load_instance_metadata(app.config['UPLOAD_FOLDER'], instance_hash)
+                          if dzn_content is not None else None,
+                          dzn_content=dzn_content,
                           selected_model=selected_model,
                           model_info=model_info,
-                          test_files=test_files)
+                          test_files=test_files,
+                          warm_start_available=warm_start_available,
+                          previous_makespan=previous_results.get('makespan') if warm_start_available else None,
+                          history_best=history_best,
+                          auto_selection=auto_selection,
+                          history_bound_modes=HISTORY_BOUND_MODES,
+                          max_threads=get_core_budget().total_cores,
+                          optimisation_levels=OPTIMISATION_LEVELS)
 
 
 @app.route('/api/get_tests/<model_key>')
 def get_tests(model_key):
-    """API para obtener archivos de test de un modelo"""
-    test_files = get_test_files(app.config['MODELS_FOLDER'], model_key, MODELS)
-    return {'tests': test_files}
+    """
+    API con los tests de un modelo
+
+    'tests' mantiene la lista de nombres; 'instances' añade dimensiones,
+    cotas triviales y mejor makespan conocido. ?order=size ordena por
+    número de operaciones.
+    """
+    model_info = MODELS.get(model_key)
+    if not model_info:
+        return {'tests': [], 'instances': []}
+    order = request.args.get('order', 'name')
+    instances = instance_catalogue.instances(model_info['type'], order if order in CATALOGUE_ORDERS else 'name')
+    return {'tests': [entry['name'] for entry in instances], 'instances': instances}
 
 
 @app.route('/api/clear_test_data', methods=['POST'])
@@ -148,8 +249,7 @@ def clear_test_data():
     """API para limpiar datos de test cuando se cambia de modelo"""
     # Solo limpiar datos de archivo, mantener el modelo seleccionado
     session.pop('uploaded_file', None)
-    session.pop('uploaded_content', None)
-    session.pop('test_path', None)
+    session.pop('instance_hash', None)
     return {'status': 'ok'}
 
 
@@ -164,19 +264,21 @@ def load_test():
         return redirect(url_for('index'))
     
     model_info = MODELS[model_key]
-    test_path = get_test_path_for_model(app.config['MODELS_FOLDER'], model_info['type'], test_file)
-    
-    if not os.path.exists(test_path):
+    # Solo se cargan tests del catálogo (nombres conocidos, sin rutas arbitrarias)
+    if instance_catalogue.get(model_info['type'], test_file) is None:
         flash(f'Archivo de test no encontrado: {test_file}', 'error')
         return redirect(url_for('index'))
+    test_path = get_test_path_for_model(app.config['MODELS_FOLDER'], model_info['type'], test_file)
     
-    with open(test_path, 'r') as f:
-        content = f.read()
+    try:
+        instance = ingest_file(test_path, app.config['UPLOAD_FOLDER'])
+    except UploadRejected as e:
+        flash(f'Archivo de test no válido: {e}', 'error')
+        return redirect(url_for('index'))
     
     session['uploaded_file'] = test_file
-    session['uploaded_content'] = content
+    session['instance_hash'] = instance['hash']
     session['selected_model'] = model_key
-    session['test_path'] = test_path
     
     flash(f'Test cargado: {test_file}', 'success')
     return redirect(url_for('index'))
@@ -196,21 +298,19 @@ def upload_file():
     
     if file and allowed_file(file.filename, ALLOWED_EXTENSIONS):
         filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        
-        if not os.path.exists(app.config['UPLOAD_FOLDER']):
-            os.makedirs(app.config['UPLOAD_FOLDER'])
         
-        file.save(filepath)
-        
-        with open(filepath, 'r') as f:
-            content = f.read()
+        # Se guarda por contenido: nombres repetidos no se pisan y los duplicados no ocupan espacio
+        try:
+            instance = ingest_stream(file.stream, app.config['UPLOAD_FOLDER'])
+        except UploadRejected as e:
+            flash(f'Archivo rechazado: {e}', 'error')
+            return redirect(url_for('index'))
         
         session['uploaded_file'] = filename
-        session['uploaded_content'] = content
-        session['uploaded_path'] = filepath
+        session['instance_hash'] = instance['hash']
         
-        flash(f'Archivo subido correctamente: {filename}', 'success')
+        flash(f'Archivo subido correctamente: {filename} '
+              f'({instance["jobs"]} jobs x {instance["tasks"]} tareas)', 'success')
         return redirect(url_for('index'))
     
     flash('Tipo de archivo no permitido. Solo se aceptan archivos .dzn', 'error')
@@ -222,24 +322,144 @@ def run_model():
     """Ejecuta el modelo seleccionado con los datos cargados"""
     model_key = request.form.get('model')
     solver_key = request.form.get('solver', 'org.gecode.gecode')
-    timeout = int(request.form.get('timeout', 60))
+    timeout = int(request.form.get('timeout', DEFAULT_TIMEOUT))
+    solve_options = parse_solve_options(request.form)
     
     if model_key not in MODELS:
         flash('Modelo no válido.', 'error')
         return redirect(url_for('index'))
     
     uploaded_file = session.get('uploaded_file')
-    data_path = session.get('test_path') or session.get('uploaded_path')
+    data_path = get_session_data_path()
     
     if not data_path or not os.path.exists(data_path):
         flash('Debes cargar un archivo de datos primero.', 'error')
         return redirect(url_for('index'))
     
+    with open(data_path, 'r') as f:
+        dzn_content = f.read()
+    
     model_info = MODELS[model_key]
+    
+    # Selección automática: variante y solver de la familia predichos con el historial
+    selection = None
+    if request.form.get('auto_select'):
+        try:
+            selection = select_configuration(dzn_content, model_info['type'], MODELS, SOLVERS, timeout,
+                                             second_choice=bool(request.form.get('second_choice')))
+        except ValueError as e:
+            flash(f'No se pudieron calcular las características de la instancia: {e}', 'error')
+            return redirect(url_for('index'))
+        model_key, solver_key, _ = selection['plan'][0]
+        model_info = MODELS[model_key]
+    
+    if not model_supports_solver(model_info, solver_key):
+        flash(f'El modelo {model_info["name"]} no se ofrece con {SOLVERS.get(solver_key, solver_key)}.', 'error')
+        return redirect(url_for('index'))
+    
     model_path = os.path.join(app.config['MODELS_FOLDER'], model_info['file'])
     
+    # Comprobación previa: un .dzn incompatible falla aquí sin lanzar el solver
+    ok, preflight_message = preflight_check(model_path, data_path)
+    if not ok:
+        flash(f'Los datos no son compatibles con el modelo {model_info["name"]}: {preflight_message}', 'error')
+        return redirect(url_for('index'))
+    
+    # Descomposición por horizonte rodante para instancias grandes
+    if request.form.get('rolling_horizon'):
+        try:
+            window_size, overlap = parse_window_options(request.form)
+        except ValueError as e:
+            flash(str(e), 'error')
+            return redirect(url_for('index'))
+        try:
+            results = run_rolling_horizon(
+                model_key, data_path, solver_key, timeout, MODELS,
+                app.config['MODELS_FOLDER'], window_size, overlap, solve_options
+            )
+        except AdmissionRejected:
+            raise
+        except Exception as e:
+            flash(f'Error en el horizonte rodante: {type(e).__name__}: {e}', 'error')
+            return redirect(url_for('index'))
+        
+        results.update({
+            'model_name': model_info['name'],
+            'model_type': model_info['type'],
+            'solver': SOLVERS.get(solver_key, solver_key),
+            'solve_options': solve_options,
+            'solve_options_label': describe_solve_options(solve_options),
+            'data_file': uploaded_file
+        })
+        session['results'] = pack_results(results)
+        greedy_windows = results['rolling_horizon']['greedy_windows']
+        if greedy_windows:
+            flash(f'El solver no resolvió {len(greedy_windows)} de {len(results["rolling_horizon"]["windows"])} '
+                  f'ventanas ({", ".join(map(str, greedy_windows))}); se programaron por lista.', 'warning')
+        if results['validation_errors']:
+            flash(f'La programación por ventanas tiene {len(results["validation_errors"])} violaciones.', 'warning')
+        else:
+            flash(f'Horizonte rodante completado en {len(results["rolling_horizon"]["windows"])} ventanas. '
+                  f'Makespan: {results["makespan"]}', 'success')
+        return redirect(url_for('show_results'))
+    
+    # Arranque en caliente desde el resultado anterior de la sesión
+    warm_start = None
+    if request.form.get('warm_start'):
+        warm_start = build_warm_start(unpack_results(session.get('results')), dzn_content, model_info['type'])
+        if warm_start is None:
+            flash('El resultado anterior no es compatible con los datos actuales; se resuelve desde cero.', 'info')
+    
+    # Cota con la mejor solución conocida de esta instancia (historial)
+    history_start = None
+    history_mode = parse_history_bound(request.form)
+    if history_mode:
+        history_start = build_history_start(dzn_content, model_info['type'], history_mode)
+        if history_start is None:
+            flash('No hay soluciones anteriores de esta instancia en el historial; se resuelve sin cota.', 'info')
+    
+    extra_constraints = [constraint for start in (warm_start, history_start) if start
+                         for constraint in start['constraints']]
     try:
-        result = solve_model(model_path, data_path, solver_key, timeout)
+        if selection:
+            outcome = run_selection_plan(selection['plan'], data_path, MODELS, app.config['MODELS_FOLDER'],
+                                         solve_options, extra_constraints or None, history_start)
+            result, applied_options = outcome['result'], outcome['applied_options']
+            model_key, solver_key = outcome['model_key'], outcome['solver_key']
+            model_info = MODELS[model_key]
+        else:
+            result, applied_options = solve_model(
+                model_path, data_path, solver_key, timeout, solve_options,
+                extra_constraints=extra_constraints or None
+            )
+            record_solve(data_path, model_key, model_info['type'], solver_key, result, applied_options, timeout,
+                         strict_bound=strict_bound(history_start))
+        status_name = str(result.status).replace('Status.', '')
+        # Si el solver no mejora la cota se muestra la mejor programación disponible
+        fallback = fallback_results(status_name, warm_start, history_start)
+        
+        base_results = {
+            'model_name': model_info['name'],
+            'model_type': model_info['type'],
+            'solver': SOLVERS.get(solver_key, solver_key),
+            'solve_options': applied_options,
+            'solve_options_label': describe_solve_options(applied_options),
+            'data_file': uploaded_file,
+            'peak_rss_mb': peak_rss_from_result(result)
+        }
+        if warm_start:
+            base_results['warm_start_bound'] = warm_start['bound']
+        if selection:
+            base_results['selection'] = {
+                'label': describe_selection(selection, MODELS, SOLVERS),
+                'source': selection['source'],
+                'attempts': [{**attempt, 'solver': SOLVERS.get(attempt['solver_key'], attempt['solver_key'])}
+                             for attempt in outcome['attempts']]
+            }
+        if history_start:
+            base_results['history_bound'] = describe_history_start(
+                history_start, bounded_outcome(status_name, history_start)
+            )
         
         if result.status in [minizinc.Status.OPTIMAL_SOLUTION, minizinc.Status.SATISFIED, minizinc.Status.ALL_SOLUTIONS]:
             solve_time_delta = result.statistics.get('solveTime', datetime.timedelta(0))
@@ -249,16 +469,11 @@ def run_model():
                 'status': str(result.status).replace('Status.', ''),
                 'makespan': result['end'],
                 'execution_time': f"{execution_time:.4f} segundos",
-                'model_name': model_info['name'],
-                'model_type': model_info['type'],
-                'solver': SOLVERS.get(solver_key, solver_key),
-                'data_file': uploaded_file
+                **base_results
             }
             
             # Leer duraciones primero para los modelos que las necesiten
-            with open(data_path, 'r') as f:
-                dzn_lines = f.read()
-            durations = parse_durations_from_dzn(dzn_lines)
+            durations = parse_durations_from_dzn(dzn_content)
             results['durations'] = durations
             
             if model_info['type'] == 'op_limit':
@@ -273,11 +488,35 @@ def run_model():
                 specific_results = extract_maintenance_results(result)
                 results.update(specific_results)
             
-            session['results'] = results
+            session['results'] = pack_results(results)
             flash(f'Modelo ejecutado exitosamente. Makespan: {results["makespan"]}', 'success')
             return redirect(url_for('show_results'))
         
+        elif history_start and bounded_outcome(status_name, history_start) == 'proved_optimal':
+            # Ninguna solución mejora la mejor conocida: es óptima
+            results = {
+                'status': 'OPTIMAL_SOLUTION',
+                'execution_time': f"{result.statistics.get('solveTime', datetime.timedelta(0)).total_seconds():.4f} segundos",
+                **base_results,
+                **history_start['results']
+            }
+            session['results'] = pack_results(results)
+            flash(f'Óptimo demostrado: no existe solución mejor que la conocida. Makespan: {results["makespan"]}',
+                  'success')
+            return redirect(url_for('show_results'))
+        
+        elif fallback:
+            # Resolución acotada sin mejora (UNKNOWN o UNSATISFIABLE): la programación de partida es válida
+            results = {
+                **base_results,
+                **fallback
+            }
+            session['results'] = pack_results(results)
+            flash(f'El solver no mejoró la solución de partida. Makespan: {results["makespan"]}', 'info')
+            return redirect(url_for('show_results'))
+        
         elif result.status == minizinc.Status.UNSATISFIABLE:
+            # Solo sin cota: con cota se muestra la programación de partida
             flash('El modelo no tiene solución (UNSATISFIABLE). Verifica los datos de entrada.', 'warning')
         elif result.status == minizinc.Status.UNKNOWN:
             flash('No se encontró solución en el tiempo límite. Intenta aumentar el timeout.', 'warning')
@@ -304,6 +543,9 @@ def run_model():
         flash(f'Variable esperada no encontrada en la solución: {e}. Verifica que el modelo y los datos sean compatibles.', 'error')
         return redirect(url_for('index'))
     
+    except AdmissionRejected:
+        raise
+    
     except Exception as e:
         flash(f'Error inesperado: {type(e).__name__}: {e}', 'error')
         return redirect(url_for('index'))
@@ -312,52 +554,103 @@ def run_model():
 @app.route('/results')
 def show_results():
     """Muestra los resultados de la optimización"""
-    results = session.get('results', None)
+    results = unpack_results(session.get('results', None))
     if not results:
         flash('No hay resultados para mostrar.', 'info')
         return redirect(url_for('index'))
     
-    gantt_html = generate_gantt_chart(results)
-    results['gantt_chart'] = gantt_html
-    
+    # El Gantt se dibuja en el navegador a partir de /api/results/<id>/schedule
     return render_template('results.html', results=results)
 
 
+@app.route('/api/results/<result_id>/schedule')
+def result_schedule(result_id):
+    """
+    Programación de los resultados de la sesión en JSON columnar
+
+    La respuesta va comprimida con gzip (se descomprime si el cliente no lo
+    acepta) y lleva el result_id como ETag: el contenido nunca cambia para
+    un mismo identificador.
+    """
+    packed = session.get('results')
+    if not packed or packed.get('result_id') != result_id:
+        return {'error': 'Resultados no encontrados'}, 404
+    
+    payload = schedule_payload(packed)
+    response = Response(mimetype='application/json')
+    if 'gzip' in request.accept_encodings:
+        response.set_data(payload)
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response.set_data(gzip.decompress(payload))
+    response.headers['Vary'] = 'Accept-Encoding'
+    # Débil: el mismo contenido se sirve con y sin gzip
+    response.set_etag(result_id, weak=True)
+    response.cache_control.private = True
+    response.cache_control.max_age = 3600
+    return response.make_conditional(request)
+
+
 @app.route('/export_csv')
 def export_csv():
     """Exporta los resultados a CSV"""
-    results = session.get('results', None)
-    if not results:
+    packed = session.get('results', None)
+    if not packed:
         flash('No hay resultados para exportar.', 'error')
         return redirect(url_for('index'))
     
+    # El ETag sale de los resultados, sin generar el CSV
+    etag = export_etag(packed, 'csv')
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    
+    results = unpack_results(packed)
+    from helpers.csv_helper import generate_single_result_csv
     csv_content = generate_single_result_csv(results)
     model_type = results.get('model_type', 'jobshop')
     
-    return Response(
+    response = Response(
         csv_content,
         mimetype='text/csv',
         headers={'Content-disposition': f'attachment; filename=jobshop_{model_type}_results.csv'}
     )
+    response.set_etag(etag, weak=True)
+    return response
 
 
 @app.route('/export_pdf')
 def export_pdf():
     """Exporta los resultados a PDF"""
-    results = session.get('results', None)
-    if not results:
+    packed = session.get('results', None)
+    if not packed:
         flash('No hay resultados para exportar.', 'error')
         return redirect(url_for('index'))
     
-    pdf_buffer = generate_single_result_pdf(results)
+    # tables: auto, matrix (matrices completas paginadas) o summary (utilización)
+    table_mode = request.args.get('tables', 'auto')
+    # Exportadores cargados en el primer uso (ReportLab y Plotly no se importan al arrancar)
+    from helpers.pdf_helper import generate_single_result_pdf, TABLE_MODES
+    table_mode = table_mode if table_mode in TABLE_MODES else 'auto'
+    
+    # ReportLab incluye la fecha de creación: el ETag sale de las entradas, no del cuerpo
+    etag = export_etag(packed, 'pdf', table_mode)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    
+    results = unpack_results(packed)
+    pdf_buffer = generate_single_result_pdf(results, table_mode=table_mode)
     model_type = results.get('model_type', 'jobshop')
     filename = f'jobshop_{model_type}_results.pdf'
     
-    return Response(
+    response = Response(
         pdf_buffer.getvalue(),
         mimetype='application/pdf',
         headers={'Content-disposition': f'attachment; filename={filename}'}
     )
+    response.set_etag(etag, weak=True)
+    return response
 
 
 @app.route('/clear')
@@ -371,7 +664,10 @@ def clear_session():
 @app.route('/compare')
 def compare():
     """Página de comparación de estrategias"""
-    return render_template('compare.html', models=MODELS, solvers=SOLVERS, comparison_results=None)
+    return render_template('compare.html', models=MODELS, solvers=SOLVERS, comparison_results=None,
+                           history_bound_modes=HISTORY_BOUND_MODES,
+                           max_threads=get_core_budget().total_cores,
+                           optimisation_levels=OPTIMISATION_LEVELS)
 
 
 @app.route('/run_comparison', methods=['POST'])
@@ -381,23 +677,63 @@ def run_comparison():
     solver_key = request.form.get('solver', 'org.gecode.gecode')
     timeout = int(request.form.get('timeout', 60))
     selected_models = request.form.getlist('models')
+    solve_options = parse_solve_options(request.form)
+    comparison_mode = request.form.get('comparison_mode', 'independent')
+    history_bound = parse_history_bound(request.form)
     
     if not test_filename or not selected_models or len(selected_models) < 2:
         flash('Debes seleccionar un test y al menos 2 modelos para comparar.', 'error')
         return redirect(url_for('compare'))
     
+    # Rechazar de inmediato si los solvers de la comparación no caben en la cola
+    admission = get_admission_controller()
+    admission.ensure_capacity(len(selected_models))
+    # La capacidad ya está comprobada: los modelos de la comparación pueden
+    # esperarse entre sí (huecos por cliente) hasta la espera completa
+    current_max_wait.set(admission.max_wait)
+    
     # IMPORTANTE: Limpiar resultados anteriores de la sesión
     if 'comparison_results' in session:
         session.pop('comparison_results', None)
     
-    results_list = run_comparison_parallel(
-        selected_models, 
-        test_filename, 
-        solver_key, 
-        timeout, 
-        MODELS,
-        app.config['MODELS_FOLDER']
-    )
+    racing_rounds = None
+    cooperative_rounds = None
+    if comparison_mode == 'racing':
+        # En modo carrera el timeout es el presupuesto total de reloj
+        results_list, racing_rounds = run_comparison_racing(
+            selected_models,
+            test_filename,
+            solver_key,
+            timeout,
+            MODELS,
+            app.config['MODELS_FOLDER'],
+            solve_options=solve_options,
+            history_bound=history_bound
+        )
+    elif comparison_mode == 'cooperative':
+        # En modo cooperativo el timeout también es el presupuesto total de reloj
+        results_list, cooperative_rounds = run_comparison_cooperative(
+            selected_models,
+            test_filename,
+            solver_key,
+            timeout,
+            MODELS,
+            app.config['MODELS_FOLDER'],
+            solve_options=solve_options,
+            history_bound=history_bound
+        )
+    else:
+        comparison_mode = 'independent'
+        results_list = run_comparison_parallel(
+            selected_models, 
+            test_filename, 
+            solver_key, 
+            timeout, 
+            MODELS,
+            app.config['MODELS_FOLDER'],
+            solve_options=solve_options,
+            history_bound=history_bound
+        )
     
     if not results_list:
         flash('No se obtuvieron resultados de la comparación.', 'error')
@@ -421,6 +757,12 @@ def run_comparison():
     comparison_data = {
         'test_file': test_filename,
         'solver': SOLVERS.get(solver_key, solver_key),
+        'solve_options': solve_options,
+        'solve_options_label': describe_solve_options(solve_options),
+        'mode': comparison_mode,
+        'history_bound': HISTORY_BOUND_MODES.get(history_bound),
+        'racing_rounds': racing_rounds,
+        'cooperative_rounds': cooperative_rounds,
         'results': serializable_results
     }
     
@@ -434,6 +776,7 @@ def run_comparison():
     print(f"  - Número de resultados: {len(serializable_results)}")
     print(f"  - Modelos: {[r['model_name'] for r in serializable_results]}")
     
+    from helpers.visualization_helper import generate_comparison_chart, generate_imbalance_chart
     chart_html = generate_comparison_chart(serializable_results)
     imbalance_chart_html = generate_imbalance_chart(serializable_results)
     
@@ -445,7 +788,70 @@ def run_comparison():
     
     flash(f'Comparación completada. Mejor resultado: {serializable_results[0]["model_name"]} con makespan {serializable_results[0]["makespan"]}', 'success')
     
-    return render_template('compare.html', models=MODELS, solvers=SOLVERS, comparison_results=comparison_results)
+    return render_template('compare.html', models=MODELS, solvers=SOLVERS, comparison_results=comparison_results,
+                           history_bound_modes=HISTORY_BOUND_MODES,
+                           max_threads=get_core_budget().total_cores,
+                           optimisation_levels=OPTIMISATION_LEVELS)
+
+
+@app.route('/flatten_report', methods=['GET', 'POST'])
+def flatten_report():
+    """Informe del tamaño del modelo aplanado por modelo e instancia"""
+    # Primer modelo de cada tipo, usado para listar sus tests
+    model_types = {}
+    for key, model in MODELS.items():
+        model_types.setdefault(model['type'], {'model_key': key, 'category': model['category']})
+    
+    report = None
+    form = request.form if request.method == 'POST' else {}
+    
+    if request.method == 'POST':
+        model_type = request.form.get('model_type')
+        solver_key = request.form.get('solver', 'org.gecode.gecode')
+        test_filenames = request.form.getlist('test_files')
+        
+        if model_type not in model_types or not test_filenames:
+            flash('Selecciona un tipo de modelo y al menos un test.', 'error')
+            return redirect(url_for('flatten_report'))
+        
+        try:
+            target_jobs = [int(x) for x in request.form.get('target_jobs', '').split(',') if x.strip()]
+        except ValueError:
+            flash('Los jobs para extrapolar deben ser enteros separados por comas.', 'error')
+            return redirect(url_for('flatten_report'))
+        
+        # Solo tests del catálogo de la familia (nombres conocidos, sin rutas arbitrarias)
+        sizes = {entry['name']: entry['operations'] for entry in instance_catalogue.instances(model_type)}
+        unknown = [name for name in test_filenames if name not in sizes]
+        if unknown:
+            flash(f'Archivos de test no encontrados: {", ".join(unknown)}', 'error')
+            return redirect(url_for('flatten_report'))
+        
+        # Filas ordenadas por tamaño de instancia para ver el crecimiento del modelo aplanado
+        test_filenames = sorted(set(test_filenames), key=lambda name: (sizes[name], name))
+        data_paths = [get_test_path_for_model(app.config['MODELS_FOLDER'], model_type, name)
+                      for name in test_filenames]
+        model_keys = [key for key, model in MODELS.items() if model['type'] == model_type]
+        
+        get_admission_controller().ensure_capacity(1)
+        try:
+            rows = build_flatten_report(model_keys, MODELS, app.config['MODELS_FOLDER'], data_paths,
+                                        solver_key, target_jobs=target_jobs or DEFAULT_TARGET_JOBS)
+        except AdmissionRejected:
+            raise
+        except Exception as e:
+            flash(f'Error al generar el informe: {type(e).__name__}: {e}', 'error')
+            return redirect(url_for('flatten_report'))
+        
+        report = {
+            'model_type': model_type,
+            'solver': SOLVERS.get(solver_key, solver_key),
+            'rows': rows
+        }
+    
+    return render_template('flatten_report.html', model_types=model_types, solvers=SOLVERS,
+                           report=report, form=form, format_bytes=format_bytes,
+                           default_target_jobs=','.join(str(n) for n in DEFAULT_TARGET_JOBS))
 
 
 @app.route('/export_comparison_csv')
@@ -468,6 +874,7 @@ def export_comparison_csv():
         return redirect(url_for('compare'))
     
     try:
+        from helpers.csv_helper import generate_comparison_csv
         csv_content = generate_comparison_csv(comparison_results)
         
         # Agregar timestamp para evitar caché del navegador
@@ -509,7 +916,10 @@ def export_comparison_pdf():
         return redirect(url_for('compare'))
     
     try:
-        pdf_buffer = generate_comparison_pdf(comparison_results)
+        from helpers.pdf_helper import generate_comparison_pdf
+        timings = {}
+        pdf_buffer = generate_comparison_pdf(comparison_results, timings=timings)
+        app.logger.debug('Tiempos del PDF: %s', ', '.join(f'{name}={seconds:.3f}s' for name, seconds in timings.items()))
         test_file = comparison_results.get('test_file', 'comparison')
         
         # Agregar timestamp para evitar caché del navegador
@@ -523,7 +933,9 @@ def export_comparison_pdf():
                 'Content-disposition': f'attachment; filename={filename}',
                 'Cache-Control': 'no-cache, no-store, must-revalidate',
                 'Pragma': 'no-cache',
-                'Expires': '0'
+                'Expires': '0',
+                # Tiempo por sección (visible en las herramientas del navegador)
+                'Server-Timing': ', '.join(f'{name};dur={seconds * 1000:.1f}' for name, seconds in timings.items())
             }
         )
         return response
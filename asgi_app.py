@@ -0,0 +1,214 @@
+"""
+Servidor ASGI: endpoints asíncronos de resolución sobre la aplicación Flask
+
+Las rutas /api/async/* esperan a los solvers con la API asíncrona de
+python-minizinc, de modo que cientos de resoluciones largas comparten un
+único bucle de eventos en lugar de ocupar un hilo cada una. Si el cliente se
+desconecta, la resolución se cancela y el subproceso del solver termina.
+El resto de rutas las sirve la aplicación Flask existente.
+
+Ejecutar con:
+    uvicorn asgi_app:app --port 8080
+"""
+import io
+import json
+import uuid
+import asyncio
+
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route, Mount
+
+from app import app as flask_app
+from helpers.registry_helper import MODELS, SOLVERS
+from helpers.minizinc_helper import parse_solve_options
+from helpers.warmstart_helper import parse_history_bound
+from helpers.admission_helper import get_admission_controller, current_client, AdmissionRejected
+from helpers.process_limits_helper import current_run_token
+from helpers.upload_helper import ingest_stream, instance_path, UploadRejected
+from controllers.controller_async import (
+    AsyncSolveError, run_model_async, run_comparison_async, stream_solutions
+)
+
+
+# Intervalo (segundos) con el que se comprueba si el cliente sigue conectado
+DISCONNECT_POLL_INTERVAL = 0.5
+
+# Timeout máximo aceptado por los endpoints (segundos)
+MAX_TIMEOUT = 600
+
+MODELS_FOLDER = flask_app.config['MODELS_FOLDER']
+
+
+class ClientDisconnected(Exception):
+    """El cliente cerró la conexión antes de terminar la resolución"""
+
+
+async def run_until_disconnect(request, coro):
+    """
+    Ejecuta una corrutina cancelándola si el cliente se desconecta
+
+    Raises:
+        ClientDisconnected: si el cliente se desconectó antes de terminar
+    """
+    task = asyncio.ensure_future(coro)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_INTERVAL)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                raise ClientDisconnected()
+    finally:
+        if not task.done():
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+
+
+async def read_params(request):
+    """Lee los parámetros de la petición (JSON, formulario o query string)"""
+    if request.method == 'GET':
+        return request.query_params
+    if request.headers.get('content-type', '').startswith('application/json'):
+        return await request.json()
+    return await request.form()
+
+
+def parse_timeout(params):
+    """Timeout de la petición acotado a [1, MAX_TIMEOUT]"""
+    try:
+        return min(max(1, int(params.get('timeout', 60))), MAX_TIMEOUT)
+    except (TypeError, ValueError):
+        return 60
+
+
+def error_response(message, status_code=400):
+    return JSONResponse({'error': message}, status_code=status_code)
+
+
+def busy_response(error):
+    """Respuesta 503 cuando el control de admisión rechaza la petición"""
+    return JSONResponse({'error': str(error), 'admission': get_admission_controller().status()},
+                        status_code=503, headers={'Retry-After': str(error.retry_after)})
+
+
+def identify_client(request):
+    """Asocia las resoluciones de la petición al cliente (cabecera X-Client-Id o IP)"""
+    client_id = request.headers.get('x-client-id') or (request.client.host if request.client else 'anonymous')
+    current_client.set(client_id)
+    current_run_token.set(uuid.uuid4().hex)
+
+
+async def async_run(request):
+    """Ejecuta un modelo; los datos son un test del modelo o contenido .dzn"""
+    identify_client(request)
+    params = await read_params(request)
+    solver_key = params.get('solver', 'org.gecode.gecode')
+    dzn_content = params.get('dzn')
+
+    data_path = None
+    if dzn_content:
+        # Mismo almacén por contenido que las subidas de la aplicación Flask
+        upload_folder = flask_app.config['UPLOAD_FOLDER']
+        try:
+            instance = await asyncio.to_thread(ingest_stream, io.BytesIO(dzn_content.encode('utf-8')), upload_folder)
+        except UploadRejected as e:
+            return error_response(f'Datos rechazados: {e}')
+        data_path = instance_path(upload_folder, instance['hash'])
+
+    try:
+        results = await run_until_disconnect(request, run_model_async(
+            params.get('model'), solver_key, parse_timeout(params), MODELS, MODELS_FOLDER,
+            test_filename=params.get('test_file'), data_path=data_path,
+            solve_options=parse_solve_options(params), history_bound=parse_history_bound(params)
+        ))
+    except AsyncSolveError as e:
+        return error_response(str(e))
+    except AdmissionRejected as e:
+        return busy_response(e)
+    except ClientDisconnected:
+        return error_response('Cliente desconectado', status_code=499)
+
+    results['solver'] = SOLVERS.get(solver_key, solver_key)
+    return JSONResponse(results)
+
+
+async def async_compare(request):
+    """Compara varios modelos del mismo tipo sobre un test"""
+    identify_client(request)
+    params = await read_params(request)
+    if hasattr(params, 'getlist'):
+        selected_models = params.getlist('models')
+    else:
+        selected_models = params.get('models') or []
+    test_filename = params.get('test_file')
+
+    selected_models = [key for key in selected_models if key in MODELS]
+    if not test_filename or len(selected_models) < 2:
+        return error_response('Debes seleccionar un test y al menos 2 modelos para comparar.')
+
+    try:
+        get_admission_controller().ensure_capacity(len(selected_models))
+        results_list = await run_until_disconnect(request, run_comparison_async(
+            selected_models, test_filename, params.get('solver', 'org.gecode.gecode'),
+            parse_timeout(params), MODELS, MODELS_FOLDER,
+            solve_options=parse_solve_options(params), history_bound=parse_history_bound(params)
+        ))
+    except AdmissionRejected as e:
+        return busy_response(e)
+    except ClientDisconnected:
+        return error_response('Cliente desconectado', status_code=499)
+
+    return JSONResponse({'test_file': test_filename, 'results': results_list})
+
+
+def format_sse(event, data):
+    """Formatea un evento Server-Sent Events"""
+    return f'event: {event}\ndata: {json.dumps(data)}\n\n'
+
+
+async def async_stream(request):
+    """
+    Emite las soluciones intermedias como Server-Sent Events
+
+    Al desconectarse el cliente, Starlette cancela el generador y con él la
+    iteración de soluciones, que termina el subproceso del solver.
+    """
+    identify_client(request)
+    params = request.query_params
+    model_key = params.get('model')
+    test_filename = params.get('test_file')
+
+    if model_key not in MODELS or not test_filename:
+        return error_response('Debes indicar un modelo válido y un archivo de test.')
+
+    try:
+        get_admission_controller().ensure_capacity(1)
+    except AdmissionRejected as e:
+        return busy_response(e)
+
+    async def event_stream():
+        try:
+            async for event in stream_solutions(
+                model_key, test_filename, params.get('solver', 'org.gecode.gecode'),
+                parse_timeout(params), MODELS, MODELS_FOLDER,
+                solve_options=parse_solve_options(params)
+            ):
+                yield format_sse(event['event'], event['data'])
+        except (AsyncSolveError, AdmissionRejected) as e:
+            yield format_sse('error', {'error': str(e)})
+
+    return StreamingResponse(event_stream(), media_type='text/event-stream',
+                             headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+app = Starlette(routes=[
+    Route('/api/async/run', async_run, methods=['POST']),
+    Route('/api/async/compare', async_compare, methods=['POST']),
+    Route('/api/async/stream', async_stream, methods=['GET']),
+    Mount('/', app=WSGIMiddleware(flask_app)),
+])
@@ -0,0 +1,3 @@
+"""
+Benchmarks de los modelos MiniZinc (tamaño de aplanado y tiempo de resolución)
+"""
@@ -0,0 +1,67 @@
+"""
+Generador de instancias sintéticas de tamaño creciente
+"""
+import random
+
+from helpers.data_helper import write_instance_dzn
+
+
+def generate_durations(jobs, tasks, rng, min_duration=1, max_duration=10):
+    """Genera una matriz de duraciones aleatorias [job][tarea]"""
+    return [[rng.randint(min_duration, max_duration) for _ in range(tasks)] for _ in range(jobs)]
+
+
+def generate_op_limit_instance(jobs, tasks, k, seed=0):
+    """
+    Genera una instancia op_limit reproducible
+
+    Returns:
+        Contenido .dzn como string
+    """
+    rng = random.Random(seed)
+    return write_instance_dzn({
+        'model_type': 'op_limit',
+        'durations': generate_durations(jobs, tasks, rng),
+        'k': k
+    })
+
+
+def generate_maintenance_instance(jobs, tasks, breaks_per_machine, seed=0, max_break=8):
+    """
+    Genera una instancia maintenance reproducible
+
+    Los paros se reparten a lo largo del horizonte de cada máquina y pueden
+    solaparse entre sí, como ocurre con ventanas definidas por separado.
+
+    Returns:
+        Contenido .dzn como string
+    """
+    rng = random.Random(seed)
+    durations = generate_durations(jobs, tasks, rng)
+    horizon = sum(sum(row) for row in durations)
+
+    breaks = []
+    for machine in range(1, tasks + 1):
+        for _ in range(breaks_per_machine):
+            start = rng.randint(0, max(horizon // 2, 1))
+            breaks.append((machine, start, start + rng.randint(1, max_break)))
+
+    return write_instance_dzn({
+        'model_type': 'maintenance',
+        'durations': durations,
+        'breaks': breaks
+    })
+
+
+def parse_sizes(sizes):
+    """
+    Interpreta una lista de tamaños 'JOBSxTASKS' separados por comas
+
+    Returns:
+        Lista de tuplas (jobs, tasks)
+    """
+    parsed = []
+    for size in sizes.split(','):
+        jobs, tasks = size.lower().strip().split('x')
+        parsed.append((int(jobs), int(tasks)))
+    return parsed
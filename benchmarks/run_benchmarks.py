@@ -0,0 +1,368 @@
+"""
+Ejecuta benchmarks de modelos sobre instancias sintéticas de tamaño creciente
+
+Uso:
+    python -m benchmarks.run_benchmarks op-limit --sizes 5x5,10x10,20x10,50x20
+    python -m benchmarks.run_benchmarks maintenance --sizes 10x5,20x10,40x10
+    python -m benchmarks.run_benchmarks op-limit --history-bound improve
+    python -m benchmarks.run_benchmarks flatten-report --type op_limit
+    python -m benchmarks.run_benchmarks import-times --repeat 5
+"""
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+import minizinc
+
+from helpers.flatten_helper import flatten_model, build_flatten_report, format_bytes, DEFAULT_TARGET_JOBS
+from helpers.data_helper import get_test_path_for_model
+from helpers.minizinc_helper import solve_model
+from helpers.history_helper import record_solve
+from helpers.warmstart_helper import build_history_start, bounded_outcome, strict_bound, HISTORY_BOUND_MODES
+from helpers.registry_helper import MODELS, models_of_type
+from helpers.catalogue_helper import get_instance_catalogue
+from benchmarks.instance_generator import generate_op_limit_instance, generate_maintenance_instance, parse_sizes
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODELS_FOLDER = os.path.join(PROJECT_ROOT, 'models')
+
+OP_LIMIT_MODELS = [
+    'jobshop_op_limit/jobshop_op_limit_1.mzn',
+    'jobshop_op_limit/jobshop_op_limit_2.mzn',
+    'jobshop_op_limit/jobshop_op_limit_3.mzn',
+    'jobshop_op_limit/jobshop_op_limit_4.mzn',
+]
+
+MAINTENANCE_MODELS = [
+    'jobshop_maintenance/jobshop_maintenance_1.mzn',
+    'jobshop_maintenance/jobshop_maintenance_2.mzn',
+    'jobshop_maintenance/jobshop_maintenance_3.mzn',
+    'jobshop_maintenance/jobshop_maintenance_4.mzn',
+    'jobshop_maintenance/jobshop_maintenance_5.mzn',
+]
+
+# Módulos medidos por import-times: núcleo sin interfaz, exportadores y aplicación
+IMPORT_TARGETS = [
+    'helpers.registry_helper',
+    'helpers.minizinc_helper',
+    'controllers.controller_oplimit',
+    'controllers.controller_comparison',
+    'helpers.csv_helper',
+    'helpers.visualization_helper',
+    'helpers.pdf_helper',
+    'app',
+    'asgi_app',
+]
+
+# Dependencias pesadas cuya carga se comprueba en cada importación
+HEAVY_MODULES = ['minizinc', 'numpy', 'flask', 'plotly', 'reportlab', 'starlette']
+
+# Se ejecuta en un intérprete nuevo: mide solo la importación, no el arranque de Python
+IMPORT_PROBE = (
+    'import sys, json, time\n'
+    'start = time.perf_counter()\n'
+    'import {module}\n'
+    'elapsed = time.perf_counter() - start\n'
+    'print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))\n'
+)
+
+CSV_FIELDS = ['model', 'instance', 'flat_time', 'fzn_bytes', 'variables', 'constraints',
+              'solve_wall_time', 'status', 'makespan', 'history_bound', 'error']
+
+
+def benchmark_model(model_file, dzn_content, instance_name, solver_key, flat_timeout, solve_timeout,
+                    model_type=None, history_bound=None):
+    """
+    Aplana y resuelve un modelo sobre una instancia
+
+    Las resoluciones se guardan en el historial; con ``history_bound`` se
+    acota ``end`` con la mejor solución conocida de la instancia (las
+    instancias generadas son deterministas para una semilla).
+
+    Returns:
+        Diccionario con las métricas de aplanado y resolución
+    """
+    row = {'model': os.path.basename(model_file), 'instance': instance_name}
+    model_path = os.path.join(MODELS_FOLDER, model_file)
+
+    fd, data_path = tempfile.mkstemp(suffix='.dzn')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(dzn_content)
+
+        try:
+            flat_stats = flatten_model(model_path, data_path, solver_key, flat_timeout)
+            for field in ('flat_time', 'fzn_bytes', 'variables', 'constraints'):
+                row[field] = flat_stats.get(field)
+        except minizinc.MiniZincError as e:
+            row['error'] = f'flatten: {e}'
+            return row
+
+        if solve_timeout > 0:
+            try:
+                history_start = build_history_start(dzn_content, model_type, history_bound) if history_bound else None
+                row['history_bound'] = history_start['bound'] if history_start else None
+
+                wall_start = time.monotonic()
+                result, applied_options = solve_model(
+                    model_path, data_path, solver_key, solve_timeout,
+                    extra_constraints=history_start['constraints'] if history_start else None
+                )
+                row['solve_wall_time'] = time.monotonic() - wall_start
+                record_solve(data_path, os.path.splitext(os.path.basename(model_file))[0], model_type, solver_key,
+                             result, applied_options, solve_timeout, strict_bound=strict_bound(history_start))
+
+                row['status'] = str(result.status).replace('Status.', '')
+                if result.status in [minizinc.Status.OPTIMAL_SOLUTION, minizinc.Status.SATISFIED]:
+                    row['makespan'] = result['end']
+                elif bounded_outcome(row['status'], history_start) == 'proved_optimal':
+                    row['status'] = 'OPTIMAL_SOLUTION'
+                    row['makespan'] = history_start['bound']
+            except minizinc.MiniZincError as e:
+                row['error'] = f'solve: {e}'
+    finally:
+        os.remove(data_path)
+
+    return row
+
+
+def run_family(args, instances, default_models, model_type):
+    """
+    Ejecuta cada modelo de una familia sobre cada instancia generada
+
+    Args:
+        args: Argumentos de línea de comandos
+        instances: Lista de tuplas (nombre, contenido .dzn)
+        default_models: Modelos a usar si no se indican en args.models
+        model_type: Tipo de modelo de la familia
+    """
+    rows = []
+    for instance_name, dzn_content in instances:
+        for model_file in args.models or default_models:
+            row = benchmark_model(model_file, dzn_content, instance_name, args.solver,
+                                  args.flat_timeout, args.solve_timeout,
+                                  model_type=model_type, history_bound=args.history_bound)
+            print_row(row)
+            rows.append(row)
+    return rows
+
+
+def run_op_limit(args):
+    """Compara las variantes op_limit en instancias de tamaño creciente"""
+    instances = [
+        (f'{jobs}x{tasks}_k{args.operators}',
+         generate_op_limit_instance(jobs, tasks, args.operators, seed=args.seed))
+        for jobs, tasks in parse_sizes(args.sizes)
+    ]
+    return run_family(args, instances, OP_LIMIT_MODELS, 'op_limit')
+
+
+def run_maintenance(args):
+    """Compara las variantes maintenance en instancias de tamaño creciente"""
+    instances = [
+        (f'{jobs}x{tasks}_b{args.breaks}',
+         generate_maintenance_instance(jobs, tasks, args.breaks, seed=args.seed))
+        for jobs, tasks in parse_sizes(args.sizes)
+    ]
+    return run_family(args, instances, MAINTENANCE_MODELS, 'maintenance')
+
+
+def run_flatten_report(args):
+    """Informe de tamaño aplanado de todos los modelos de un tipo (ver flatten_helper)"""
+    model_keys = models_of_type(args.type)
+    if args.instances:
+        data_paths = args.instances
+    else:
+        # Tests del catálogo, de menor a mayor número de operaciones
+        catalogue = get_instance_catalogue(MODELS_FOLDER, MODELS)
+        data_paths = [get_test_path_for_model(MODELS_FOLDER, args.type, entry['name'])
+                      for entry in catalogue.instances(args.type, order='size')]
+
+    # Con --solvers se aplana con cada solver para comparar sus librerías de globales
+    rows = []
+    for solver_key in args.solvers or [args.solver]:
+        rows += build_flatten_report(model_keys, MODELS, MODELS_FOLDER, data_paths, solver_key,
+                                     timeout=args.flat_timeout, target_jobs=args.target_jobs)
+    for row in rows:
+        print_flatten_row(row)
+
+    # Formato plano para CSV (el desglose por tipo y la extrapolación se serializan)
+    return [
+        {
+            'model': row['model_key'],
+            'instance': row['instance'],
+            'solver': row['solver'],
+            'supported': row['supported'],
+            'flat_time': row.get('flat_time'),
+            'fzn_bytes': row.get('fzn_bytes'),
+            'variables': row.get('variables'),
+            'constraints': row.get('constraints'),
+            'error': row.get('error'),
+            'constraints_by_kind': ' '.join(f'{k}={v}' for k, v in (row.get('constraints_by_kind') or {}).items()),
+            'exponent': row.get('exponent'),
+            'quadratic': row.get('quadratic'),
+            'extrapolated': ' '.join(f"{e['jobs']}:{e['constraints']}/{e['fzn_bytes']}"
+                                     for e in row.get('extrapolated') or [])
+        }
+        for row in rows
+    ]
+
+
+def measure_import(module, repeat):
+    """
+    Tiempo de importación de un módulo en intérpretes nuevos
+
+    Cada repetición es un proceso aparte (sys.modules cachea las
+    importaciones), por lo que se mide la importación en frío.
+
+    Returns:
+        Diccionario con la mediana y el mínimo (s), las dependencias pesadas
+        cargadas y el error si la importación falla
+    """
+    code = IMPORT_PROBE.format(module=module, heavy=HEAVY_MODULES)
+    times = []
+    loaded = []
+    for _ in range(repeat):
+        completed = subprocess.run([sys.executable, '-c', code], cwd=PROJECT_ROOT,
+                                   capture_output=True, text=True)
+        if completed.returncode != 0:
+            lines = completed.stderr.strip().splitlines()
+            return {'module': module, 'error': lines[-1] if lines else f'código {completed.returncode}'}
+        probe = json.loads(completed.stdout.strip().splitlines()[-1])
+        times.append(probe['seconds'])
+        loaded = probe['loaded']
+    return {
+        'module': module,
+        'import_time': statistics.median(times),
+        'import_time_min': min(times),
+        'heavy_modules': ' '.join(loaded)
+    }
+
+
+def run_import_times(args):
+    """Tiempo de importación en frío del núcleo, los exportadores y la aplicación"""
+    rows = []
+    for module in args.modules or IMPORT_TARGETS:
+        row = measure_import(module, args.repeat)
+        if row.get('error'):
+            print(f"{module:<36} ERROR {row['error']}", flush=True)
+        else:
+            print(f"{module:<36} {row['import_time'] * 1000:8.1f} ms (min {row['import_time_min'] * 1000:.1f}) "
+                  f"carga: {row['heavy_modules'] or '-'}", flush=True)
+        rows.append(row)
+    return rows
+
+
+def print_flatten_row(row):
+    """Muestra una fila del informe de aplanado en la consola"""
+    label = f"{row['model_key']:<28} {row['instance']:<14} {row['solver']:<26}"
+    if row.get('error'):
+        print(f"{label} ERROR {row['error']}", flush=True)
+        return
+
+    flag = ' CUADRATICO' if row['quadratic'] else ''
+    if not row['supported']:
+        flag += ' (no se ofrece con este solver)'
+    print(f"{label} jobs={row['jobs']} vars={row['variables']} "
+          f"cons={row['constraints']} flat={row['flat_time']:.2f}s fzn={format_bytes(row['fzn_bytes'])} "
+          f"exp={row['exponent']}{flag}", flush=True)
+    kinds = ', '.join(f'{kind}={count}' for kind, count in row['constraints_by_kind'].items())
+    print(f"    por tipo: {kinds}")
+    for estimate in row['extrapolated']:
+        print(f"    {estimate['jobs']} jobs: ~{estimate['constraints']} restricciones, "
+              f"~{format_bytes(estimate['fzn_bytes'])}")
+
+
+def print_row(row):
+    """Muestra una fila de resultados en la consola"""
+    def fmt(value):
+        if isinstance(value, float):
+            return f'{value:.2f}'
+        return '-' if value is None else str(value)
+
+    print(f"{row['model']:<28} {row['instance']:<14} "
+          f"flat={fmt(row.get('flat_time'))}s fzn={fmt(row.get('fzn_bytes'))}B "
+          f"cons={fmt(row.get('constraints'))} solve={fmt(row.get('solve_wall_time'))}s "
+          f"{fmt(row.get('status'))} end={fmt(row.get('makespan'))}"
+          + (f" ERROR {row['error']}" if row.get('error') else ''), flush=True)
+
+
+def write_csv(rows, output_path):
+    """Guarda los resultados en CSV"""
+    fields = list(CSV_FIELDS)
+    for row in rows:
+        fields += [key for key in row if key not in fields]
+    with open(output_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({field: row.get(field) for field in fields})
+
+
+def add_common_arguments(subparser):
+    """Argumentos comunes a todos los subcomandos de benchmark"""
+    subparser.add_argument('--seed', type=int, default=0, help='Semilla del generador')
+    subparser.add_argument('--models', nargs='*', help='Modelos a comparar (relativos a models/)')
+    subparser.add_argument('--flat-timeout', type=int, default=300, help='Límite de aplanado (s)')
+    subparser.add_argument('--solve-timeout', type=int, default=60,
+                           help='Límite de resolución (s); 0 para solo aplanar')
+    subparser.add_argument('--history-bound', choices=sorted(HISTORY_BOUND_MODES),
+                           help='Acotar end con la mejor solución conocida (bound: <=, improve: <)')
+
+
+def build_parser():
+    """Construye el parser de línea de comandos"""
+    parser = argparse.ArgumentParser(description='Benchmarks de los modelos Job Shop')
+    parser.add_argument('--solver', default='org.gecode.gecode', help='Solver de MiniZinc')
+    parser.add_argument('--output', help='Archivo CSV de salida')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    op_limit = subparsers.add_parser('op-limit', help='Variantes op_limit (aplanado y resolución)')
+    op_limit.add_argument('--sizes', default='5x5,10x10,20x10,30x15,50x20',
+                          help='Tamaños JOBSxTASKS separados por comas')
+    op_limit.add_argument('--operators', type=int, default=3, help='Número de operarios (k)')
+    add_common_arguments(op_limit)
+    op_limit.set_defaults(func=run_op_limit)
+
+    maintenance = subparsers.add_parser('maintenance', help='Variantes maintenance (aplanado y resolución)')
+    maintenance.add_argument('--sizes', default='10x5,20x10,40x10,60x15',
+                             help='Tamaños JOBSxTASKS separados por comas')
+    maintenance.add_argument('--breaks', type=int, default=3, help='Paros por máquina')
+    add_common_arguments(maintenance)
+    maintenance.set_defaults(func=run_maintenance)
+
+    flatten = subparsers.add_parser('flatten-report', help='Informe de tamaño aplanado por modelo e instancia')
+    flatten.add_argument('--type', required=True, choices=['op_limit', 'workers_skills', 'maintenance'],
+                         help='Tipo de modelo (se analizan todos los modelos del tipo)')
+    flatten.add_argument('--instances', nargs='*', help='Archivos .dzn (por defecto, los tests del tipo)')
+    flatten.add_argument('--target-jobs', type=int, nargs='*', default=DEFAULT_TARGET_JOBS,
+                         help='Números de jobs para los que se extrapola el tamaño')
+    flatten.add_argument('--flat-timeout', type=int, default=300, help='Límite de aplanado (s)')
+    flatten.add_argument('--solvers', nargs='*',
+                         help='Solvers con los que aplanar (por defecto, --solver); filas por solver')
+    flatten.set_defaults(func=run_flatten_report)
+
+    import_times = subparsers.add_parser('import-times', help='Tiempo de importación en frío de cada módulo')
+    import_times.add_argument('--modules', nargs='*', help='Módulos a medir (por defecto IMPORT_TARGETS)')
+    import_times.add_argument('--repeat', type=int, default=5, help='Procesos por módulo (se usa la mediana)')
+    import_times.set_defaults(func=run_import_times)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    rows = args.func(args)
+    if args.output:
+        write_csv(rows, args.output)
+        print(f'Resultados guardados en {args.output}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
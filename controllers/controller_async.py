@@ -0,0 +1,242 @@
+"""
+Controlador asíncrono: ejecución, comparación y streaming de soluciones
+
+Usado por el servidor ASGI (asgi_app.py). Cada resolución es una corrutina
+que espera al subproceso del solver, por lo que no ocupa un hilo del sistema
+mientras dura; cancelar la tarea termina el subproceso.
+"""
+import os
+import asyncio
+import datetime
+import traceback
+import minizinc
+
+from helpers.minizinc_helper import solve_model_async, iter_solutions_async, describe_solve_options
+from helpers.data_helper import get_test_path_for_model, parse_durations_from_dzn
+from helpers.preflight_helper import preflight_check
+from helpers.process_limits_helper import peak_rss_from_result
+from helpers.history_helper import record_solve
+from helpers.admission_helper import AdmissionRejected
+from helpers.warmstart_helper import bounded_outcome, describe_history_start, strict_bound
+from helpers.registry_helper import model_supports_solver
+from controllers.controller_oplimit import extract_oplimit_results
+from controllers.controller_workers import extract_workers_results
+from controllers.controller_maintenance import extract_maintenance_results
+from controllers.controller_comparison import (
+    preflight_models, build_comparison_result, build_comparison_error, load_history_start
+)
+
+
+SOLVED_STATUSES = [minizinc.Status.OPTIMAL_SOLUTION, minizinc.Status.SATISFIED, minizinc.Status.ALL_SOLUTIONS]
+
+
+class AsyncSolveError(Exception):
+    """Error de validación de una petición asíncrona (datos o modelo)"""
+
+
+def build_solution_results(result, model_type, durations):
+    """
+    Extrae makespan, tiempos y asignaciones de un resultado de MiniZinc
+
+    Returns:
+        Diccionario con los mismos campos que los resultados de run_model
+    """
+    solve_time = result.statistics.get('solveTime', datetime.timedelta(0)) if result.statistics else None
+    results = {
+        'status': str(result.status).replace('Status.', ''),
+        'makespan': int(result['end']),
+        'execution_time': f'{solve_time.total_seconds():.4f} segundos' if solve_time else 'N/A',
+        'durations': durations
+    }
+
+    if model_type == 'op_limit':
+        results.update(extract_oplimit_results(result))
+    elif model_type == 'workers_skills':
+        results.update(extract_workers_results(result, durations))
+    elif model_type == 'maintenance':
+        results.update(extract_maintenance_results(result))
+
+    return results
+
+
+def resolve_model_and_data(model_key, models_config, models_folder, test_filename=None, data_path=None,
+                           solver_key=None):
+    """
+    Resuelve las rutas del modelo y de los datos de una petición
+
+    Returns:
+        Tupla (model_info, model_path, data_path)
+    """
+    if model_key not in models_config:
+        raise AsyncSolveError('Modelo no válido.')
+
+    model_info = models_config[model_key]
+    if solver_key and not model_supports_solver(model_info, solver_key):
+        raise AsyncSolveError(f'El modelo {model_info["name"]} no se ofrece con {solver_key}.')
+    model_path = os.path.join(models_folder, model_info['file'])
+
+    if data_path is None:
+        if not test_filename:
+            raise AsyncSolveError('Debes indicar un archivo de test o el contenido .dzn.')
+        data_path = get_test_path_for_model(models_folder, model_info['type'], os.path.basename(test_filename))
+
+    if not os.path.exists(data_path):
+        raise AsyncSolveError(f'Archivo no encontrado: {os.path.basename(data_path)}')
+
+    return model_info, model_path, data_path
+
+
+async def check_compatibility(model_path, data_path):
+    """Comprobación previa sin bloquear el bucle de eventos (ver preflight_helper)"""
+    ok, message = await asyncio.to_thread(preflight_check, model_path, data_path)
+    if not ok:
+        raise AsyncSolveError(f'Los datos no son compatibles con el modelo: {message}')
+
+
+async def run_model_async(model_key, solver_key, timeout, models_config, models_folder,
+                          test_filename=None, data_path=None, solve_options=None, history_bound=None):
+    """
+    Ejecuta un modelo de forma asíncrona
+
+    Args:
+        history_bound: Modo de cota con la mejor solución conocida ('bound',
+                       'improve' o None)
+
+    Returns:
+        Diccionario de resultados (con 'status' del solver si no hay solución)
+    """
+    model_info, model_path, data_path = resolve_model_and_data(
+        model_key, models_config, models_folder, test_filename, data_path, solver_key
+    )
+    await check_compatibility(model_path, data_path)
+
+    history_start = await asyncio.to_thread(load_history_start, data_path, model_info['type'], history_bound)
+    result, applied_options = await solve_model_async(
+        model_path, data_path, solver_key, timeout, solve_options,
+        extra_constraints=history_start['constraints'] if history_start else None
+    )
+    await asyncio.to_thread(record_solve, data_path, model_key, model_info['type'], solver_key, result,
+                            applied_options, timeout, None, strict_bound(history_start))
+
+    base_results = {
+        'model_name': model_info['name'],
+        'model_type': model_info['type'],
+        'solver': solver_key,
+        'solve_options': applied_options,
+        'solve_options_label': describe_solve_options(applied_options),
+        'data_file': os.path.basename(data_path),
+        'peak_rss_mb': peak_rss_from_result(result)
+    }
+
+    status_name = str(result.status).replace('Status.', '')
+    outcome = bounded_outcome(status_name, history_start)
+    if history_start:
+        base_results['history_bound'] = describe_history_start(history_start, outcome)
+
+    if outcome == 'proved_optimal':
+        return {**history_start['results'], 'status': 'OPTIMAL_SOLUTION', **base_results}
+
+    if result.status not in SOLVED_STATUSES:
+        return {'status': status_name, **base_results}
+
+    with open(data_path, 'r') as f:
+        durations = parse_durations_from_dzn(f.read())
+
+    return {**build_solution_results(result, model_info['type'], durations), **base_results}
+
+
+async def run_single_model_async(model_key, test_filename, solver_key, timeout, models_config, models_folder,
+                                 solve_options=None, history_bound=None):
+    """Versión asíncrona de run_single_model_comparison"""
+    model_info = models_config[model_key]
+    model_path = os.path.join(models_folder, model_info['file'])
+    test_path = get_test_path_for_model(models_folder, model_info['type'], test_filename)
+
+    if not os.path.exists(test_path):
+        return build_comparison_error(model_key, model_info, 'ERROR: Test file not found',
+                                      f'File not found: {test_path}')
+
+    try:
+        history_start = await asyncio.to_thread(load_history_start, test_path, model_info['type'], history_bound)
+        result, applied_options = await solve_model_async(
+            model_path, test_path, solver_key, timeout, solve_options,
+            extra_constraints=history_start['constraints'] if history_start else None
+        )
+        await asyncio.to_thread(record_solve, test_path, model_key, model_info['type'], solver_key, result,
+                                applied_options, timeout, None, strict_bound(history_start))
+        return build_comparison_result(model_key, model_info, result, applied_options, test_path, history_start)
+    except (asyncio.CancelledError, AdmissionRejected):
+        raise
+    except Exception as e:
+        return build_comparison_error(model_key, model_info, f'ERROR: {str(e)[:50]}',
+                                      traceback.format_exc(), execution_time='Error')
+
+
+async def run_comparison_async(selected_models, test_filename, solver_key, timeout, models_config, models_folder,
+                               solve_options=None, history_bound=None):
+    """
+    Compara varios modelos concurrentemente en el bucle de eventos
+
+    A diferencia de run_comparison_parallel no hay un pool de hilos: el
+    paralelismo real lo limita el presupuesto de núcleos.
+
+    Returns:
+        Lista de resultados ordenada por makespan
+    """
+    test_filename = os.path.basename(test_filename)
+    runnable, results_list = await asyncio.to_thread(
+        preflight_models, selected_models, test_filename, models_config, models_folder, solver_key
+    )
+
+    tasks = [
+        asyncio.ensure_future(run_single_model_async(model_key, test_filename, solver_key, timeout, models_config,
+                                                     models_folder, solve_options, history_bound))
+        for model_key in runnable
+    ]
+    try:
+        results_list += await asyncio.gather(*tasks)
+    except AdmissionRejected:
+        # Un modelo sin hueco: se cancelan los demás y la petición responde 503
+        for task in tasks:
+            task.cancel()
+        raise
+
+    results_list.sort(key=lambda x: x['makespan'])
+    return results_list
+
+
+async def stream_solutions(model_key, test_filename, solver_key, timeout, models_config, models_folder,
+                           solve_options=None):
+    """
+    Genera un evento por cada solución intermedia y uno final
+
+    Yields:
+        Diccionarios con 'event' ('solution' o 'done') y los datos del evento
+    """
+    model_info, model_path, data_path = resolve_model_and_data(
+        model_key, models_config, models_folder, test_filename, solver_key=solver_key
+    )
+    await check_compatibility(model_path, data_path)
+
+    with open(data_path, 'r') as f:
+        durations = parse_durations_from_dzn(f.read())
+
+    final_status = None
+    best_makespan = None
+    last_result = None
+    applied_options = None
+    async for result, applied_options in iter_solutions_async(model_path, data_path, solver_key, timeout,
+                                                              solve_options):
+        final_status = str(result.status).replace('Status.', '')
+        if result.solution is not None:
+            last_result = result
+            data = build_solution_results(result, model_info['type'], durations)
+            best_makespan = data['makespan']
+            yield {'event': 'solution', 'data': data}
+
+    # Se guarda la última solución con el estado final de la búsqueda
+    if last_result is not None:
+        await asyncio.to_thread(record_solve, data_path, model_key, model_info['type'], solver_key,
+                                last_result, applied_options, timeout, final_status)
+
+    yield {'event': 'done', 'data': {'status': final_status, 'makespan': best_makespan}}
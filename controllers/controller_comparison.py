@@ -2,19 +2,165 @@
 Controlador para comparaciones de modelos
 """
 import os
+import math
+import time
 import datetime
 import traceback
+import contextvars
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import minizinc
 
-from helpers.minizinc_helper import solve_model
+from helpers.minizinc_helper import solve_model, extract_makespan_bound
+from helpers.preflight_helper import preflight_check
+from helpers.process_limits_helper import peak_rss_from_result
+from helpers.history_helper import record_solve
+from helpers.admission_helper import AdmissionRejected
+from helpers.warmstart_helper import (build_history_start, bounded_outcome, describe_history_start, strict_bound,
+                                      bound_constraint)
 from helpers.data_helper import get_test_path_for_model, parse_durations_from_dzn
+from helpers.registry_helper import model_supports_solver
 from controllers.controller_oplimit import extract_oplimit_results
 from controllers.controller_workers import extract_workers_results
 from controllers.controller_maintenance import extract_maintenance_results
 
 
-def run_single_model_comparison(model_key, test_filename, solver_key, timeout, models_config, models_folder):
+def build_comparison_error(model_key, model_info, status, error_detail=None, execution_time='N/A'):
+    """Construye la fila de resultados de un modelo que no obtuvo solución"""
+    result_data = {
+        'model_key': model_key,
+        'model_name': model_info['name'],
+        'category': model_info['category'],
+        'model_type': model_info['type'],
+        'makespan': 999999,  # Usar valor grande en lugar de inf
+        'execution_time': execution_time,
+        'status': status,
+        'success': False
+    }
+    if error_detail is not None:
+        result_data['error_detail'] = error_detail
+    return result_data
+
+
+def build_comparison_result(model_key, model_info, result, applied_options, test_path, history_start=None):
+    """
+    Construye la fila de resultados de un modelo a partir de la salida del solver
+    
+    Args:
+        model_key: Clave del modelo en la configuración
+        model_info: Configuración del modelo
+        result: Resultado de MiniZinc
+        applied_options: Opciones de resolución efectivamente aplicadas
+        test_path: Ruta al archivo de test (para leer las duraciones)
+        history_start: Cota histórica aplicada (ver build_history_start)
+    
+    Returns:
+        Diccionario con resultados del modelo
+    """
+    model_type = model_info['type']
+    status_name = str(result.status).replace('Status.', '')
+    solve_time = result.statistics.get('solveTime', datetime.timedelta(0)).total_seconds()
+    outcome = bounded_outcome(status_name, history_start)
+    
+    if outcome == 'proved_optimal':
+        # El modelo demostró que la mejor conocida es óptima
+        result_data = build_history_proof_result(model_key, model_info, history_start)
+        result_data['execution_time'] = f'{solve_time:.4f}'
+        result_data['solve_options'] = applied_options
+        result_data['peak_rss_mb'] = peak_rss_from_result(result)
+        return result_data
+    
+    if result.status not in [minizinc.Status.OPTIMAL_SOLUTION, minizinc.Status.SATISFIED]:
+        result_data = build_comparison_error(model_key, model_info, status_name)
+        result_data['solve_options'] = applied_options
+        result_data['peak_rss_mb'] = peak_rss_from_result(result)
+        if history_start:
+            result_data['history_bound'] = describe_history_start(history_start, outcome)
+        return result_data
+    
+    # Leer duraciones del archivo de test
+    durations = None
+    try:
+        with open(test_path, 'r') as f:
+            dzn_content = f.read()
+        durations = parse_durations_from_dzn(dzn_content)
+    except Exception:
+        pass
+    
+    result_data = {
+        'model_key': model_key,
+        'model_name': model_info['name'],
+        'category': model_info['category'],
+        'model_type': model_type,
+        'makespan': int(result['end']),
+        'execution_time': f'{solve_time:.4f}',
+        'status': str(result.status).replace('Status.', ''),
+        'bound': extract_makespan_bound(result, model_type, sum(map(sum, durations)) if durations else None),
+        'solve_options': applied_options,
+        'peak_rss_mb': peak_rss_from_result(result),
+        'success': True
+    }
+    if history_start:
+        result_data['history_bound'] = describe_history_start(history_start, outcome)
+    
+    if model_type == 'op_limit':
+        try:
+            specific_results = extract_oplimit_results(result)
+            result_data.update(specific_results)
+            result_data['num_operators'] = len(specific_results['operator_load'])
+        except Exception:
+            pass
+    
+    elif model_type == 'workers_skills':
+        try:
+            specific_results = extract_workers_results(result, durations)
+            result_data.update(specific_results)
+            result_data['num_workers'] = len(specific_results['worker_load'])
+            if 'max_load' in specific_results and 'min_load' in specific_results:
+                result_data['imbalance'] = specific_results['max_load'] - specific_results['min_load']
+        except Exception:
+            pass
+    
+    elif model_type == 'maintenance':
+        try:
+            specific_results = extract_maintenance_results(result)
+            result_data.update(specific_results)
+        except Exception:
+            pass
+    
+    return result_data
+
+
+def build_history_proof_result(model_key, model_info, history_start):
+    """
+    Fila de un modelo que demostró óptima la mejor solución conocida
+
+    La programación es la histórica (el modelo solo aportó la prueba).
+    """
+    result_data = {
+        'model_key': model_key,
+        'model_name': model_info['name'],
+        'category': model_info['category'],
+        'model_type': model_info['type'],
+        'status': 'OPTIMAL_SOLUTION',
+        'bound': history_start['bound'],
+        'history_bound': describe_history_start(history_start, 'proved_optimal'),
+        'success': True,
+        **history_start['results']
+    }
+    result_data.pop('durations', None)
+    return result_data
+
+
+def load_history_start(test_path, model_type, history_bound):
+    """Cota histórica de un archivo de test (ver build_history_start) o None"""
+    if not history_bound:
+        return None
+    with open(test_path, 'r') as f:
+        return build_history_start(f.read(), model_type, history_bound)
+
+
+def run_single_model_comparison(model_key, test_filename, solver_key, timeout, models_config, models_folder,
+                                solve_options=None, history_bound=None):
     """
     Ejecuta un modelo individual y retorna los resultados detallados
     
@@ -25,6 +171,9 @@ def run_single_model_comparison(model_key, test_filename, solver_key, timeout, m
         timeout: Timeout en segundos
         models_config: Configuración de modelos
         models_folder: Carpeta base de modelos
+        solve_options: Opciones de resolución (hilos, búsqueda libre, -O)
+        history_bound: Modo de cota con la mejor solución conocida ('bound',
+                       'improve' o None)
     
     Returns:
         Diccionario con resultados del modelo
@@ -34,105 +183,92 @@ def run_single_model_comparison(model_key, test_filename, solver_key, timeout, m
     
     model_info = models_config[model_key]
     model_path = os.path.join(models_folder, model_info['file'])
-    model_type = model_info['type']
     
-    test_path = get_test_path_for_model(models_folder, model_type, test_filename)
+    test_path = get_test_path_for_model(models_folder, model_info['type'], test_filename)
     
     if not os.path.exists(test_path):
-        return {
-            'model_key': model_key,
-            'model_name': model_info['name'],
-            'category': model_info['category'],
-            'model_type': model_type,
-            'makespan': 999999,  # Usar valor grande en lugar de inf
-            'execution_time': 'N/A',
-            'status': 'ERROR: Test file not found',
-            'success': False,
-            'error_detail': f'File not found: {test_path}'
-        }
+        return build_comparison_error(model_key, model_info, 'ERROR: Test file not found',
+                                      f'File not found: {test_path}')
     
     try:
-        result = solve_model(model_path, test_path, solver_key, timeout)
+        history_start = load_history_start(test_path, model_info['type'], history_bound)
+        result, applied_options = solve_model(
+            model_path, test_path, solver_key, timeout, solve_options,
+            extra_constraints=history_start['constraints'] if history_start else None
+        )
+        record_solve(test_path, model_key, model_info['type'], solver_key, result, applied_options, timeout,
+                     strict_bound=strict_bound(history_start))
+        return build_comparison_result(model_key, model_info, result, applied_options, test_path, history_start)
+    
+    except AdmissionRejected:
+        # El servidor está saturado: la petición entera responde 503
+        raise
+    except Exception as e:
+        return build_comparison_error(model_key, model_info, f'ERROR: {str(e)[:50]}',
+                                      traceback.format_exc(), execution_time='Error')
+
+
+def cancel_pending(futures):
+    """Cancela las resoluciones de una comparación que aún no han empezado"""
+    for future in futures:
+        future.cancel()
+
+
+def preflight_models(selected_models, test_filename, models_config, models_folder, solver_key=None):
+    """
+    Comprueba cada par modelo + test antes de encolar los solvers
+    
+    Los modelos que no se ofrecen con ``solver_key`` (registro) se rechazan
+    sin aplanarlos.
+    
+    Returns:
+        Tupla (claves de modelos ejecutables, resultados de error de los
+        modelos rechazados)
+    """
+    runnable = []
+    rejected = []
+    
+    for model_key in selected_models:
+        if model_key not in models_config:
+            continue
         
-        if result.status in [minizinc.Status.OPTIMAL_SOLUTION, minizinc.Status.SATISFIED]:
-            solve_time = result.statistics.get('solveTime', datetime.timedelta(0)).total_seconds()
-            
-            # Leer duraciones del archivo de test
-            durations = None
-            try:
-                with open(test_path, 'r') as f:
-                    dzn_content = f.read()
-                durations = parse_durations_from_dzn(dzn_content)
-            except Exception:
-                pass
-            
-            result_data = {
-                'model_key': model_key,
-                'model_name': model_info['name'],
-                'category': model_info['category'],
-                'model_type': model_type,
-                'makespan': int(result['end']),
-                'execution_time': f'{solve_time:.4f}',
-                'status': str(result.status).replace('Status.', ''),
-                'success': True
-            }
-            
-            if model_type == 'op_limit':
-                try:
-                    specific_results = extract_oplimit_results(result)
-                    result_data.update(specific_results)
-                    result_data['num_operators'] = len(specific_results['operator_load'])
-                except Exception:
-                    pass
-            
-            elif model_type == 'workers_skills':
-                try:
-                    specific_results = extract_workers_results(result, durations)
-                    result_data.update(specific_results)
-                    result_data['num_workers'] = len(specific_results['worker_load'])
-                    if 'max_load' in specific_results and 'min_load' in specific_results:
-                        result_data['imbalance'] = specific_results['max_load'] - specific_results['min_load']
-                except Exception:
-                    pass
-            
-            elif model_type == 'maintenance':
-                try:
-                    specific_results = extract_maintenance_results(result)
-                    result_data.update(specific_results)
-                except Exception:
-                    pass
-            
-            return result_data
+        model_info = models_config[model_key]
+        model_path = os.path.join(models_folder, model_info['file'])
+        test_path = get_test_path_for_model(models_folder, model_info['type'], test_filename)
+        
+        if solver_key and not model_supports_solver(model_info, solver_key):
+            rejected.append(build_comparison_error(model_key, model_info, 'ERROR: Solver no soportado',
+                                                   f'El modelo no se ofrece con {solver_key}'))
+            continue
+        
+        # Los tests inexistentes se informan en run_single_model_comparison
+        if not os.path.exists(test_path):
+            runnable.append(model_key)
+            continue
+        
+        ok, message = preflight_check(model_path, test_path)
+        if ok:
+            runnable.append(model_key)
         else:
-            return {
-                'model_key': model_key,
-                'model_name': model_info['name'],
-                'category': model_info['category'],
-                'model_type': model_type,
-                'makespan': 999999,  # Usar valor grande en lugar de inf
-                'execution_time': 'N/A',
-                'status': str(result.status).replace('Status.', ''),
-                'success': False
-            }
+            rejected_result = build_comparison_error(model_key, model_info, 'ERROR: Modelo y datos incompatibles',
+                                                     message)
+            rejected_result['preflight_error'] = message
+            rejected.append(rejected_result)
     
-    except Exception as e:
-        return {
-            'model_key': model_key,
-            'model_name': model_info['name'],
-            'category': model_info['category'],
-            'model_type': model_type,
-            'makespan': 999999,  # Usar valor grande en lugar de inf
-            'execution_time': 'Error',
-            'status': f'ERROR: {str(e)[:50]}',
-            'success': False,
-            'error_detail': traceback.format_exc()
-        }
+    return runnable, rejected
 
 
-def run_comparison_parallel(selected_models, test_filename, solver_key, timeout, models_config, models_folder, max_workers=4):
+def run_comparison_parallel(selected_models, test_filename, solver_key, timeout, models_config, models_folder, max_workers=4,
+                            solve_options=None, history_bound=None):
     """
     Ejecuta comparación de múltiples modelos en paralelo
     
+    Los núcleos que usa cada solver se reservan en el presupuesto global
+    (ver core_budget_helper), por lo que varias comparaciones concurrentes
+    con solvers multihilo se encolan en lugar de sobresuscribir la CPU.
+    Antes de encolar, cada par modelo + test pasa la comprobación previa
+    (ver preflight_helper).
+    
     Args:
         selected_models: Lista de claves de modelos a comparar
         test_filename: Nombre del archivo de test
@@ -141,22 +277,32 @@ def run_comparison_parallel(selected_models, test_filename, solver_key, timeout,
         models_config: Configuración de modelos
         models_folder: Carpeta base de modelos
         max_workers: Número máximo de workers paralelos
+        solve_options: Opciones de resolución comunes a todos los modelos
+        history_bound: Modo de cota con la mejor solución conocida
     
     Returns:
         Lista de resultados ordenada por makespan
     """
-    results_list = []
+    # Los pares incompatibles se descartan sin ocupar un hueco de solver
+    selected_models, results_list = preflight_models(selected_models, test_filename, models_config, models_folder,
+                                                     solver_key)
+    if not selected_models:
+        return results_list
     
     with ThreadPoolExecutor(max_workers=min(len(selected_models), max_workers)) as executor:
+        # Cada hilo hereda el contexto de la petición (cliente para la admisión)
         future_to_model = {
             executor.submit(
+                contextvars.copy_context().run,
                 run_single_model_comparison, 
                 model_key, 
                 test_filename, 
                 solver_key, 
                 timeout,
                 models_config,
-                models_folder
+                models_folder,
+                solve_options,
+                history_bound
             ): model_key
             for model_key in selected_models
         }
@@ -167,8 +313,386 @@ def run_comparison_parallel(selected_models, test_filename, solver_key, timeout,
                 result = future.result()
                 if result:
                     results_list.append(result)
+            except AdmissionRejected:
+                cancel_pending(future_to_model)
+                raise
             except Exception as e:
                 pass
     
     results_list.sort(key=lambda x: x['makespan'])
     return results_list
+
+
+# Presupuesto mínimo (segundos) de una ronda de la carrera
+RACING_MIN_BUDGET = 1
+
+STATUS_RANK = {
+    'OPTIMAL_SOLUTION': 0,
+    'SATISFIED': 1,
+    'ALL_SOLUTIONS': 1,
+}
+
+
+def racing_rank_key(result):
+    """
+    Clave de ordenación de la carrera: (estado, makespan, cota)
+    
+    Gana el mejor estado (óptimo antes que satisfecho, y cualquiera de ellos
+    antes que desconocido o error), luego el menor makespan y, a igualdad,
+    la mayor cota inferior (menor gap).
+    """
+    status_rank = STATUS_RANK.get(result.get('status'), 2 if result.get('success') else 3)
+    bound = result.get('bound')
+    return (status_rank, result.get('makespan', 999999), -bound if bound is not None else float('inf'))
+
+
+def run_comparison_racing(selected_models, test_filename, solver_key, total_budget, models_config, models_folder,
+                          initial_budget=None, max_workers=4, solve_options=None, history_bound=None):
+    """
+    Ejecuta una comparación por eliminación sucesiva (successive halving)
+    
+    Todas las estrategias empiezan con un presupuesto pequeño; tras cada ronda
+    se descarta la peor mitad según racing_rank_key y las supervivientes se
+    vuelven a ejecutar con el doble de tiempo hasta agotar el presupuesto total
+    de reloj o quedar una sola estrategia. Con más estrategias que workers una
+    ronda se ejecuta en varias tandas, así que el presupuesto por modelo se
+    ajusta para que las tandas quepan en lo que queda y cada ronda descuenta
+    al menos lo reservado: la suma de rondas no supera total_budget.
+    
+    Args:
+        selected_models: Lista de claves de modelos a comparar
+        test_filename: Nombre del archivo de test
+        solver_key: Solver a utilizar
+        total_budget: Presupuesto total de reloj en segundos
+        models_config: Configuración de modelos
+        models_folder: Carpeta base de modelos
+        initial_budget: Presupuesto de la primera ronda (opcional)
+        max_workers: Número máximo de workers paralelos
+        solve_options: Opciones de resolución comunes a todos los modelos
+        history_bound: Modo de cota con la mejor solución conocida; cada ronda
+                       parte de la mejor encontrada hasta entonces
+    
+    Returns:
+        Tupla (lista de resultados ordenada, lista de rondas de eliminación)
+    """
+    survivors = list(selected_models)
+    
+    if initial_budget is None:
+        # Con n estrategias hay ceil(log2(n)) rondas de presupuestos b, 2b, 4b...
+        num_rounds = max(1, math.ceil(math.log2(max(len(survivors), 2))))
+        initial_budget = total_budget / (2 ** num_rounds - 1)
+    budget = max(RACING_MIN_BUDGET, initial_budget)
+    
+    latest_results = {}
+    eliminated_in_round = {}
+    rounds = []
+    remaining = total_budget
+    round_number = 0
+    
+    while survivors:
+        # Tandas de la ronda: los modelos que no caben en los workers esperan a los anteriores
+        waves = math.ceil(len(survivors) / max_workers)
+        round_budget = min(budget, remaining / waves)
+        if round_budget < RACING_MIN_BUDGET:
+            break
+        round_number += 1
+        
+        round_start = time.monotonic()
+        round_results = run_comparison_parallel(
+            survivors, test_filename, solver_key, round_budget,
+            models_config, models_folder, max_workers=max_workers,
+            solve_options=solve_options, history_bound=history_bound
+        )
+        elapsed = time.monotonic() - round_start
+        remaining -= max(elapsed, round_budget * waves)
+        
+        round_results.sort(key=racing_rank_key)
+        for result in round_results:
+            result['racing_budget'] = round(round_budget, 2)
+            result['racing_round'] = round_number
+            latest_results[result['model_key']] = result
+        
+        ranked_keys = [r['model_key'] for r in round_results]
+        keep = ranked_keys[:math.ceil(len(ranked_keys) / 2)] if len(ranked_keys) > 1 else ranked_keys
+        dropped = [key for key in ranked_keys if key not in keep]
+        
+        rounds.append({
+            'round': round_number,
+            'budget': round(round_budget, 2),
+            'elapsed': round(elapsed, 2),
+            'entries': [
+                {
+                    'model_key': r['model_key'],
+                    'model_name': r['model_name'],
+                    'status': r['status'],
+                    'makespan': r['makespan'] if r.get('success') else None,
+                    'bound': r.get('bound'),
+                    'eliminated': r['model_key'] in dropped
+                }
+                for r in round_results
+            ]
+        })
+        
+        for key in dropped:
+            eliminated_in_round[key] = round_number
+        
+        survivors = keep
+        budget *= 2
+        
+        # La última superviviente aprovecha una ronda final y termina
+        if len(ranked_keys) <= 1:
+            break
+    
+    results_list = list(latest_results.values())
+    for result in results_list:
+        result['eliminated_round'] = eliminated_in_round.get(result['model_key'])
+    
+    # Primero las supervivientes, luego las eliminadas más tarde
+    results_list.sort(key=lambda r: (
+        -(r['eliminated_round'] or round_number + 1),
+        racing_rank_key(r)
+    ))
+    return results_list, rounds
+
+
+# Rondas de la comparación cooperativa (presupuestos b, 2b, 4b...)
+COOPERATIVE_ROUNDS = 3
+
+
+def run_cooperative_slice(model_key, test_path, solver_key, budget, models_config, models_folder,
+                          solve_options=None, incumbent=None, strict=False):
+    """
+    Ejecuta un modelo durante una ronda de la comparación cooperativa
+    
+    Args:
+        incumbent: Makespan de la incumbente compartida de la familia o None;
+                   se añade ``end < incumbent`` (o ``<=`` si no es estricta)
+        strict: Si la cota sobre la incumbente es estricta
+    
+    Returns:
+        Diccionario con status, elapsed (segundos de reloj), row (fila de
+        resultados si hay solución o None) y error_detail si falló
+    """
+    model_info = models_config[model_key]
+    model_path = os.path.join(models_folder, model_info['file'])
+    start = time.monotonic()
+    try:
+        result, applied_options = solve_model(
+            model_path, test_path, solver_key, budget, solve_options,
+            extra_constraints=[bound_constraint(incumbent, strict)] if incumbent is not None else None
+        )
+        record_solve(test_path, model_key, model_info['type'], solver_key, result, applied_options, budget,
+                     strict_bound=incumbent if strict else None)
+    except AdmissionRejected:
+        raise
+    except Exception:
+        return {'status': 'ERROR', 'elapsed': time.monotonic() - start, 'row': None,
+                'error_detail': traceback.format_exc()}
+    
+    row = None
+    if result.status in [minizinc.Status.OPTIMAL_SOLUTION, minizinc.Status.SATISFIED]:
+        row = build_comparison_result(model_key, model_info, result, applied_options, test_path)
+    return {'status': str(result.status).replace('Status.', ''), 'elapsed': time.monotonic() - start, 'row': row}
+
+
+def run_comparison_cooperative(selected_models, test_filename, solver_key, total_budget, models_config, models_folder,
+                               initial_budget=None, max_workers=4, solve_options=None, history_bound=None):
+    """
+    Ejecuta una comparación cooperativa con una incumbente compartida por familia
+    
+    La cooperación se basa en reinicios: los modelos de una familia resuelven
+    la misma instancia en rondas de presupuesto creciente y, al terminar cada
+    ronda, la mejor solución encontrada por cualquiera (la incumbente) se
+    publica y todos se relanzan con ``end < incumbente``. Durante una ronda
+    los modelos no se comunican (MiniZinc no admite restricciones nuevas en
+    una resolución en curso): una solución hallada a mitad de ronda solo
+    acota a los demás desde el reinicio siguiente, y cada reinicio empieza
+    la búsqueda de cero. Una familia termina cuando su incumbente queda
+    demostrada: un modelo encuentra el óptimo o demuestra que no hay nada
+    mejor (UNSATISFIABLE con la cota estricta). Si la incumbente demostrada
+    es la histórica, el modelo que la demostró recibe la programación del
+    historial.
+    
+    Los tiempos no son los de cada estrategia por separado (cada una se
+    beneficia de las cotas de las demás); para comparar tiempos se usa el
+    modo independiente (run_comparison_parallel).
+    
+    Args:
+        total_budget: Presupuesto total de reloj en segundos
+        initial_budget: Presupuesto de la primera ronda (por defecto, el que
+                        reparte total_budget en COOPERATIVE_ROUNDS rondas)
+        history_bound: Modo de cota con la mejor solución conocida; es la
+                       incumbente inicial
+    
+    Returns:
+        Tupla (lista de resultados ordenada, lista de rondas)
+    """
+    selected_models, results_list = preflight_models(selected_models, test_filename, models_config, models_folder,
+                                                     solver_key)
+    
+    families = {}
+    stats = {}
+    for model_key in selected_models:
+        model_info = models_config[model_key]
+        test_path = get_test_path_for_model(models_folder, model_info['type'], test_filename)
+        if not os.path.exists(test_path):
+            results_list.append(build_comparison_error(model_key, model_info, 'ERROR: Test file not found',
+                                                       f'File not found: {test_path}'))
+            continue
+        
+        family = families.get(model_info['type'])
+        if family is None:
+            history_start = load_history_start(test_path, model_info['type'], history_bound)
+            family = families[model_info['type']] = {
+                'test_path': test_path,
+                'active': [],
+                'history': history_start,
+                'incumbent': history_start['bound'] if history_start else None,
+                'strict': history_start['strict'] if history_start else False,
+                'owner': None,
+                'proved_by': None,
+                'done': False
+            }
+        family['active'].append(model_key)
+        stats[model_key] = {'row': None, 'time': 0.0, 'rounds': 0, 'improvements': 0, 'time_to_best': None,
+                            'last_status': None, 'error_detail': None}
+    
+    if initial_budget is None:
+        initial_budget = total_budget / (2 ** COOPERATIVE_ROUNDS - 1)
+    budget = max(RACING_MIN_BUDGET, initial_budget)
+    
+    rounds = []
+    remaining = total_budget
+    clock = 0.0
+    
+    while True:
+        jobs = [(model_key, family) for family in families.values() if not family['done']
+                for model_key in family['active']]
+        if not jobs:
+            break
+        # Con más modelos que workers la ronda se ejecuta en varias tandas
+        waves = math.ceil(len(jobs) / max_workers)
+        round_budget = min(budget, remaining / waves)
+        if round_budget < RACING_MIN_BUDGET:
+            break
+        incumbents = {model_key: family['incumbent'] for model_key, family in jobs}
+        
+        round_start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=min(len(jobs), max_workers)) as executor:
+            future_to_model = {
+                executor.submit(
+                    contextvars.copy_context().run,
+                    run_cooperative_slice,
+                    model_key, family['test_path'], solver_key, round_budget, models_config, models_folder,
+                    solve_options, family['incumbent'], family['strict']
+                ): model_key
+                for model_key, family in jobs
+            }
+            outcomes = {}
+            for future in as_completed(future_to_model):
+                try:
+                    outcomes[future_to_model[future]] = future.result()
+                except AdmissionRejected:
+                    cancel_pending(future_to_model)
+                    raise
+        elapsed = time.monotonic() - round_start
+        
+        # Mejor solución de la ronda en cada familia (a igual makespan, la primera en orden de selección)
+        round_best = {}
+        for model_key, family in jobs:
+            row = outcomes[model_key]['row']
+            best_key = round_best.get(id(family))
+            if row is not None and (best_key is None or row['makespan'] < outcomes[best_key]['row']['makespan']):
+                round_best[id(family)] = model_key
+        
+        entries = []
+        for model_key, family in jobs:
+            outcome = outcomes[model_key]
+            stat = stats[model_key]
+            stat['time'] += outcome['elapsed']
+            stat['rounds'] += 1
+            stat['last_status'] = outcome['status']
+            row = outcome['row']
+            improved = False
+            
+            if row is not None:
+                if stat['row'] is None or row['makespan'] < stat['row']['makespan']:
+                    stat['row'] = row
+                    stat['time_to_best'] = clock + outcome['elapsed']
+                if round_best[id(family)] == model_key:
+                    if family['incumbent'] is None or row['makespan'] < family['incumbent']:
+                        family['incumbent'] = row['makespan']
+                        family['owner'] = model_key
+                        stat['improvements'] += 1
+                        improved = True
+                    elif family['owner'] is None and row['makespan'] == family['incumbent']:
+                        # Iguala la cota histórica: la incumbente pasa a tener programación
+                        family['owner'] = model_key
+            
+            if outcome['status'] == 'OPTIMAL_SOLUTION':
+                family['proved_by'] = model_key
+                family['done'] = True
+            elif outcome['status'] == 'UNSATISFIABLE':
+                # Con cota estricta demuestra que la incumbente es óptima; sin cota, la instancia no tiene solución
+                if incumbents[model_key] is not None and family['strict']:
+                    family['proved_by'] = model_key
+                family['done'] = True
+            elif outcome['status'] == 'ERROR':
+                stat['error_detail'] = outcome['error_detail']
+                family['active'].remove(model_key)
+            
+            entries.append({
+                'model_key': model_key,
+                'model_name': models_config[model_key]['name'],
+                'status': outcome['status'],
+                'makespan': row['makespan'] if row else None,
+                'incumbent': incumbents[model_key],
+                'improved': improved,
+                'eliminated': outcome['status'] == 'ERROR'
+            })
+        
+        # A partir de la primera incumbente solo se buscan mejoras
+        for family in families.values():
+            if family['incumbent'] is not None:
+                family['strict'] = True
+        
+        rounds.append({
+            'round': len(rounds) + 1,
+            'budget': round(round_budget, 2),
+            'elapsed': round(elapsed, 2),
+            'entries': sorted(entries, key=lambda entry: (entry['makespan'] is None, entry['makespan'] or 0))
+        })
+        # Cada ronda consume al menos su presupuesto: el calendario b, 2b, 4b no
+        # se alarga aunque todas las resoluciones terminen antes del límite
+        remaining -= max(elapsed, round_budget * waves)
+        clock += elapsed
+        budget *= 2
+    
+    for model_key, stat in stats.items():
+        model_info = models_config[model_key]
+        family = families[model_info['type']]
+        proved_by = family['proved_by']
+        
+        if stat['row'] is not None:
+            row = dict(stat['row'])
+            if proved_by and family['owner'] == model_key:
+                row['status'] = 'OPTIMAL_SOLUTION'
+        elif proved_by == model_key and family['owner'] is None and family['history']:
+            # Nadie mejoró la cota histórica y este modelo la demostró óptima
+            row = build_history_proof_result(model_key, model_info, family['history'])
+        else:
+            status = 'OPTIMALITY_PROOF' if proved_by == model_key else (stat['last_status'] or 'UNKNOWN')
+            row = build_comparison_error(model_key, model_info, status, stat['error_detail'])
+        
+        row['execution_time'] = f"{stat['time']:.4f}"
+        row['cooperative'] = {
+            'rounds': stat['rounds'],
+            'improvements': stat['improvements'],
+            'time_to_best': round(stat['time_to_best'], 2) if stat['time_to_best'] is not None else None,
+            'incumbent_owner': family['owner'] == model_key,
+            'proved_by': models_config[proved_by]['name'] if proved_by else None
+        }
+        results_list.append(row)
+    
+    results_list.sort(key=racing_rank_key)
+    return results_list, rounds
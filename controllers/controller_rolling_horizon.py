@@ -0,0 +1,334 @@
+"""
+Controlador para la descomposición por horizonte rodante (instancias grandes)
+"""
+import os
+import re
+import time
+import tempfile
+import minizinc
+
+from helpers.minizinc_helper import solve_model
+from helpers.data_helper import parse_instance_from_dzn, write_instance_dzn
+from helpers.scheduling_helper import list_schedule, build_results_from_schedule, validate_schedule
+from controllers.controller_oplimit import extract_oplimit_results
+from controllers.controller_workers import extract_workers_results
+from controllers.controller_maintenance import extract_maintenance_results
+
+
+def parse_window_options(form):
+    """
+    Lee y valida el tamaño de ventana y el solape de un formulario
+
+    Args:
+        form: Diccionario (o request.form) con window_size y window_overlap
+
+    Returns:
+        Tupla (window_size, overlap)
+
+    Raises:
+        ValueError: con el mensaje para el usuario si los valores no son
+                    enteros, la ventana no es positiva o el solape no es
+                    menor que la ventana
+    """
+    try:
+        window_size = int(form.get('window_size', 10))
+        overlap = int(form.get('window_overlap', 2))
+    except (TypeError, ValueError):
+        raise ValueError('El tamaño de ventana y el solape deben ser números enteros.')
+
+    if window_size < 1:
+        raise ValueError('Cada ventana debe tener al menos 1 job.')
+    if overlap < 0 or overlap >= window_size:
+        raise ValueError('El solape debe estar entre 0 y el número de jobs por ventana menos 1.')
+
+    return window_size, overlap
+
+
+def build_window_instance(instance, window_jobs, time_offset):
+    """
+    Construye la subinstancia de una ventana de jobs
+
+    Los paros de mantenimiento se trasladan al origen de la ventana y se
+    descartan los que ya terminaron antes de él.
+    """
+    window = dict(instance)
+    window['durations'] = [instance['durations'][job] for job in window_jobs]
+    window['jobs'] = len(window_jobs)
+
+    if instance['model_type'] == 'maintenance':
+        window['breaks'] = [
+            (machine, max(brk_a - time_offset, 0), brk_b - time_offset)
+            for machine, brk_a, brk_b in instance.get('breaks') or []
+            if brk_b > time_offset
+        ]
+
+    return window
+
+
+def build_boundary_constraints(model_type, machine_release, resource_release, num_resources):
+    """
+    Genera las restricciones de frontera de una ventana (tiempos relativos)
+
+    Args:
+        model_type: Tipo de modelo
+        machine_release: Instante de liberación de cada máquina
+        resource_release: Diccionario recurso -> instante de liberación
+        num_resources: Número de operarios/trabajadores
+
+    Returns:
+        Lista de restricciones MiniZinc
+    """
+    constraints = []
+
+    if any(machine_release):
+        values = ', '.join(str(r) for r in machine_release)
+        constraints.append(f'array[int] of int: rh_machine_release = [{values}];')
+        constraints.append('constraint forall(i in JOB, j in TASK)(s[i,j] >= rh_machine_release[j]);')
+
+    assignment_var = {'op_limit': 'o', 'workers_skills': 'w_assign'}.get(model_type)
+    if assignment_var and num_resources and any(resource_release.values()):
+        values = ', '.join(str(resource_release.get(r, 0)) for r in range(1, num_resources + 1))
+        constraints.append(f'array[int] of int: rh_resource_release = [{values}];')
+        constraints.append(
+            f'constraint forall(i in JOB, j in TASK)(s[i,j] >= rh_resource_release[{assignment_var}[i,j]]);'
+        )
+
+    return constraints
+
+
+# Restricciones de simetría de operarios: suponen operarios intercambiables,
+# lo que deja de ser cierto cuando cada uno se libera en un instante distinto
+SYMMETRY_BREAKING_LINES = (
+    'constraint forall(p in 2..k) ( bool2int(used[p]) <= bool2int(used[p-1]) );',
+    'constraint o[1,1] = 1;',
+    'constraint forall(p in 1..k-1)( carga[p] >= carga[p+1] );',
+)
+
+
+def build_window_model(model_source, release_horizon):
+    """
+    Adapta el modelo de la familia para resolver una ventana
+
+    El horizonte del modelo se calcula con las duraciones de la ventana, pero
+    las restricciones de frontera retrasan los inicios hasta
+    ``release_horizon``; se amplía a ``release_horizon`` más el horizonte
+    original para que la ventana no resulte insatisfacible. Se eliminan
+    además las restricciones de simetría de operarios.
+
+    Args:
+        model_source: Código MiniZinc del modelo
+        release_horizon: Mayor instante de liberación de máquinas y recursos
+
+    Returns:
+        Código MiniZinc del modelo de ventana
+    """
+    lines = [line for line in model_source.splitlines() if line.strip() not in SYMMETRY_BREAKING_LINES]
+    source = '\n'.join(lines) + '\n'
+
+    if re.search(r'^int: horizon = ', source, flags=re.M):
+        # Mantenimiento: el horizonte ya incluye los paros
+        return re.sub(r'^int: horizon = (.*);$', rf'int: horizon = {release_horizon} + (\1);',
+                      source, count=1, flags=re.M)
+
+    # Operarios/trabajadores: ``total`` sigue siendo el trabajo total (pesos del
+    # objetivo y cargas); solo los dominios de tiempo pasan a ``horizon``
+    source = re.sub(r'^(int: total = .*;)$', rf'\1\nint: horizon = {release_horizon} + total;',
+                    source, count=1, flags=re.M)
+    source = re.sub(r'\bvar 0\.\.total: (s|end|S_all)\b', r'var 0..horizon: \1', source)
+    return source.replace('int: ub_end = total;', 'int: ub_end = horizon;')
+
+
+def extract_window_schedule(result, model_type, durations):
+    """Extrae inicios y asignaciones de la solución de una ventana"""
+    if model_type == 'op_limit':
+        specific = extract_oplimit_results(result)
+        return specific['start_times'], specific['operator_assignment']
+    if model_type == 'workers_skills':
+        specific = extract_workers_results(result, durations)
+        return specific['start_times'], specific['worker_assignment']
+    return extract_maintenance_results(result)['start_times'], None
+
+
+def greedy_window_schedule(window, machine_release, resource_release, num_resources):
+    """
+    Programación de respaldo de una ventana cuando el solver no responde
+
+    Despacha las operaciones tarea a tarea y asigna a cada una el recurso
+    admisible que antes quede libre.
+    """
+    model_type = window['model_type']
+    num_jobs = window['jobs']
+    num_tasks = window['tasks']
+
+    priority = [(job, task) for task in range(num_tasks) for job in range(num_jobs)]
+    priority.sort(key=lambda op: (op[0] + op[1], op[1]))
+
+    assignment = None
+    resource_choices = None
+    if model_type == 'op_limit':
+        assignment = [[None] * num_tasks for _ in range(num_jobs)]
+        resource_choices = lambda job, task: range(1, num_resources + 1)
+    elif model_type == 'workers_skills':
+        assignment = [[None] * num_tasks for _ in range(num_jobs)]
+        resource_choices = lambda job, task: window['skills'][task]
+
+    start_times = list_schedule(
+        window['durations'],
+        priority,
+        assignment=assignment,
+        breaks=window.get('breaks'),
+        machine_release=machine_release,
+        resource_release=resource_release,
+        resource_choices=resource_choices
+    )
+    return start_times, assignment
+
+
+def run_rolling_horizon(model_key, data_path, solver_key, timeout, models_config, models_folder,
+                        window_size=10, overlap=2, solve_options=None):
+    """
+    Resuelve una instancia grande por ventanas de jobs solapadas
+
+    Cada ventana contiene ``window_size`` jobs nuevos más ``overlap`` jobs de
+    anticipación. Se resuelve con el modelo de la familia respetando las
+    condiciones de frontera de las ventanas anteriores (liberación de
+    máquinas, disponibilidad de operarios/trabajadores y paros restantes) y
+    solo se fijan los primeros ``window_size`` jobs; los de anticipación se
+    vuelven a programar en la ventana siguiente. Cada ventana usa una copia
+    del modelo con el horizonte ampliado y sin ruptura de simetrías (ver
+    build_window_model). Si el solver no encuentra solución para una ventana
+    se usa una programación por lista y la ventana queda registrada en
+    ``greedy_windows``.
+
+    Args:
+        model_key: Clave del modelo en la configuración
+        data_path: Ruta al archivo .dzn completo
+        solver_key: Solver a utilizar
+        timeout: Presupuesto total en segundos (se reparte entre ventanas)
+        models_config: Configuración de modelos
+        models_folder: Carpeta base de modelos
+        window_size: Jobs que se fijan en cada ventana
+        overlap: Jobs adicionales de anticipación por ventana
+        solve_options: Opciones de resolución
+
+    Returns:
+        Diccionario con los resultados unidos y la información de ventanas
+    """
+    model_info = models_config[model_key]
+    model_type = model_info['type']
+    model_path = os.path.join(models_folder, model_info['file'])
+
+    with open(model_path, 'r') as f:
+        model_source = f.read()
+
+    with open(data_path, 'r') as f:
+        instance = parse_instance_from_dzn(f.read(), model_type)
+
+    durations = instance['durations']
+    num_jobs = instance['jobs']
+    num_tasks = instance['tasks']
+    num_resources = instance.get('k') if model_type == 'op_limit' else instance.get('W')
+    window_size = max(1, int(window_size))
+    overlap = max(0, int(overlap))
+
+    num_windows = -(-num_jobs // window_size)
+    window_timeout = max(1, timeout / max(num_windows, 1))
+
+    start_times = [[0] * num_tasks for _ in range(num_jobs)]
+    assignment = [[0] * num_tasks for _ in range(num_jobs)] if num_resources else None
+    machine_release = [0] * num_tasks
+    resource_release = {}
+    windows = []
+    greedy_windows = []
+
+    wall_start = time.monotonic()
+    position = 0
+    while position < num_jobs:
+        window_jobs = list(range(position, min(position + window_size + overlap, num_jobs)))
+        commit_count = min(window_size, len(window_jobs))
+
+        # Tiempos relativos al primer instante libre de cualquier máquina
+        time_offset = min(machine_release)
+        relative_machine = [r - time_offset for r in machine_release]
+        relative_resource = {r: max(t - time_offset, 0) for r, t in resource_release.items()}
+
+        window = build_window_instance(instance, window_jobs, time_offset)
+        constraints = build_boundary_constraints(model_type, relative_machine, relative_resource, num_resources)
+
+        window_starts = None
+        window_assignment = None
+        window_status = 'GREEDY'
+        greedy_reason = None
+        release_horizon = max(relative_machine + list(relative_resource.values()) + [0])
+
+        fd, window_path = tempfile.mkstemp(suffix='.dzn')
+        model_fd, window_model_path = tempfile.mkstemp(suffix='.mzn')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(write_instance_dzn(window))
+            with os.fdopen(model_fd, 'w') as f:
+                f.write(build_window_model(model_source, release_horizon))
+
+            result, _ = solve_model(window_model_path, window_path, solver_key, window_timeout, solve_options,
+                                    extra_constraints=constraints)
+            if result.status in [minizinc.Status.OPTIMAL_SOLUTION, minizinc.Status.SATISFIED]:
+                window_starts, window_assignment = extract_window_schedule(result, model_type, window['durations'])
+                window_status = str(result.status).replace('Status.', '')
+            else:
+                greedy_reason = str(result.status).replace('Status.', '')
+        except minizinc.MiniZincError as e:
+            greedy_reason = f'{type(e).__name__}: {e}'
+        finally:
+            os.remove(window_path)
+            os.remove(window_model_path)
+
+        if window_starts is None:
+            window_starts, window_assignment = greedy_window_schedule(
+                window, relative_machine, relative_resource, num_resources
+            )
+
+        # Fijar solo los jobs comprometidos de la ventana
+        for local_job in range(commit_count):
+            job = window_jobs[local_job]
+            for task in range(num_tasks):
+                start = window_starts[local_job][task] + time_offset
+                end = start + durations[job][task]
+                start_times[job][task] = start
+                machine_release[task] = max(machine_release[task], end)
+                if assignment is not None:
+                    resource = window_assignment[local_job][task]
+                    assignment[job][task] = resource
+                    resource_release[resource] = max(resource_release.get(resource, 0), end)
+
+        windows.append({
+            'jobs': f'{window_jobs[0]+1}-{window_jobs[-1]+1}',
+            'committed': commit_count,
+            'status': window_status,
+            'offset': time_offset,
+            'greedy_reason': greedy_reason
+        })
+        if window_status == 'GREEDY':
+            greedy_windows.append(len(windows))
+        position += commit_count
+
+    elapsed = time.monotonic() - wall_start
+
+    results = build_results_from_schedule(start_times, durations, model_type, assignment, num_resources)
+    results['durations'] = durations
+    results['execution_time'] = f'{elapsed:.4f} segundos'
+    results['status'] = 'SATISFIED'
+    results['rolling_horizon'] = {
+        'window_size': window_size,
+        'overlap': overlap,
+        'windows': windows,
+        'greedy_windows': greedy_windows
+    }
+    results['validation_errors'] = validate_schedule(
+        start_times, durations,
+        assignment=assignment,
+        breaks=instance.get('breaks'),
+        num_resources=num_resources,
+        skills=instance.get('skills') if model_type == 'workers_skills' else None
+    )
+
+    return results
@@ -0,0 +1,92 @@
+"""
+Controlador para la ejecución de la configuración elegida automáticamente
+
+Ejecuta el plan de select_configuration: la configuración predicha como
+mejor y, si se pidió, una segunda opción corta cuando la primera no
+demuestra el óptimo. Se devuelve el mejor de los resultados.
+"""
+import os
+import minizinc
+
+from helpers.minizinc_helper import solve_model
+from helpers.history_helper import record_solve
+from helpers.warmstart_helper import strict_bound
+
+
+SOLUTION_STATUSES = (minizinc.Status.OPTIMAL_SOLUTION, minizinc.Status.SATISFIED, minizinc.Status.ALL_SOLUTIONS)
+
+# Estados tras los que la segunda opción no puede mejorar el resultado
+FINAL_STATUSES = (minizinc.Status.OPTIMAL_SOLUTION, minizinc.Status.UNSATISFIABLE)
+
+
+def outcome_rank(result):
+    """
+    Clave para comparar resultados (mayor es mejor)
+
+    Óptimo o insatisfacible (con cota estricta, prueba del óptimo) antes que
+    una solución sin demostrar, y entre soluciones la de menor makespan.
+    """
+    if result.status in FINAL_STATUSES:
+        return (2, 0)
+    if result.status in SOLUTION_STATUSES:
+        return (1, -result['end'])
+    return (0, 0)
+
+
+def run_selection_plan(plan, data_path, models_config, models_folder, solve_options=None,
+                       extra_constraints=None, history_start=None):
+    """
+    Ejecuta en orden las configuraciones de un plan de selección automática
+
+    Cada resolución se guarda en el historial (alimenta la propia
+    selección). La segunda configuración solo se lanza si la primera no
+    termina con un estado final; un error de MiniZinc en una configuración
+    que no es la última pasa a la siguiente.
+
+    Args:
+        plan: Lista de tuplas (model_key, solver_key, timeout)
+        extra_constraints: Restricciones añadidas (arranque en caliente, cota)
+        history_start: Cota histórica aplicada (ver build_history_start)
+
+    Returns:
+        Diccionario con result, applied_options, model_key, solver_key y
+        attempts (una entrada por configuración ejecutada)
+
+    Raises:
+        minizinc.MiniZincError: si fallan todas las configuraciones
+    """
+    best = None
+    attempts = []
+    last_error = None
+
+    for model_key, solver_key, timeout in plan:
+        model_info = models_config[model_key]
+        model_path = os.path.join(models_folder, model_info['file'])
+        attempt = {'model_key': model_key, 'model_name': model_info['name'], 'solver_key': solver_key,
+                   'timeout': timeout}
+        try:
+            result, applied_options = solve_model(model_path, data_path, solver_key, timeout, solve_options,
+                                                  extra_constraints=extra_constraints)
+        except minizinc.MiniZincError as e:
+            attempt['status'] = 'ERROR'
+            attempt['error'] = str(e)[:200]
+            attempts.append(attempt)
+            last_error = e
+            continue
+
+        record_solve(data_path, model_key, model_info['type'], solver_key, result, applied_options, timeout,
+                     strict_bound=strict_bound(history_start))
+        attempt['status'] = str(result.status).replace('Status.', '')
+        attempt['makespan'] = result['end'] if result.status in SOLUTION_STATUSES else None
+        attempts.append(attempt)
+
+        if best is None or outcome_rank(result) > outcome_rank(best['result']):
+            best = {'result': result, 'applied_options': applied_options,
+                    'model_key': model_key, 'solver_key': solver_key}
+        if result.status in FINAL_STATUSES:
+            break
+
+    if best is None:
+        raise last_error
+    best['attempts'] = attempts
+    return best
@@ -0,0 +1,264 @@
+"""
+Helper para el control de admisión de procesos de solver
+
+Limita cuántos subprocesos de MiniZinc corren a la vez en todo el proceso.
+Las peticiones que no encuentran hueco esperan en una cola acotada; si la
+cola está llena (o la espera supera el límite) se rechazan al momento para
+que la aplicación responda 503 en lugar de lanzar más solvers. Las esperas
+síncronas (un hilo de Flask bloqueado) tienen un límite más corto que las
+asíncronas. Los huecos
+libres se reparten por turnos entre clientes, de modo que una comparación de
+muchos modelos de un usuario no deja sin turno al resto.
+"""
+import os
+import time
+import asyncio
+import threading
+import contextvars
+from collections import OrderedDict, deque
+from contextlib import contextmanager, asynccontextmanager
+
+
+# Espera máxima (segundos) de una petición síncrona antes de responder 503
+DEFAULT_SYNC_WAIT = 10
+
+# Cliente al que se atribuyen las resoluciones de la petición en curso
+current_client = contextvars.ContextVar('current_client', default='local')
+
+# Espera máxima en cola de las resoluciones síncronas de la petición en curso
+# (None: la del controlador). Una comparación la amplía: sus modelos esperan
+# unos a otros por el límite de huecos por cliente.
+current_max_wait = contextvars.ContextVar('current_max_wait', default=None)
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
+
+
+def make_waker(loop, future):
+    """
+    Función que despierta desde cualquier hilo una espera asíncrona
+
+    Las reservas y admisiones se liberan tanto desde hilos (Flask) como desde
+    el bucle de eventos: la espera asíncrona registra una future de su bucle
+    y la liberación la resuelve con call_soon_threadsafe, sin sondeo.
+    """
+    def wake():
+        try:
+            loop.call_soon_threadsafe(_resolve, future)
+        except RuntimeError:
+            # El bucle ya se cerró: nadie espera esa future
+            pass
+    return wake
+
+
+class AdmissionRejected(Exception):
+    """No hay hueco para un solver y la cola está llena o la espera expiró"""
+
+    def __init__(self, message, retry_after=5):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class _Ticket:
+    __slots__ = ('client', 'granted', 'wake')
+
+    def __init__(self, client, wake=None):
+        self.client = client
+        self.granted = False
+        # Aviso a una espera asíncrona cuando se concede el hueco (make_waker)
+        self.wake = wake
+
+
+class AdmissionController:
+    """
+    Huecos de solver compartidos con cola acotada y reparto justo por cliente
+
+    Args:
+        slots: Número máximo de solvers en ejecución simultánea
+        max_queue: Número máximo de peticiones esperando hueco
+        max_wait: Espera máxima en cola (segundos)
+        client_slots: Máximo de huecos que puede ocupar un mismo cliente
+        sync_wait: Espera máxima de admit (síncrona); por defecto max_wait
+    """
+
+    def __init__(self, slots, max_queue=32, max_wait=120, client_slots=None, sync_wait=None):
+        self.slots = max(1, int(slots))
+        self.max_queue = max(0, int(max_queue))
+        self.max_wait = max_wait
+        self.sync_wait = min(sync_wait, max_wait) if sync_wait is not None else max_wait
+        self.client_slots = max(1, int(client_slots)) if client_slots else self.slots
+        self._running = {}
+        self._waiting = OrderedDict()
+        self._condition = threading.Condition()
+
+    @property
+    def in_use(self):
+        with self._condition:
+            return sum(self._running.values())
+
+    @property
+    def queued(self):
+        with self._condition:
+            return sum(len(tickets) for tickets in self._waiting.values())
+
+    def status(self):
+        """Estado actual para mostrar en la interfaz o en /api"""
+        with self._condition:
+            return {
+                'slots': self.slots,
+                'in_use': sum(self._running.values()),
+                'queued': sum(len(tickets) for tickets in self._waiting.values()),
+                'max_queue': self.max_queue,
+                'clients': len(set(self._running) | set(self._waiting))
+            }
+
+    def ensure_capacity(self, requested=1):
+        """
+        Rechaza de inmediato si ``requested`` solvers no caben entre los
+        huecos libres y la cola (se usa antes de empezar una comparación)
+        """
+        with self._condition:
+            free = self.slots - sum(self._running.values())
+            queued = sum(len(tickets) for tickets in self._waiting.values())
+            if requested > free + (self.max_queue - queued):
+                raise AdmissionRejected('Servidor saturado: demasiadas resoluciones en curso.')
+
+    def _dispatch(self):
+        """Asigna los huecos libres recorriendo los clientes en espera por turnos"""
+        free = self.slots - sum(self._running.values())
+        while free > 0 and self._waiting:
+            granted = False
+            for client in list(self._waiting):
+                if self._running.get(client, 0) >= self.client_slots:
+                    continue
+                ticket = self._waiting[client].popleft()
+                # El cliente atendido pasa al final del turno
+                if self._waiting[client]:
+                    self._waiting.move_to_end(client)
+                else:
+                    del self._waiting[client]
+                ticket.granted = True
+                if ticket.wake is not None:
+                    ticket.wake()
+                self._running[client] = self._running.get(client, 0) + 1
+                free -= 1
+                granted = True
+                break
+            if not granted:
+                break
+        self._condition.notify_all()
+
+    def _enqueue(self, client, wake=None):
+        with self._condition:
+            queued = sum(len(tickets) for tickets in self._waiting.values())
+            if queued >= self.max_queue and sum(self._running.values()) >= self.slots:
+                raise AdmissionRejected('Servidor saturado: la cola de resoluciones está llena.')
+            ticket = _Ticket(client, wake)
+            self._waiting.setdefault(client, deque()).append(ticket)
+            self._dispatch()
+            return ticket
+
+    def _abandon(self, ticket):
+        """Retira de la cola una petición que dejó de esperar"""
+        with self._condition:
+            if ticket.granted:
+                self._release(ticket.client)
+                return
+            tickets = self._waiting.get(ticket.client)
+            if tickets and ticket in tickets:
+                tickets.remove(ticket)
+                if not tickets:
+                    del self._waiting[ticket.client]
+
+    def _release(self, client):
+        with self._condition:
+            self._running[client] -= 1
+            if not self._running[client]:
+                del self._running[client]
+            self._dispatch()
+
+    @contextmanager
+    def admit(self, client=None, max_wait=None):
+        """
+        Ocupa un hueco de solver durante el bloque ``with``
+
+        Args:
+            max_wait: Espera máxima en cola; por defecto current_max_wait o,
+                      si no está fijada, sync_wait
+
+        Raises:
+            AdmissionRejected: si la cola está llena o la espera expira
+        """
+        client = client or current_client.get()
+        max_wait = max_wait or current_max_wait.get() or self.sync_wait
+        ticket = self._enqueue(client)
+        deadline = time.monotonic() + max_wait
+        with self._condition:
+            while not ticket.granted:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+        if not ticket.granted:
+            self._abandon(ticket)
+            raise AdmissionRejected('Tiempo de espera en cola agotado.')
+        try:
+            yield
+        finally:
+            self._release(client)
+
+    @asynccontextmanager
+    async def admit_async(self, client=None):
+        """
+        Versión asíncrona de admit; cancelar la tarea la retira de la cola
+
+        Espera una future que _dispatch resuelve al conceder el hueco, desde
+        el hilo que lo libere.
+        """
+        client = client or current_client.get()
+        loop = asyncio.get_running_loop()
+        granted = loop.create_future()
+        ticket = self._enqueue(client, make_waker(loop, granted))
+        try:
+            if not ticket.granted:
+                try:
+                    await asyncio.wait_for(granted, self.max_wait)
+                except asyncio.TimeoutError:
+                    raise AdmissionRejected('Tiempo de espera en cola agotado.')
+        except BaseException:
+            self._abandon(ticket)
+            raise
+        try:
+            yield
+        finally:
+            self._release(client)
+
+
+_admission_controller = None
+_admission_lock = threading.Lock()
+
+
+def get_admission_controller():
+    """
+    Obtiene el controlador de admisión global
+
+    Se configura con las variables de entorno JOBSHOP_MAX_SOLVERS (por
+    defecto, el número de núcleos), JOBSHOP_ADMISSION_QUEUE (32),
+    JOBSHOP_ADMISSION_WAIT (120 s), JOBSHOP_ADMISSION_SYNC_WAIT (espera
+    de las peticiones síncronas, 10 s) y JOBSHOP_CLIENT_MAX_SOLVERS (por
+    defecto, la mitad de los huecos).
+    """
+    global _admission_controller
+    with _admission_lock:
+        if _admission_controller is None:
+            slots = int(os.environ.get('JOBSHOP_MAX_SOLVERS') or os.cpu_count() or 1)
+            _admission_controller = AdmissionController(
+                slots,
+                max_queue=int(os.environ.get('JOBSHOP_ADMISSION_QUEUE', 32)),
+                max_wait=float(os.environ.get('JOBSHOP_ADMISSION_WAIT', 120)),
+                client_slots=int(os.environ.get('JOBSHOP_CLIENT_MAX_SOLVERS') or max(1, slots // 2)),
+                sync_wait=float(os.environ.get('JOBSHOP_ADMISSION_SYNC_WAIT') or DEFAULT_SYNC_WAIT)
+            )
+        return _admission_controller
@@ -0,0 +1,86 @@
+"""
+Helper con una caché LRU sencilla y segura entre hilos
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Caché de tamaño acotado que descarta la entrada usada hace más tiempo
+
+    Las operaciones están protegidas por un lock porque Flask y las
+    comparaciones en paralelo acceden desde varios hilos.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = max(1, int(maxsize))
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Devuelve el valor de ``key`` (y lo marca como reciente) o ``default``"""
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value):
+        """Guarda ``value`` y descarta la entrada más antigua si se excede el tamaño"""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Vacía la caché"""
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+
+def hash_files(*paths):
+    """
+    Calcula un hash sha256 del contenido de varios archivos
+
+    Returns:
+        Hash hexadecimal que cambia si cambia el contenido de cualquiera
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(65536), b''):
+                digest.update(chunk)
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def hash_content(content):
+    """
+    Hash sha256 del contenido de una instancia
+
+    Identifica una instancia por su contenido y no por su nombre: el mismo
+    .dzn subido con otro nombre o cargado desde tests produce el mismo hash.
+
+    Args:
+        content: Contenido como str o bytes
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return hashlib.sha256(content).hexdigest()
+
+
+def hash_instance_file(path):
+    """Hash de contenido (ver hash_content) de un archivo .dzn"""
+    with open(path, 'rb') as f:
+        return hash_content(f.read())
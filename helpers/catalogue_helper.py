@@ -0,0 +1,242 @@
+"""
+Helper con el catálogo de instancias de test (models/*/tests/*.dzn)
+
+get_test_files hacía un os.listdir en cada carga de página y en cada
+llamada a /api/get_tests y solo devolvía nombres. El catálogo se construye
+al arrancar y guarda, por instancia, sus dimensiones, el hash de contenido
+(el mismo que usa el historial), las cotas triviales del makespan y la
+mejor solución conocida. Solo se vuelve a leer un .dzn cuando cambia su
+mtime o su tamaño; las comprobaciones se espacian al menos
+JOBSHOP_CATALOGUE_INTERVAL segundos.
+"""
+import os
+import time
+import logging
+import sqlite3
+import threading
+import numpy as np
+
+from helpers.cache_helper import hash_content
+from helpers.data_helper import parse_instance_from_dzn
+from helpers.history_helper import best_known_solutions
+from helpers.registry_helper import MODELS
+
+
+# Segundos mínimos entre dos comprobaciones de mtime (y consultas al historial)
+DEFAULT_CHECK_INTERVAL = 2.0
+
+CATALOGUE_ORDERS = ('name', 'size')
+
+logger = logging.getLogger(__name__)
+
+
+def trivial_bounds(instance):
+    """
+    Cotas triviales del makespan de una instancia
+
+    Inferior: la mayor de la duración del job más largo, la carga de la
+    máquina más cargada (la tarea t va a la máquina t) y, con operarios o
+    trabajadores, el trabajo total repartido entre ellos. Superior: todas
+    las operaciones en serie (en mantenimiento, tras el último paro).
+
+    Args:
+        instance: Diccionario de parse_instance_from_dzn
+
+    Returns:
+        Tupla (inferior, superior)
+    """
+    durations = np.asarray(instance['durations'], dtype=np.int64)
+    if durations.size == 0:
+        return 0, 0
+    total = int(durations.sum())
+    lower = max(int(durations.sum(axis=1).max()), int(durations.sum(axis=0).max()))
+
+    resources = instance.get('k') or instance.get('W')
+    if resources:
+        lower = max(lower, -(-total // resources))
+
+    upper = total
+    breaks = instance.get('breaks')
+    if breaks:
+        upper += max(end for _, _, end in breaks)
+    return lower, upper
+
+
+def describe_test_instance(path, model_type):
+    """
+    Lee un .dzn y extrae los datos del catálogo
+
+    Returns:
+        Diccionario con hash, size, dimensiones, parámetros de familia
+        (k, W, Nbreaks), total_work y las cotas triviales
+
+    Raises:
+        ValueError: si el archivo no contiene una matriz de duraciones válida
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    instance = parse_instance_from_dzn(data.decode('utf-8'), model_type)
+    if not instance['jobs'] or any(len(row) != instance['tasks'] for row in instance['durations']):
+        raise ValueError('Matriz de duraciones vacía o no rectangular')
+
+    lower, upper = trivial_bounds(instance)
+    entry = {
+        'name': os.path.basename(path),
+        'model_type': model_type,
+        'hash': hash_content(data),
+        'size': len(data),
+        'jobs': instance['jobs'],
+        'tasks': instance['tasks'],
+        'operations': instance['jobs'] * instance['tasks'],
+        'total_work': int(sum(map(sum, instance['durations']))),
+        'lower_bound': lower,
+        'upper_bound': upper
+    }
+    for name in ('k', 'W'):
+        if instance.get(name) is not None:
+            entry[name] = instance[name]
+    if 'breaks' in instance:
+        entry['Nbreaks'] = len(instance['breaks'])
+    return entry
+
+
+class InstanceCatalogue:
+    """
+    Catálogo de las instancias de test de cada familia de modelos
+
+    Attributes:
+        models_folder: Carpeta base de modelos
+        folders: Carpeta de modelos (relativa) -> tipo de modelo
+        check_interval: Segundos mínimos entre comprobaciones
+    """
+
+    def __init__(self, models_folder, models_config, check_interval=DEFAULT_CHECK_INTERVAL):
+        self.models_folder = models_folder
+        self.folders = {}
+        for model in models_config.values():
+            self.folders.setdefault(os.path.dirname(model['file']), model['type'])
+        self.check_interval = check_interval
+
+        self._lock = threading.Lock()
+        # Ruta -> ((mtime_ns, tamaño), entrada)
+        self._files = {}
+        self._checked = None
+        # (hash, tipo) -> fila de best_known_solutions
+        self._best = {}
+        self._best_checked = None
+
+    def refresh(self, force=False):
+        """
+        Revisa los directorios de tests y relee los .dzn nuevos o modificados
+
+        Returns:
+            True si el catálogo ha cambiado
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._checked is not None and now - self._checked < self.check_interval:
+                return False
+            self._checked = now
+
+            files = {}
+            changed = False
+            for folder, model_type in self.folders.items():
+                tests_folder = os.path.join(self.models_folder, folder, 'tests')
+                try:
+                    scanned = list(os.scandir(tests_folder))
+                except OSError:
+                    continue
+                for dir_entry in scanned:
+                    if not dir_entry.name.endswith('.dzn') or not dir_entry.is_file():
+                        continue
+                    stat = dir_entry.stat()
+                    key = (stat.st_mtime_ns, stat.st_size)
+                    cached = self._files.get(dir_entry.path)
+                    if cached is not None and cached[0] == key:
+                        files[dir_entry.path] = cached
+                        continue
+                    try:
+                        entry = describe_test_instance(dir_entry.path, model_type)
+                    except (OSError, UnicodeDecodeError, ValueError) as e:
+                        logger.debug('Instancia de test ignorada %s: %s', dir_entry.path, e)
+                        entry = None
+                    files[dir_entry.path] = (key, entry)
+                    changed = True
+
+            changed = changed or files.keys() != self._files.keys()
+            self._files = files
+            return changed
+
+    def _best_known(self):
+        """Mejores soluciones del historial por (hash, tipo), con la misma espera que refresh"""
+        now = time.monotonic()
+        if self._best_checked is None or now - self._best_checked >= self.check_interval:
+            try:
+                rows = best_known_solutions()
+            except (sqlite3.Error, OSError) as e:
+                logger.debug('Error consultando el historial: %s', e)
+                rows = []
+            self._best = {(row['instance_hash'], row['model_type']): row for row in rows}
+            self._best_checked = now
+        return self._best
+
+    def instances(self, model_type, order='name'):
+        """
+        Instancias de una familia con su mejor solución conocida
+
+        Args:
+            model_type: Tipo de modelo (op_limit, workers_skills, maintenance)
+            order: 'name' o 'size' (número de operaciones, de menor a mayor)
+
+        Returns:
+            Lista de diccionarios (copias) con best_makespan y best_runs
+            añadidos (None y 0 si la instancia no está en el historial)
+        """
+        self.refresh()
+        best = self._best_known()
+        with self._lock:
+            entries = [entry for _, entry in self._files.values()
+                       if entry is not None and entry['model_type'] == model_type]
+
+        listed = []
+        for entry in entries:
+            row = best.get((entry['hash'], model_type))
+            listed.append({
+                **entry,
+                'best_makespan': row['makespan'] if row else None,
+                'best_runs': row['runs'] if row else 0
+            })
+        if order == 'size':
+            listed.sort(key=lambda entry: (entry['operations'], entry['name']))
+        else:
+            listed.sort(key=lambda entry: entry['name'])
+        return listed
+
+    def get(self, model_type, name):
+        """Entrada de una instancia por tipo y nombre de archivo o None si no existe"""
+        for entry in self.instances(model_type):
+            if entry['name'] == name:
+                return entry
+        return None
+
+
+_catalogue = None
+_catalogue_lock = threading.Lock()
+
+
+def get_instance_catalogue(models_folder='models', models_config=None):
+    """
+    Obtiene el catálogo global de instancias, construyéndolo la primera vez
+
+    Se configura con JOBSHOP_CATALOGUE_INTERVAL (segundos entre
+    comprobaciones de mtime, por defecto 2).
+    """
+    global _catalogue
+    with _catalogue_lock:
+        if _catalogue is None:
+            _catalogue = InstanceCatalogue(
+                models_folder, models_config or MODELS,
+                check_interval=float(os.environ.get('JOBSHOP_CATALOGUE_INTERVAL') or DEFAULT_CHECK_INTERVAL)
+            )
+            _catalogue.refresh(force=True)
+        return _catalogue
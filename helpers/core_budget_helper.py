@@ -0,0 +1,142 @@
+"""
+Helper para la contabilidad de núcleos de CPU usados por los solvers
+"""
+import os
+import time
+import asyncio
+import threading
+from contextlib import contextmanager, asynccontextmanager
+
+from helpers.admission_helper import AdmissionRejected, DEFAULT_SYNC_WAIT, current_max_wait, make_waker
+
+
+class CoreBudget:
+    """
+    Presupuesto global de núcleos compartido por todas las ejecuciones
+
+    Cada ejecución reserva tantos núcleos como hilos usa su solver; si no
+    hay núcleos libres suficientes espera a que otra ejecución los libere.
+    Así varias comparaciones concurrentes no sobresuscriben la máquina. La
+    reserva se pide con el hueco de admisión ya ocupado, así que la espera
+    tiene el mismo límite que la admisión y expira con AdmissionRejected.
+
+    Args:
+        total_cores: Núcleos del presupuesto
+        sync_wait: Espera máxima de reserve (síncrona)
+        max_wait: Espera máxima de reserve_async
+    """
+
+    def __init__(self, total_cores, sync_wait=DEFAULT_SYNC_WAIT, max_wait=120):
+        self.total_cores = max(1, int(total_cores))
+        self.sync_wait = sync_wait
+        self.max_wait = max_wait
+        self._in_use = 0
+        self._condition = threading.Condition()
+        # Esperas asíncronas pendientes (make_waker)
+        self._async_waiters = set()
+
+    @property
+    def available(self):
+        """Núcleos libres en este momento"""
+        with self._condition:
+            return self.total_cores - self._in_use
+
+    def clamp(self, cores):
+        """Ajusta una petición de núcleos al rango [1, total_cores]"""
+        return min(max(1, int(cores)), self.total_cores)
+
+    def _release(self, cores):
+        with self._condition:
+            self._in_use -= cores
+            self._condition.notify_all()
+            for wake in self._async_waiters:
+                wake()
+
+    @contextmanager
+    def reserve(self, cores, max_wait=None):
+        """
+        Reserva núcleos durante la duración del bloque ``with``
+
+        Args:
+            cores: Número de núcleos solicitados (se ajusta al presupuesto)
+            max_wait: Espera máxima; por defecto current_max_wait o, si no
+                      está fijada, sync_wait
+
+        Yields:
+            Número de núcleos efectivamente reservados
+
+        Raises:
+            AdmissionRejected: si los núcleos no quedan libres a tiempo
+        """
+        cores = self.clamp(cores)
+        max_wait = max_wait or current_max_wait.get() or self.sync_wait
+        deadline = time.monotonic() + max_wait
+        with self._condition:
+            while self._in_use + cores > self.total_cores:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise AdmissionRejected('Tiempo de espera de núcleos agotado.')
+                self._condition.wait(remaining)
+            self._in_use += cores
+        try:
+            yield cores
+        finally:
+            self._release(cores)
+
+    @asynccontextmanager
+    async def reserve_async(self, cores, max_wait=None):
+        """
+        Versión asíncrona de reserve para el servidor ASGI
+
+        Espera una future que cada liberación resuelve (en lugar de bloquear
+        el hilo del bucle de eventos) y vuelve a intentarlo; si la tarea se
+        cancela mientras espera o la espera supera ``max_wait`` (por defecto
+        el de la instancia) no reserva nada.
+        """
+        cores = self.clamp(cores)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (max_wait or self.max_wait)
+        while True:
+            future = loop.create_future()
+            wake = make_waker(loop, future)
+            with self._condition:
+                if self._in_use + cores <= self.total_cores:
+                    self._in_use += cores
+                    break
+                self._async_waiters.add(wake)
+            try:
+                await asyncio.wait_for(future, max(0, deadline - loop.time()))
+            except asyncio.TimeoutError:
+                raise AdmissionRejected('Tiempo de espera de núcleos agotado.')
+            finally:
+                with self._condition:
+                    self._async_waiters.discard(wake)
+        try:
+            yield cores
+        finally:
+            self._release(cores)
+
+
+_core_budget = None
+_core_budget_lock = threading.Lock()
+
+
+def get_core_budget():
+    """
+    Obtiene el presupuesto global de núcleos
+
+    El tamaño se lee de la variable de entorno JOBSHOP_CORE_BUDGET la primera
+    vez que se solicita (después de cargar el .env); por defecto usa todos los
+    núcleos de la máquina. Las esperas son las de la admisión
+    (JOBSHOP_ADMISSION_SYNC_WAIT y JOBSHOP_ADMISSION_WAIT).
+    """
+    global _core_budget
+    with _core_budget_lock:
+        if _core_budget is None:
+            total = os.environ.get('JOBSHOP_CORE_BUDGET') or os.cpu_count() or 1
+            _core_budget = CoreBudget(
+                total,
+                sync_wait=float(os.environ.get('JOBSHOP_ADMISSION_SYNC_WAIT') or DEFAULT_SYNC_WAIT),
+                max_wait=float(os.environ.get('JOBSHOP_ADMISSION_WAIT', 120))
+            )
+        return _core_budget
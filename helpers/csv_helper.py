@@ -1,6 +1,9 @@
 """
 Helper para exportación de resultados a CSV
 """
+import numpy as np
+
+from helpers.schedule_index_helper import get_schedule_index
 
 
 def generate_single_result_csv(results):
@@ -29,25 +32,15 @@ def generate_single_result_csv(results):
     else:
         csv_lines.append('Job,Tarea/Maquina,Inicio,Duracion')
     
-    start_times = results.get('start_times', [])
-    durations = results.get('durations', [])
-    
-    if model_type == 'op_limit':
-        assignments = results.get('operator_assignment', [])
-        for job_idx, (start_row, duration_row, assign_row) in enumerate(zip(start_times, durations, assignments)):
-            for task_idx, (start, duration, assign) in enumerate(zip(start_row, duration_row, assign_row)):
-                csv_lines.append(f'{job_idx+1},{task_idx+1},{start},{duration},{assign}')
-    
-    elif model_type == 'workers_skills':
-        assignments = results.get('worker_assignment', [])
-        for job_idx, (start_row, duration_row, assign_row) in enumerate(zip(start_times, durations, assignments)):
-            for task_idx, (start, duration, assign) in enumerate(zip(start_row, duration_row, assign_row)):
-                csv_lines.append(f'{job_idx+1},{task_idx+1},{start},{duration},{assign}')
-    
-    else:
-        for job_idx, (start_row, duration_row) in enumerate(zip(start_times, durations)):
-            for task_idx, (start, duration) in enumerate(zip(start_row, duration_row)):
-                csv_lines.append(f'{job_idx+1},{task_idx+1},{start},{duration}')
+    index = get_schedule_index(results)
+    if index is not None:
+        # Filas job×tarea en orden (job, tarea) sin bucles anidados
+        jobs, tasks = np.indices(index.starts.shape)
+        columns = [jobs.ravel() + 1, tasks.ravel() + 1, index.starts.ravel(), index.durations.ravel()]
+        if model_type in ('op_limit', 'workers_skills') and index.assignment is not None:
+            columns.append(index.assignment.ravel())
+        for row in np.column_stack(columns).tolist():
+            csv_lines.append(','.join(map(str, row)))
     
     csv_lines.append('')
     csv_lines.append('=== RESUMEN ===')
@@ -56,13 +49,18 @@ def generate_single_result_csv(results):
     csv_lines.append(f'Makespan,{results["makespan"]}')
     csv_lines.append(f'Tiempo de ejecucion,{results["execution_time"]}')
     csv_lines.append(f'Solver,{results["solver"]}')
+    if results.get('solve_options_label'):
+        csv_lines.append(f'Opciones del solver,{results["solve_options_label"]}')
     csv_lines.append(f'Archivo de datos,{results["data_file"]}')
+    if results.get('peak_rss_mb') is not None:
+        csv_lines.append(f'Memoria pico (MB),{results["peak_rss_mb"]}')
     
     if model_type == 'op_limit':
         csv_lines.append('')
         csv_lines.append('=== CARGA DE OPERARIOS ===')
         csv_lines.append('Operario,Carga')
-        for idx, load in enumerate(results.get('operator_load', [])):
+        operator_load = index.resource_loads() if index is not None else None
+        for idx, load in enumerate(operator_load.tolist() if operator_load is not None else []):
             csv_lines.append(f'{idx+1},{load}')
         csv_lines.append(f'Carga Maxima,{results.get("max_load", "N/A")}')
         csv_lines.append(f'Carga Minima,{results.get("min_load", "N/A")}')
@@ -71,10 +69,10 @@ def generate_single_result_csv(results):
     elif model_type == 'workers_skills':
         csv_lines.append('')
         csv_lines.append('=== CARGA DE TRABAJADORES ===')
-        worker_load = results.get('worker_load', [])
-        if worker_load:
+        worker_load = index.resource_loads() if index is not None else None
+        if worker_load is not None and len(worker_load):
             csv_lines.append('Trabajador,Carga')
-            for idx, load in enumerate(worker_load, 1):
+            for idx, load in enumerate(worker_load.tolist(), 1):
                 csv_lines.append(f'{idx},{load}')
             csv_lines.append(f'Carga Maxima,{results.get("max_load", "N/A")}')
             csv_lines.append(f'Carga Minima,{results.get("min_load", "N/A")}')
@@ -100,10 +98,12 @@ def generate_comparison_csv(comparison_results):
     csv_lines.append('=== COMPARACIÓN DE MODELOS ===')
     csv_lines.append(f'Archivo de test,{comparison_results["test_file"]}')
     csv_lines.append(f'Solver,{comparison_results["solver"]}')
+    if comparison_results.get('solve_options_label'):
+        csv_lines.append(f'Opciones del solver,{comparison_results["solve_options_label"]}')
     csv_lines.append(f'Modelos comparados,{len(comparison_results["results"])}')
     csv_lines.append('')
     
-    csv_lines.append('Ranking,Categoria,Modelo,Tipo,Makespan,Tiempo(seg),Desbalance,Carga Max,Carga Min,Num Operarios/Trabajadores,Estado')
+    csv_lines.append('Ranking,Categoria,Modelo,Tipo,Makespan,Tiempo(seg),Desbalance,Carga Max,Carga Min,Num Operarios/Trabajadores,Estado,Memoria pico (MB)')
     
     for idx, result in enumerate(comparison_results['results'], 1):
         ranking = f'#{idx}' if idx > 1 else 'GANADOR'
@@ -135,8 +135,34 @@ def generate_comparison_csv(comparison_results):
             num_workers = 'N/A'
         
         status = result.get('status', 'N/A')
+        peak_rss = result.get('peak_rss_mb')
+        peak_rss = peak_rss if peak_rss is not None else 'N/A'
         
-        csv_lines.append(f'{ranking},{categoria},{modelo},{tipo},{makespan},{tiempo},{desbalance},{max_load},{min_load},{num_workers},{status}')
+        csv_lines.append(f'{ranking},{categoria},{modelo},{tipo},{makespan},{tiempo},{desbalance},{max_load},{min_load},{num_workers},{status},{peak_rss}')
+    
+    racing_rounds = comparison_results.get('racing_rounds') or []
+    if racing_rounds:
+        csv_lines.append('')
+        csv_lines.append('=== RONDAS DE ELIMINACION ===')
+        csv_lines.append('Ronda,Presupuesto(seg),Modelo,Estado,Makespan,Cota,Eliminado')
+        for racing_round in racing_rounds:
+            for entry in racing_round['entries']:
+                makespan = entry['makespan'] if entry['makespan'] is not None else 'N/A'
+                bound = entry['bound'] if entry['bound'] is not None else 'N/A'
+                eliminado = 'Si' if entry['eliminated'] else 'No'
+                csv_lines.append(f'{racing_round["round"]},{racing_round["budget"]},{entry["model_name"]},{entry["status"]},{makespan},{bound},{eliminado}')
+    
+    cooperative_rounds = comparison_results.get('cooperative_rounds') or []
+    if cooperative_rounds:
+        csv_lines.append('')
+        csv_lines.append('=== RONDAS CON COTA COMPARTIDA ===')
+        csv_lines.append('Ronda,Presupuesto(seg),Modelo,Estado,Makespan,Incumbente,Mejora')
+        for cooperative_round in cooperative_rounds:
+            for entry in cooperative_round['entries']:
+                makespan = entry['makespan'] if entry['makespan'] is not None else 'N/A'
+                incumbent = entry['incumbent'] if entry['incumbent'] is not None else 'N/A'
+                mejora = 'Si' if entry['improved'] else 'No'
+                csv_lines.append(f'{cooperative_round["round"]},{cooperative_round["budget"]},{entry["model_name"]},{entry["status"]},{makespan},{incumbent},{mejora}')
     
     # Agregar detalles de carga por modelo
     for idx, result in enumerate(comparison_results['results'], 1):
@@ -2,6 +2,7 @@
 Helper para manipulación de datos y archivos
 """
 import os
+import re
 from pathlib import Path
 
 
@@ -103,3 +104,147 @@ def get_test_path_for_model(models_folder, model_type, test_filename):
     
     test_folder = folder_map.get(model_type, 'jobshop_op_limit')
     return os.path.join(models_folder, test_folder, 'tests', test_filename)
+
+
+def strip_dzn_comments(dzn_content):
+    """Elimina los comentarios de línea (%) de un archivo .dzn"""
+    return '\n'.join(line.split('%', 1)[0] for line in dzn_content.split('\n'))
+
+
+def parse_int_from_dzn(dzn_content, name):
+    """
+    Parsea un parámetro entero escalar (p.ej. ``k = 3;``) desde un .dzn
+    
+    Returns:
+        Valor entero o None si el parámetro no existe
+    """
+    match = re.search(rf'(?m)^\s*{re.escape(name)}\s*=\s*(-?\d+)\s*;', strip_dzn_comments(dzn_content))
+    return int(match.group(1)) if match else None
+
+
+def parse_int_array_from_dzn(dzn_content, name):
+    """
+    Parsea un arreglo unidimensional de enteros (p.ej. ``brk_m = [2, 3];``)
+    
+    Returns:
+        Lista de enteros o None si el parámetro no existe
+    """
+    match = re.search(rf'(?m)^\s*{re.escape(name)}\s*=\s*\[(.*?)\]\s*;',
+                      strip_dzn_comments(dzn_content), re.DOTALL)
+    if not match:
+        return None
+    return [int(x) for x in match.group(1).replace('\n', ' ').split(',') if x.strip()]
+
+
+def parse_set_array_from_dzn(dzn_content, name):
+    """
+    Parsea un arreglo de conjuntos de enteros (p.ej. ``skills = [{1,2}, {3}];``)
+    
+    Soporta conjuntos por extensión y rangos ``a..b``.
+    
+    Returns:
+        Lista de conjuntos o None si el parámetro no existe
+    """
+    match = re.search(rf'(?m)^\s*{re.escape(name)}\s*=\s*\[(.*?)\]\s*;',
+                      strip_dzn_comments(dzn_content), re.DOTALL)
+    if not match:
+        return None
+    
+    sets = []
+    for element in re.findall(r'\{([^}]*)\}|(-?\d+)\s*\.\.\s*(-?\d+)', match.group(1)):
+        explicit, range_start, range_end = element
+        if range_start:
+            sets.append(set(range(int(range_start), int(range_end) + 1)))
+            continue
+        values = set()
+        for item in explicit.split(','):
+            item = item.strip()
+            if not item:
+                continue
+            if '..' in item:
+                low, high = item.split('..')
+                values.update(range(int(low), int(high) + 1))
+            else:
+                values.add(int(item))
+        sets.append(values)
+    return sets
+
+
+def parse_instance_from_dzn(dzn_content, model_type):
+    """
+    Parsea todos los parámetros de una instancia según el tipo de modelo
+    
+    Args:
+        dzn_content: Contenido del archivo .dzn como string
+        model_type: Tipo de modelo (op_limit, workers_skills, maintenance)
+    
+    Returns:
+        Diccionario con durations y los parámetros específicos del tipo:
+        k (op_limit), W y skills (workers_skills) o breaks (maintenance),
+        donde cada break es una tupla (máquina, inicio, fin) con máquina base 1
+    """
+    durations = parse_durations_from_dzn(strip_dzn_comments(dzn_content))
+    instance = {
+        'model_type': model_type,
+        'durations': durations,
+        'jobs': len(durations),
+        'tasks': len(durations[0]) if durations else 0
+    }
+    
+    if model_type == 'op_limit':
+        instance['k'] = parse_int_from_dzn(dzn_content, 'k')
+    
+    elif model_type == 'workers_skills':
+        instance['W'] = parse_int_from_dzn(dzn_content, 'W')
+        instance['skills'] = parse_set_array_from_dzn(dzn_content, 'skills') or []
+    
+    elif model_type == 'maintenance':
+        brk_m = parse_int_array_from_dzn(dzn_content, 'brk_m') or []
+        brk_a = parse_int_array_from_dzn(dzn_content, 'brk_a') or []
+        brk_b = parse_int_array_from_dzn(dzn_content, 'brk_b') or []
+        instance['breaks'] = list(zip(brk_m, brk_a, brk_b))
+    
+    return instance
+
+
+def write_instance_dzn(instance):
+    """
+    Serializa una instancia (formato de parse_instance_from_dzn) como .dzn
+    
+    Returns:
+        Contenido .dzn como string
+    """
+    model_type = instance['model_type']
+    durations = instance['durations']
+    jobs = len(durations)
+    tasks = len(durations[0]) if durations else 0
+    
+    rows = '\n     | '.join(', '.join(str(x) for x in row) for row in durations)
+    matrix = f'[| {rows} |]'
+    
+    lines = []
+    if model_type == 'workers_skills':
+        lines.append(f'JOB = _(1..{jobs});')
+        lines.append(f'TASK = _(1..{tasks});')
+    else:
+        lines.append(f'jobs = {jobs};')
+        lines.append(f'tasks = {tasks};')
+    
+    if model_type == 'op_limit':
+        lines.append(f'k = {instance["k"]};')
+    
+    lines.append(f'd = {matrix};')
+    
+    if model_type == 'workers_skills':
+        lines.append(f'W = {instance["W"]};')
+        skills = ', '.join('{' + ','.join(str(w) for w in sorted(skill)) + '}' for skill in instance['skills'])
+        lines.append(f'skills = [{skills}];')
+    
+    elif model_type == 'maintenance':
+        breaks = instance.get('breaks') or []
+        lines.append(f'Nbreaks = {len(breaks)};')
+        lines.append(f'brk_m = [{", ".join(str(b[0]) for b in breaks)}];')
+        lines.append(f'brk_a = [{", ".join(str(b[1]) for b in breaks)}];')
+        lines.append(f'brk_b = [{", ".join(str(b[2]) for b in breaks)}];')
+    
+    return '\n'.join(lines) + '\n'
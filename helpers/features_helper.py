@@ -0,0 +1,85 @@
+"""
+Helper con las características baratas de una instancia
+
+Se calculan a partir de la instancia ya parseada (parse_instance_from_dzn)
+en microsegundos, sin MiniZinc. Las usa la selección automática de modelo
+y solver (selection_helper) para comparar una instancia nueva con las ya
+resueltas del historial.
+"""
+import math
+import numpy as np
+
+from helpers.data_helper import parse_instance_from_dzn
+
+
+# Orden fijo del vector de características
+FEATURE_NAMES = (
+    'log_operations',      # log(jobs * tareas)
+    'jobs_per_machine',    # jobs / tareas
+    'duration_cv',         # coeficiente de variación de las duraciones
+    'machine_load_ratio',  # carga de la máquina más cargada / carga media
+    'job_machine_ratio',   # job más largo / máquina más cargada
+    'resource_ratio',      # k/jobs (op_limit), W/jobs (workers_skills), 0 sin recursos
+    'skill_sparsity',      # 1 - habilidades medias por tarea / W (workers_skills)
+    'break_density',       # tiempo de paros / (paros + trabajo) (maintenance)
+)
+
+
+def extract_features(instance):
+    """
+    Características de una instancia parseada
+
+    Args:
+        instance: Diccionario de parse_instance_from_dzn
+
+    Returns:
+        Diccionario {nombre: float} con las claves de FEATURE_NAMES
+
+    Raises:
+        ValueError: si la instancia no tiene una matriz de duraciones rectangular
+    """
+    durations = np.asarray(instance['durations'], dtype=np.float64)
+    if durations.ndim != 2 or durations.size == 0:
+        raise ValueError('La instancia no tiene una matriz de duraciones rectangular')
+    jobs, tasks = durations.shape
+
+    mean = durations.mean()
+    machine_loads = durations.sum(axis=0)
+    max_machine_load = machine_loads.max()
+    total = durations.sum()
+
+    features = {
+        'log_operations': math.log(jobs * tasks),
+        'jobs_per_machine': jobs / tasks,
+        'duration_cv': float(durations.std() / mean) if mean else 0.0,
+        'machine_load_ratio': float(max_machine_load / machine_loads.mean()) if total else 1.0,
+        'job_machine_ratio': float(durations.sum(axis=1).max() / max_machine_load) if max_machine_load else 1.0,
+        'resource_ratio': 0.0,
+        'skill_sparsity': 0.0,
+        'break_density': 0.0
+    }
+
+    resources = instance.get('k') or instance.get('W')
+    if resources:
+        features['resource_ratio'] = resources / jobs
+
+    skills = instance.get('skills')
+    if skills and instance.get('W'):
+        features['skill_sparsity'] = 1.0 - sum(len(skill) for skill in skills) / (len(skills) * instance['W'])
+
+    breaks = instance.get('breaks')
+    if breaks:
+        break_time = sum(end - start for _, start, end in breaks)
+        features['break_density'] = break_time / (break_time + total) if break_time + total else 0.0
+
+    return features
+
+
+def features_from_dzn(dzn_content, model_type):
+    """Parsea un .dzn y devuelve sus características (ver extract_features)"""
+    return extract_features(parse_instance_from_dzn(dzn_content, model_type))
+
+
+def feature_vector(features):
+    """Vector NumPy en el orden de FEATURE_NAMES (0 para las ausentes)"""
+    return np.array([float(features.get(name, 0.0)) for name in FEATURE_NAMES])
@@ -0,0 +1,220 @@
+"""
+Helper para medir el tamaño y el tiempo de aplanado (FlatZinc) de un modelo
+"""
+import os
+import math
+import time
+import datetime
+from collections import Counter
+import minizinc
+
+from helpers.minizinc_helper import configure_minizinc_driver, get_solver
+from helpers.admission_helper import get_admission_controller
+from helpers.core_budget_helper import get_core_budget
+from helpers.process_limits_helper import limited_run
+from helpers.data_helper import parse_instance_from_dzn, write_instance_dzn
+from helpers.registry_helper import model_supports_solver
+
+
+# Exponente de crecimiento (respecto al número de jobs) a partir del cual
+# se marca el modelo como de crecimiento cuadrático
+QUADRATIC_THRESHOLD = 1.6
+
+# Número de jobs para los que se extrapola el tamaño del modelo aplanado
+DEFAULT_TARGET_JOBS = [50, 100]
+
+
+def count_flatzinc_items(fzn_path):
+    """
+    Cuenta variables y restricciones de un archivo FlatZinc
+
+    Returns:
+        Diccionario con 'variables', 'constraints' y 'constraints_by_kind'
+        (predicado FlatZinc -> número de restricciones, de mayor a menor)
+    """
+    counts = {'variables': 0, 'constraints': 0}
+    by_kind = Counter()
+    with open(fzn_path, 'r') as f:
+        for line in f:
+            if line.startswith('var '):
+                counts['variables'] += 1
+            elif line.startswith('constraint '):
+                counts['constraints'] += 1
+                by_kind[line[len('constraint '):].split('(', 1)[0].strip()] += 1
+    counts['constraints_by_kind'] = dict(by_kind.most_common())
+    return counts
+
+
+def flatten_model(model_path, data_path, solver_key, timeout=300, extra_data=None):
+    """
+    Aplana un modelo con sus datos para el solver indicado sin resolverlo
+
+    Args:
+        model_path: Ruta al modelo .mzn
+        data_path: Ruta al archivo de datos .dzn (o None si se usa extra_data)
+        solver_key: Identificador del solver (determina la librería de globales)
+        timeout: Tiempo máximo de aplanado en segundos
+        extra_data: Texto .dzn opcional que se añade al modelo
+
+    Returns:
+        Diccionario con flat_time (segundos de reloj), fzn_bytes, variables,
+        constraints y las estadísticas que reporte el compilador
+
+    Raises:
+        AdmissionRejected: si no hay hueco de solver
+    """
+    configure_minizinc_driver()
+
+    model = minizinc.Model(model_path)
+    if data_path:
+        model.add_file(data_path)
+    if extra_data:
+        model.add_string(extra_data)
+
+    # El aplanado es la fase que más memoria usa: mismos límites (rlimits),
+    # hueco de solver y núcleo que una resolución
+    with limited_run(timeout) as run:
+        instance = minizinc.Instance(get_solver(solver_key), model, run.driver if run else None)
+
+        with get_admission_controller().admit(), get_core_budget().reserve(1):
+            wall_start = time.monotonic()
+            with instance.flat(timeout=datetime.timedelta(seconds=timeout)) as (fzn, ozn, statistics):
+                flat_time = time.monotonic() - wall_start
+                stats = {
+                    'flat_time': flat_time,
+                    'fzn_bytes': os.path.getsize(fzn.name),
+                    **count_flatzinc_items(fzn.name)
+                }
+                for key, value in (statistics or {}).items():
+                    if isinstance(value, datetime.timedelta):
+                        value = value.total_seconds()
+                    stats.setdefault(key, value)
+
+    return stats
+
+
+def truncate_instance_dzn(dzn_content, model_type, jobs):
+    """Genera el .dzn de la instancia restringida a sus primeros ``jobs`` jobs"""
+    instance = parse_instance_from_dzn(dzn_content, model_type)
+    instance['durations'] = instance['durations'][:jobs]
+    instance['jobs'] = len(instance['durations'])
+    return write_instance_dzn(instance)
+
+
+def fit_growth_exponent(points):
+    """
+    Ajusta ``y = c * x^e`` por mínimos cuadrados en escala log-log
+
+    Args:
+        points: Lista de tuplas (x, y) con valores positivos
+
+    Returns:
+        Exponente e, o None si no hay al menos dos puntos distintos
+    """
+    logs = [(math.log(x), math.log(y)) for x, y in points if x > 0 and y > 0]
+    if len({lx for lx, _ in logs}) < 2:
+        return None
+    mean_x = sum(lx for lx, _ in logs) / len(logs)
+    mean_y = sum(ly for _, ly in logs) / len(logs)
+    num = sum((lx - mean_x) * (ly - mean_y) for lx, ly in logs)
+    den = sum((lx - mean_x) ** 2 for lx, _ in logs)
+    return num / den
+
+
+def truncation_sizes(jobs):
+    """Números de jobs de las instancias truncadas usadas para el ajuste"""
+    return sorted({n for n in (jobs // 4, jobs // 2) if 2 <= n < jobs})
+
+
+def flatten_report_entry(model_path, data_path, model_type, solver_key, timeout=300, target_jobs=None):
+    """
+    Mide el modelo aplanado de un par modelo + instancia y estima su crecimiento
+
+    Además de la instancia completa se aplanan versiones truncadas (primeros
+    n jobs) y se ajusta el exponente de crecimiento de restricciones y bytes
+    de FlatZinc respecto al número de jobs, que se usa para extrapolar el
+    tamaño a instancias con más jobs.
+
+    Returns:
+        Diccionario con las métricas de flatten_model, 'jobs', 'exponent',
+        'quadratic' y 'extrapolated' (lista de estimaciones por número de jobs)
+    """
+    with open(data_path, 'r') as f:
+        dzn_content = f.read()
+    jobs = parse_instance_from_dzn(dzn_content, model_type)['jobs']
+
+    entry = flatten_model(model_path, data_path, solver_key, timeout)
+    entry['jobs'] = jobs
+
+    constraint_points = [(jobs, entry['constraints'])]
+    size_points = [(jobs, entry['fzn_bytes'])]
+    for n in truncation_sizes(jobs):
+        partial = flatten_model(model_path, None, solver_key, timeout,
+                                extra_data=truncate_instance_dzn(dzn_content, model_type, n))
+        constraint_points.append((n, partial['constraints']))
+        size_points.append((n, partial['fzn_bytes']))
+
+    exponent = fit_growth_exponent(constraint_points)
+    size_exponent = fit_growth_exponent(size_points)
+    entry['exponent'] = round(exponent, 2) if exponent is not None else None
+    entry['quadratic'] = exponent is not None and exponent >= QUADRATIC_THRESHOLD
+
+    entry['extrapolated'] = []
+    if exponent is not None and size_exponent is not None:
+        for target in target_jobs or DEFAULT_TARGET_JOBS:
+            if target <= jobs:
+                continue
+            ratio = target / jobs
+            entry['extrapolated'].append({
+                'jobs': target,
+                'constraints': int(entry['constraints'] * ratio ** exponent),
+                'fzn_bytes': int(entry['fzn_bytes'] * ratio ** size_exponent)
+            })
+
+    return entry
+
+
+def build_flatten_report(model_keys, models_config, models_folder, data_paths, solver_key,
+                         timeout=300, target_jobs=None):
+    """
+    Construye el informe de tamaño aplanado para cada modelo x instancia
+
+    Los errores de aplanado de un par no detienen el informe: se registran
+    en la fila correspondiente. Los modelos que el registro no ofrece con el
+    solver también se aplanan (el informe muestra por qué) y se marcan con
+    'supported' a False.
+
+    Returns:
+        Lista de filas con 'model_key', 'model_name', 'instance', 'solver',
+        'supported' y las métricas de flatten_report_entry (o 'error')
+    """
+    rows = []
+    for model_key in model_keys:
+        model_info = models_config[model_key]
+        model_path = os.path.join(models_folder, model_info['file'])
+        for data_path in data_paths:
+            row = {
+                'model_key': model_key,
+                'model_name': model_info['name'],
+                'instance': os.path.basename(data_path),
+                'solver': solver_key,
+                'supported': model_supports_solver(model_info, solver_key)
+            }
+            try:
+                row.update(flatten_report_entry(model_path, data_path, model_info['type'],
+                                                solver_key, timeout, target_jobs))
+            except minizinc.MiniZincError as e:
+                row['error'] = str(e)[:200]
+            rows.append(row)
+    return rows
+
+
+def format_bytes(num_bytes):
+    """Formatea un tamaño en bytes de forma legible"""
+    if num_bytes < 1024:
+        return f'{num_bytes:.0f} B'
+    for unit in ['KB', 'MB']:
+        num_bytes /= 1024
+        if num_bytes < 1024:
+            return f'{num_bytes:.1f} {unit}'
+    return f'{num_bytes / 1024:.1f} GB'
@@ -0,0 +1,394 @@
+"""
+Helper con el historial persistente de resoluciones (SQLite)
+
+Cada resolución se guarda con el hash de contenido de la instancia, el
+modelo, el solver, las opciones, las estadísticas, el makespan, el estado,
+la cota y la programación compacta (inicios y asignación de recursos). El
+historial sobrevive a la sesión y permite consultar la mejor solución
+conocida de una instancia y la evolución de cada estrategia. Las
+características de cada instancia (features_helper) se guardan una vez por
+instancia y familia para la selección automática de modelo y solver.
+"""
+import os
+import json
+import sqlite3
+import datetime
+import threading
+from contextlib import closing
+
+from helpers.cache_helper import hash_content
+from helpers.minizinc_helper import extract_makespan_bound
+from helpers.data_helper import parse_durations_from_dzn
+from helpers.features_helper import features_from_dzn
+
+
+DEFAULT_HISTORY_DB = 'history.sqlite3'
+
+# Estados con una solución válida
+SOLVED_STATUSES = ('OPTIMAL_SOLUTION', 'SATISFIED', 'ALL_SOLUTIONS')
+
+# Resolución con cota estricta insatisfacible: la cota es el óptimo
+PROOF_STATUS = 'OPTIMALITY_PROOF'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at TEXT NOT NULL,
+    instance_hash TEXT NOT NULL,
+    instance_name TEXT,
+    model_key TEXT NOT NULL,
+    model_type TEXT,
+    solver TEXT NOT NULL,
+    timeout REAL,
+    options TEXT,
+    statistics TEXT,
+    status TEXT NOT NULL,
+    makespan INTEGER,
+    bound REAL,
+    solve_time REAL,
+    schedule TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_instance ON runs (instance_hash, makespan);
+CREATE INDEX IF NOT EXISTS idx_runs_model ON runs (model_key, instance_hash, created_at);
+CREATE TABLE IF NOT EXISTS instance_features (
+    instance_hash TEXT NOT NULL,
+    model_type TEXT NOT NULL,
+    features TEXT NOT NULL,
+    PRIMARY KEY (instance_hash, model_type)
+);
+"""
+
+_initialized = set()
+_init_lock = threading.Lock()
+
+
+def get_history_path():
+    """Ruta de la base de datos (JOBSHOP_HISTORY_DB; vacía desactiva el historial)"""
+    return os.environ.get('JOBSHOP_HISTORY_DB', DEFAULT_HISTORY_DB)
+
+
+def connect(path=None):
+    """
+    Abre una conexión al historial, creando el esquema la primera vez
+
+    Se abre una conexión por operación: sqlite3 no comparte conexiones entre
+    hilos y las escrituras son pocas (una por resolución).
+    """
+    path = path or get_history_path()
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    conn = sqlite3.connect(path, timeout=10)
+    conn.row_factory = sqlite3.Row
+
+    with _init_lock:
+        if path not in _initialized:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+            conn.commit()
+            _initialized.add(path)
+    return conn
+
+
+def _json_default(value):
+    """Serializa timedelta y demás valores de las estadísticas de MiniZinc"""
+    if isinstance(value, datetime.timedelta):
+        return value.total_seconds()
+    return str(value)
+
+
+def _to_int_matrix(value):
+    return [[int(x) for x in row] for row in value]
+
+
+def compact_schedule(result):
+    """
+    Programación compacta de un resultado: inicios y asignación de recursos
+
+    Returns:
+        Diccionario {'s': inicios, 'a': asignación o None} o None si el
+        resultado no tiene solución
+    """
+    if result is None or getattr(result, 'solution', None) is None:
+        return None
+    try:
+        schedule = {'s': _to_int_matrix(result['s']), 'a': None}
+    except (KeyError, TypeError, ValueError):
+        return None
+    for name in ['o', 'w_assign']:
+        try:
+            schedule['a'] = _to_int_matrix(result[name])
+            break
+        except (KeyError, TypeError, ValueError):
+            continue
+    return schedule
+
+
+def _decode_row(row):
+    """Convierte una fila de runs en diccionario con los campos JSON decodificados"""
+    if row is None:
+        return None
+    data = dict(row)
+    for field in ['options', 'statistics', 'schedule']:
+        if data.get(field):
+            data[field] = json.loads(data[field])
+    return data
+
+
+def record_run(instance_hash, model_key, solver, status, makespan=None, bound=None, solve_time=None,
+               options=None, statistics=None, schedule=None, instance_name=None, model_type=None,
+               timeout=None, path=None):
+    """
+    Inserta una resolución en el historial
+
+    Returns:
+        Identificador de la fila insertada
+    """
+    with closing(connect(path)) as conn:
+        cursor = conn.execute(
+            'INSERT INTO runs (created_at, instance_hash, instance_name, model_key, model_type, solver, '
+            'timeout, options, statistics, status, makespan, bound, solve_time, schedule) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (
+                datetime.datetime.now().isoformat(timespec='seconds'),
+                instance_hash, instance_name, model_key, model_type, solver, timeout,
+                json.dumps(options or {}, default=_json_default),
+                json.dumps(statistics or {}, default=_json_default),
+                status,
+                int(makespan) if makespan is not None else None,
+                bound, solve_time,
+                json.dumps(schedule, separators=(',', ':')) if schedule is not None else None
+            )
+        )
+        conn.commit()
+        return cursor.lastrowid
+
+
+def record_instance_features(instance_hash, model_type, content, path=None):
+    """
+    Guarda las características de una instancia si aún no están en el historial
+
+    Una instancia que no se puede parsear no se registra (no impide guardar
+    la resolución).
+
+    Args:
+        content: Contenido del .dzn (str o bytes)
+    """
+    with closing(connect(path)) as conn:
+        known = conn.execute('SELECT 1 FROM instance_features WHERE instance_hash = ? AND model_type = ?',
+                             (instance_hash, model_type)).fetchone()
+        if known:
+            return
+        if isinstance(content, bytes):
+            content = content.decode('utf-8', errors='replace')
+        try:
+            features = features_from_dzn(content, model_type)
+        except (ValueError, IndexError):
+            return
+        conn.execute('INSERT OR IGNORE INTO instance_features (instance_hash, model_type, features) VALUES (?, ?, ?)',
+                     (instance_hash, model_type, json.dumps(features)))
+        conn.commit()
+
+
+def instance_features(model_type, path=None):
+    """
+    Características guardadas de las instancias de una familia
+
+    Returns:
+        Diccionario {instance_hash: {nombre: valor}}
+    """
+    with closing(connect(path)) as conn:
+        rows = conn.execute('SELECT instance_hash, features FROM instance_features WHERE model_type = ?',
+                            (model_type,)).fetchall()
+    return {row['instance_hash']: json.loads(row['features']) for row in rows}
+
+
+def selection_runs(model_type, path=None):
+    """
+    Resoluciones de una familia con los campos que usa la selección automática
+
+    Returns:
+        Lista de diccionarios (instance_hash, model_key, solver, status,
+        makespan, solve_time, timeout)
+    """
+    with closing(connect(path)) as conn:
+        rows = conn.execute(
+            'SELECT instance_hash, model_key, solver, status, makespan, solve_time, timeout '
+            'FROM runs WHERE model_type = ?', (model_type,)
+        ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def history_version(path=None):
+    """Identificador de la última resolución guardada (cambia con cada inserción)"""
+    with closing(connect(path)) as conn:
+        return conn.execute('SELECT MAX(id) FROM runs').fetchone()[0]
+
+
+def record_solve(data_path, model_key, model_type, solver_key, result, applied_options=None, timeout=None,
+                 status=None, strict_bound=None):
+    """
+    Guarda en el historial el resultado de MiniZinc de una resolución
+
+    Los errores del historial nunca interrumpen la resolución: se informan
+    por consola y se devuelve None.
+
+    Args:
+        data_path: Ruta del .dzn resuelto (se identifica por su contenido)
+        result: Resultado de MiniZinc (puede ser el último con solución)
+        status: Estado a registrar si difiere del del resultado
+        strict_bound: Cota estricta (``end < strict_bound``) añadida a la
+                      resolución; si resulta insatisfacible se registra como
+                      prueba de que strict_bound es el óptimo
+
+    Returns:
+        Identificador de la fila o None si el historial está desactivado
+    """
+    if not get_history_path():
+        return None
+
+    try:
+        statistics = dict(getattr(result, 'statistics', None) or {})
+        status = status or str(result.status).replace('Status.', '')
+        makespan = None
+        if getattr(result, 'solution', None) is not None:
+            try:
+                makespan = int(result['end'])
+            except (KeyError, TypeError, ValueError):
+                makespan = None
+        solve_time = statistics.get('solveTime')
+        if isinstance(solve_time, datetime.timedelta):
+            solve_time = solve_time.total_seconds()
+        with open(data_path, 'rb') as f:
+            data = f.read()
+        instance_hash = hash_content(data)
+
+        # La cota se guarda en unidades de makespan, no del objetivo ponderado
+        try:
+            durations = parse_durations_from_dzn(data.decode('utf-8'))
+        except (UnicodeDecodeError, ValueError):
+            durations = None
+        total_work = sum(map(sum, durations)) if durations else None
+        bound = extract_makespan_bound(result, model_type, total_work)
+        if status == 'OPTIMAL_SOLUTION' and makespan is not None:
+            bound = makespan
+        if strict_bound is not None and status == 'UNSATISFIABLE':
+            status = PROOF_STATUS
+            bound = strict_bound
+        if model_type:
+            record_instance_features(instance_hash, model_type, data)
+
+        return record_run(
+            instance_hash, model_key, solver_key, status,
+            makespan=makespan, bound=bound, solve_time=solve_time,
+            options=applied_options, statistics=statistics,
+            schedule=compact_schedule(result),
+            instance_name=os.path.basename(data_path), model_type=model_type,
+            timeout=timeout
+        )
+    except (sqlite3.Error, OSError) as e:
+        print(f"Error guardando el historial: {e}")
+        return None
+
+
+def best_known(instance_hash, model_type=None, path=None):
+    """
+    Mejor solución conocida de una instancia
+
+    Args:
+        instance_hash: Hash de contenido de la instancia
+        model_type: Limita la búsqueda a una familia de modelos (opcional)
+
+    Returns:
+        Diccionario con la fila (y 'proven_optimal') o None si no hay solución
+    """
+    query = ('SELECT * FROM runs WHERE instance_hash = ? AND makespan IS NOT NULL '
+             f'AND status IN ({", ".join("?" * len(SOLVED_STATUSES))})')
+    params = [instance_hash, *SOLVED_STATUSES]
+    if model_type:
+        query += ' AND model_type = ?'
+        params.append(model_type)
+    query += ' ORDER BY makespan ASC, status = ? DESC, solve_time ASC LIMIT 1'
+    params.append('OPTIMAL_SOLUTION')
+
+    with closing(connect(path)) as conn:
+        best = _decode_row(conn.execute(query, params).fetchone())
+        if best is None:
+            return None
+        # Óptimo probado solo si una resolución lo demostró: un OPTIMAL con
+        # ese makespan o una prueba de optimalidad (cota estricta
+        # insatisfacible, en unidades de makespan) que lo alcanza
+        proven = conn.execute(
+            'SELECT 1 FROM runs WHERE instance_hash = ? AND (model_type = ? OR ? IS NULL) '
+            'AND ((status = ? AND makespan = ?) OR (status = ? AND bound >= ?)) LIMIT 1',
+            (instance_hash, model_type, model_type, 'OPTIMAL_SOLUTION', best['makespan'],
+             PROOF_STATUS, best['makespan'])
+        ).fetchone()
+    best['proven_optimal'] = proven is not None
+    return best
+
+
+def best_known_solutions(model_type=None, path=None):
+    """
+    Mejor makespan conocido de cada instancia del historial
+
+    Returns:
+        Lista de diccionarios (instance_hash, instance_name, model_type,
+        makespan, runs) ordenada por nombre de instancia
+    """
+    query = ('SELECT instance_hash, MAX(instance_name) AS instance_name, model_type, '
+             'MIN(makespan) AS makespan, COUNT(*) AS runs FROM runs '
+             f'WHERE status IN ({", ".join("?" * len(SOLVED_STATUSES))})')
+    params = list(SOLVED_STATUSES)
+    if model_type:
+        query += ' AND model_type = ?'
+        params.append(model_type)
+    query += ' GROUP BY instance_hash, model_type ORDER BY instance_name'
+
+    with closing(connect(path)) as conn:
+        return [dict(row) for row in conn.execute(query, params).fetchall()]
+
+
+def strategy_history(model_key=None, instance_hash=None, solver=None, limit=100, path=None):
+    """
+    Resoluciones de una estrategia (modelo), de la más reciente a la más antigua
+
+    Returns:
+        Lista de filas decodificadas (sin la programación, para aligerar)
+    """
+    conditions, params = [], []
+    for column, value in [('model_key', model_key), ('instance_hash', instance_hash), ('solver', solver)]:
+        if value:
+            conditions.append(f'{column} = ?')
+            params.append(value)
+    where = f'WHERE {" AND ".join(conditions)}' if conditions else ''
+
+    with closing(connect(path)) as conn:
+        rows = conn.execute(
+            'SELECT id, created_at, instance_hash, instance_name, model_key, model_type, solver, timeout, '
+            f'options, statistics, status, makespan, bound, solve_time FROM runs {where} '
+            'ORDER BY created_at DESC, id DESC LIMIT ?',
+            (*params, int(limit))
+        ).fetchall()
+    return [_decode_row(row) for row in rows]
+
+
+def strategy_summary(instance_hash, path=None):
+    """
+    Resumen por estrategia y solver de una instancia
+
+    Returns:
+        Lista de diccionarios (model_key, solver, runs, solved, optimal,
+        best_makespan, avg_solve_time) ordenada por mejor makespan
+    """
+    with closing(connect(path)) as conn:
+        rows = conn.execute(
+            'SELECT model_key, solver, COUNT(*) AS runs, '
+            f'SUM(status IN ({", ".join("?" * len(SOLVED_STATUSES))})) AS solved, '
+            'SUM(status = ?) AS optimal, MIN(makespan) AS best_makespan, '
+            'AVG(solve_time) AS avg_solve_time '
+            'FROM runs WHERE instance_hash = ? GROUP BY model_key, solver '
+            'ORDER BY best_makespan IS NULL, best_makespan, avg_solve_time',
+            (*SOLVED_STATUSES, 'OPTIMAL_SOLUTION', instance_hash)
+        ).fetchall()
+    return [dict(row) for row in rows]
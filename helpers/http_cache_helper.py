@@ -0,0 +1,216 @@
+"""
+Helper de caché HTTP y compresión de respuestas
+
+- plotly.js se sirve desde ``static/vendor`` con el número de versión en el
+  nombre, por lo que puede cachearse como inmutable (funciona sin acceso a
+  internet, p.ej. en la red de planta).
+- Las respuestas HTML/JSON/CSV grandes se comprimen con brotli (si está
+  instalado) o gzip según Accept-Encoding.
+- Las páginas de resultados llevan ETag (hash del cuerpo) y responden 304
+  a las peticiones condicionales. Las exportaciones de un resultado calculan
+  el ETag a partir de sus entradas (export_etag) antes de generar nada: el
+  PDF incluye la fecha de creación y no sería estable, y un 304 no debe
+  pagar la generación. Las exportaciones de comparación no se cachean (su
+  nombre de archivo lleva la hora).
+"""
+import os
+import gzip
+import json
+import hashlib
+
+from werkzeug.wrappers import Response
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+VENDOR_FOLDER = 'vendor'
+
+# Un año: los recursos versionados nunca cambian para una misma URL
+IMMUTABLE_MAX_AGE = 31536000
+
+COMPRESSIBLE_MIMETYPES = ('text/html', 'application/json', 'text/csv', 'text/css',
+                          'text/javascript', 'application/javascript')
+
+# Por debajo de este tamaño la compresión no compensa
+MIN_COMPRESS_BYTES = 1024
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def get_plotly_js_filename():
+    """
+    Nombre (relativo a static/) del plotly.js de la versión instalada
+
+    Returns:
+        p.ej. 'vendor/plotly-2.27.0.min.js'
+    """
+    from plotly.offline import get_plotlyjs_version
+    return f'{VENDOR_FOLDER}/plotly-{get_plotlyjs_version()}.min.js'
+
+
+def ensure_plotly_js(static_folder):
+    """
+    Copia en static/vendor el plotly.js incluido en el paquete de Python
+
+    No descarga nada: el paquete plotly ya trae el bundle minificado. Solo
+    escribe el archivo (y su versión .gz) si no existe: el nombre incluye
+    la versión.
+
+    Returns:
+        Nombre relativo a static/ del archivo
+    """
+    filename = get_plotly_js_filename()
+    path = os.path.join(static_folder, filename)
+    if not os.path.exists(path):
+        from plotly.offline import get_plotlyjs
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        content = get_plotlyjs().encode('utf-8')
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(gzip.compress(content, compresslevel=9))
+        os.replace(temp_path, path + '.gz')
+        with open(temp_path, 'wb') as f:
+            f.write(content)
+        os.replace(temp_path, path)
+    return filename
+
+
+def serve_precompressed(response, file_path, accept_encodings):
+    """
+    Sustituye el cuerpo de un recurso estático por su versión .gz precomprimida
+
+    send_file sirve el archivo sin comprimir; plotly.js ocupa varios MB y
+    comprime a una fracción, así que se comprime una vez al copiarlo.
+    """
+    gz_path = file_path + '.gz'
+    if response.status_code != 200 or 'gzip' not in accept_encodings or not os.path.exists(gz_path):
+        return response
+    with open(gz_path, 'rb') as f:
+        data = f.read()
+    response.close()
+    response.direct_passthrough = False
+    response.set_data(data)
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def is_vendor_asset(path, static_url_path='/static'):
+    """Indica si una ruta es un recurso versionado de static/vendor"""
+    return path.startswith(f'{static_url_path}/{VENDOR_FOLDER}/')
+
+
+def mark_immutable(response):
+    """Cabeceras de caché de larga duración para un recurso versionado"""
+    response.cache_control.no_cache = None
+    response.cache_control.public = True
+    response.cache_control.max_age = IMMUTABLE_MAX_AGE
+    response.cache_control.immutable = True
+    return response
+
+
+def choose_encoding(accept_encodings):
+    """
+    Codificación a usar según Accept-Encoding
+
+    Returns:
+        'br', 'gzip' o None
+    """
+    if brotli is not None and 'br' in accept_encodings:
+        return 'br'
+    if 'gzip' in accept_encodings:
+        return 'gzip'
+    return None
+
+
+def compress_response(response, accept_encodings):
+    """
+    Comprime el cuerpo de una respuesta si es de un tipo textual y grande
+
+    Se omiten las respuestas en streaming (eventos de soluciones), las que
+    ya tienen Content-Encoding y los códigos distintos de 200. Si la
+    respuesta tenía ETag pasa a débil: If-None-Match usa comparación débil,
+    así que el 304 sigue funcionando con el cuerpo comprimido.
+    """
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = choose_encoding(accept_encodings)
+    if encoding is None:
+        return response
+
+    data = response.get_data()
+    if len(data) < MIN_COMPRESS_BYTES:
+        return response
+
+    if encoding == 'br':
+        compressed = brotli.compress(data, quality=BROTLI_QUALITY)
+    else:
+        compressed = gzip.compress(data, compresslevel=GZIP_LEVEL)
+
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def conditional_response(response, request):
+    """
+    Añade un ETag (hash del cuerpo) si falta y responde 304 si coincide
+
+    Returns:
+        La respuesta, convertida en 304 si el cliente ya tiene el contenido
+    """
+    if response.status_code != 200 or response.is_streamed:
+        return response
+    if not response.get_etag()[0]:
+        response.add_etag()
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+def export_etag(results, *params):
+    """
+    ETag de una exportación a partir de los resultados de la sesión y sus parámetros
+
+    Args:
+        results: Resultados empaquetados (pack_results); la programación
+                 se identifica por su result_id
+        params: Parámetros de la exportación (formato, modo de tablas...)
+
+    Returns:
+        Cadena hexadecimal
+    """
+    fields = {key: value for key, value in results.items() if key != 'schedule'}
+    content = json.dumps([fields, params], sort_keys=True, default=str)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()[:32]
+
+
+def not_modified(request, etag):
+    """
+    Respuesta 304 si el cliente ya tiene la versión con ese ETag (débil)
+
+    Returns:
+        Response 304 o None si hay que generar el contenido
+    """
+    if not request.if_none_match.contains_weak(etag):
+        return None
+    response = Response(status=304)
+    response.set_etag(etag, weak=True)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
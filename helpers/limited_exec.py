@@ -0,0 +1,100 @@
+"""
+Lanzador de MiniZinc con límites de recursos (se ejecuta como script)
+
+Uso:
+    python limited_exec.py --executable MINIZINC --stats STATS.json
+                           [--memory-mb N] [--cpu-seconds N] -- ARGS...
+
+Crea una sesión propia (el grupo de procesos permite terminar MiniZinc y
+su solver de una vez), aplica los rlimits de memoria y CPU al proceso hijo,
+que además muere si muere este lanzador (PR_SET_PDEATHSIG en Linux), y al
+terminar escribe en STATS.json el pico de memoria residente de los procesos
+hijos. Solo usa la biblioteca estándar porque no se ejecuta dentro de la
+aplicación.
+"""
+import os
+import sys
+import json
+import signal
+import ctypes
+import resource
+import argparse
+import subprocess
+
+PR_SET_PDEATHSIG = 1
+
+
+def set_parent_death_signal():
+    """El hijo recibe SIGKILL si el lanzador muere (solo Linux)"""
+    try:
+        libc = ctypes.CDLL('libc.so.6', use_errno=True)
+        libc.prctl(PR_SET_PDEATHSIG, signal.SIGKILL)
+    except (OSError, AttributeError):
+        pass
+
+
+def build_preexec(memory_mb, cpu_seconds):
+    def preexec():
+        if memory_mb:
+            limit = int(memory_mb) * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        if cpu_seconds:
+            # Límite blando: SIGXCPU; duro: SIGKILL unos segundos después
+            resource.setrlimit(resource.RLIMIT_CPU, (int(cpu_seconds), int(cpu_seconds) + 5))
+        set_parent_death_signal()
+    return preexec
+
+
+def write_stats(stats_path, data):
+    tmp_path = stats_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, stats_path)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--executable', required=True)
+    parser.add_argument('--stats', required=True)
+    parser.add_argument('--memory-mb', type=int, default=0)
+    parser.add_argument('--cpu-seconds', type=int, default=0)
+    parser.add_argument('args', nargs=argparse.REMAINDER)
+    options = parser.parse_args(argv)
+    args = options.args[1:] if options.args[:1] == ['--'] else options.args
+
+    # Sesión propia: el grupo de procesos se puede matar entero
+    try:
+        os.setsid()
+    except OSError:
+        pass
+    write_stats(options.stats, {'pid': os.getpid(), 'running': True})
+
+    child = subprocess.Popen([options.executable] + args,
+                             preexec_fn=build_preexec(options.memory_mb, options.cpu_seconds))
+
+    def forward(signum, frame):
+        # Reenviar al grupo (MiniZinc y su solver) sin volver a recibirla
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        try:
+            os.killpg(os.getpgid(0), signal.SIGTERM)
+        except OSError:
+            pass
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+
+    returncode = child.wait()
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    write_stats(options.stats, {
+        'pid': os.getpid(),
+        'running': False,
+        'returncode': returncode,
+        'peak_rss_kb': usage.ru_maxrss,
+        'cpu_seconds': round(usage.ru_utime + usage.ru_stime, 3),
+        'killed_by_limit': returncode in (-signal.SIGKILL, -signal.SIGXCPU) or returncode == 137
+    })
+    return returncode if returncode >= 0 else 128 - returncode
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -2,10 +2,20 @@
 Helper para operaciones con MiniZinc
 """
 import os
+import math
+import asyncio
 import minizinc
 import datetime
 from pathlib import Path
 
+from helpers.core_budget_helper import get_core_budget
+from helpers.admission_helper import get_admission_controller
+from helpers.process_limits_helper import limited_run
+
+
+# Niveles de optimización del compilador de MiniZinc (-O0 .. -O5)
+OPTIMISATION_LEVELS = [0, 1, 2, 3, 4, 5]
+
 
 def configure_minizinc_driver():
     """Configura el driver de MiniZinc desde variable de entorno"""
@@ -34,23 +44,220 @@ def get_solver(solver_key):
             raise Exception(f"No se pudo encontrar el solver '{solver_key}' ni el solver por defecto")
 
 
-def solve_model(model_path, data_path, solver_key, timeout):
+def parse_solve_options(form):
     """
-    Ejecuta un modelo MiniZinc con los datos especificados
+    Construye las opciones de resolución a partir de los datos de un formulario
+    
+    Args:
+        form: Diccionario (o request.form) con los campos threads, free_search,
+              optimisation_level y random_seed
     
     Returns:
-        result: Resultado de MiniZinc
+        Diccionario con las opciones normalizadas
+    """
+    budget = get_core_budget()
+    
+    try:
+        threads = budget.clamp(form.get('threads', 1) or 1)
+    except (TypeError, ValueError):
+        threads = 1
+    
+    optimisation_level = form.get('optimisation_level', '')
+    try:
+        optimisation_level = int(optimisation_level)
+        if optimisation_level not in OPTIMISATION_LEVELS:
+            optimisation_level = None
+    except (TypeError, ValueError):
+        optimisation_level = None
+    
+    random_seed = form.get('random_seed', '')
+    try:
+        random_seed = int(random_seed)
+    except (TypeError, ValueError):
+        random_seed = None
+    
+    return {
+        'threads': threads,
+        'free_search': form.get('free_search') in ('on', 'true', '1', True),
+        'optimisation_level': optimisation_level,
+        'random_seed': random_seed
+    }
+
+
+def build_solve_kwargs(solver, solve_options):
+    """
+    Traduce las opciones de resolución a argumentos de Instance.solve
+    
+    Solo se pasan los flags que el solver declara soportar (stdFlags), de modo
+    que p.ej. la búsqueda libre se ignora en solvers que no la implementan.
+    
+    Returns:
+        Tupla (kwargs para solve, opciones efectivamente aplicadas)
+    """
+    solve_options = solve_options or {}
+    std_flags = getattr(solver, 'stdFlags', None) or []
+    kwargs = {}
+    applied = {'threads': 1, 'free_search': False, 'optimisation_level': None, 'random_seed': None}
+    
+    threads = solve_options.get('threads') or 1
+    if threads > 1 and '-p' in std_flags:
+        kwargs['processes'] = threads
+        applied['threads'] = threads
+    
+    if solve_options.get('free_search') and '-f' in std_flags:
+        kwargs['free_search'] = True
+        applied['free_search'] = True
+    
+    if solve_options.get('random_seed') is not None and '-r' in std_flags:
+        kwargs['random_seed'] = solve_options['random_seed']
+        applied['random_seed'] = solve_options['random_seed']
+    
+    # El nivel de optimización es un flag del compilador, válido para cualquier solver
+    if solve_options.get('optimisation_level') is not None:
+        kwargs['optimisation_level'] = solve_options['optimisation_level']
+        applied['optimisation_level'] = solve_options['optimisation_level']
+    
+    return kwargs, applied
+
+
+def describe_solve_options(solve_options):
+    """Genera una descripción corta de las opciones de resolución aplicadas"""
+    if not solve_options:
+        return 'Por defecto'
+    
+    parts = [f"{solve_options.get('threads', 1)} hilo(s)"]
+    if solve_options.get('free_search'):
+        parts.append('búsqueda libre')
+    if solve_options.get('optimisation_level') is not None:
+        parts.append(f"-O{solve_options['optimisation_level']}")
+    if solve_options.get('random_seed') is not None:
+        parts.append(f"semilla {solve_options['random_seed']}")
+    
+    return ', '.join(parts)
+
+
+def prepare_instance(model_path, data_path, solver_key, solve_options=None, extra_constraints=None, driver=None):
+    """
+    Construye la instancia de MiniZinc y los argumentos de resolución
+    
+    Args:
+        driver: Driver de MiniZinc opcional (p.ej. con límites de recursos)
+    
+    Returns:
+        Tupla (instancia, kwargs para solve, opciones efectivamente aplicadas)
     """
     configure_minizinc_driver()
     
     model = minizinc.Model(model_path)
     model.add_file(data_path)
+    for constraint in extra_constraints or []:
+        model.add_string(constraint)
     
     solver = get_solver(solver_key)
-    instance = minizinc.Instance(solver, model)
+    instance = minizinc.Instance(solver, model, driver)
+    
+    solve_kwargs, applied_options = build_solve_kwargs(solver, solve_options)
+    return instance, solve_kwargs, applied_options
+
+
+def requested_threads(solve_options):
+    """Hilos solicitados en las opciones (para dimensionar los límites de CPU)"""
+    return (solve_options or {}).get('threads') or 1
+
+
+def solve_model(model_path, data_path, solver_key, timeout, solve_options=None, extra_constraints=None):
+    """
+    Ejecuta un modelo MiniZinc con los datos especificados
+    
+    Args:
+        model_path: Ruta al modelo .mzn
+        data_path: Ruta al archivo de datos .dzn
+        solver_key: Identificador del solver
+        timeout: Timeout en segundos
+        solve_options: Opciones de resolución (ver parse_solve_options)
+        extra_constraints: Lista opcional de restricciones MiniZinc adicionales
+                           (p.ej. cotas sobre ``end``)
+    
+    Returns:
+        Tupla (resultado de MiniZinc, opciones efectivamente aplicadas); las
+        estadísticas del resultado incluyen el pico de memoria (peakRSSMB)
+    """
+    configure_minizinc_driver()
+    
+    # Proceso con límites de memoria/CPU que se mata al cancelar la petición
+    with limited_run(timeout, requested_threads(solve_options)) as run:
+        instance, solve_kwargs, applied_options = prepare_instance(
+            model_path, data_path, solver_key, solve_options, extra_constraints,
+            driver=run.driver if run else None
+        )
+        
+        # Ocupar un hueco de solver y tantos núcleos como hilos use
+        with get_admission_controller().admit(), get_core_budget().reserve(applied_options['threads']):
+            result = instance.solve(timeout=datetime.timedelta(seconds=timeout), **solve_kwargs)
+        
+        if run:
+            run.annotate(result)
+    
+    return result, applied_options
+
+
+async def solve_model_async(model_path, data_path, solver_key, timeout, solve_options=None,
+                            extra_constraints=None):
+    """
+    Versión asíncrona de solve_model basada en Instance.solve_async
+    
+    El solver corre como subproceso y la corrutina solo espera su salida, así
+    que cientos de resoluciones concurrentes comparten un único bucle de
+    eventos. Si la tarea se cancela, python-minizinc termina el subproceso.
+    
+    Returns:
+        Tupla (resultado de MiniZinc, opciones efectivamente aplicadas)
+    """
+    configure_minizinc_driver()
+    
+    with limited_run(timeout, requested_threads(solve_options)) as run:
+        # Instance lanza un subproceso de MiniZinc (--model-interface-only): fuera del bucle de eventos
+        instance, solve_kwargs, applied_options = await asyncio.to_thread(
+            prepare_instance, model_path, data_path, solver_key, solve_options, extra_constraints,
+            driver=run.driver if run else None
+        )
+        
+        async with get_admission_controller().admit_async(), \
+                get_core_budget().reserve_async(applied_options['threads']):
+            result = await instance.solve_async(timeout=datetime.timedelta(seconds=timeout), **solve_kwargs)
+        
+        if run:
+            run.annotate(result)
+    
+    return result, applied_options
+
+
+async def iter_solutions_async(model_path, data_path, solver_key, timeout, solve_options=None,
+                               extra_constraints=None):
+    """
+    Genera las soluciones intermedias de una resolución a medida que llegan
     
-    result = instance.solve(timeout=datetime.timedelta(seconds=timeout))
-    return result
+    Yields:
+        Tuplas (resultado parcial de MiniZinc, opciones aplicadas); el último
+        resultado lleva el estado final de la búsqueda
+    """
+    configure_minizinc_driver()
+    
+    with limited_run(timeout, requested_threads(solve_options)) as run:
+        # Instance lanza un subproceso de MiniZinc (--model-interface-only): fuera del bucle de eventos
+        instance, solve_kwargs, applied_options = await asyncio.to_thread(
+            prepare_instance, model_path, data_path, solver_key, solve_options, extra_constraints,
+            driver=run.driver if run else None
+        )
+        
+        async with get_admission_controller().admit_async(), \
+                get_core_budget().reserve_async(applied_options['threads']):
+            async for result in instance.solutions(timeout=datetime.timedelta(seconds=timeout),
+                                                   intermediate_solutions=True, **solve_kwargs):
+                if run and result.solution is None:
+                    # Resultado final: el proceso ya terminó
+                    run.annotate(result)
+                yield result, applied_options
 
 
 def extract_variable_flexible(result, possible_names, calculate_fn=None):
@@ -75,3 +282,54 @@ def extract_variable_flexible(result, possible_names, calculate_fn=None):
         return calculate_fn(result)
     
     return None
+
+
+def extract_objective_bound(result):
+    """
+    Obtiene la cota del objetivo reportada por el solver, si existe
+    
+    Returns:
+        Valor numérico de la cota o None si el solver no la reporta
+    """
+    statistics = getattr(result, 'statistics', None) or {}
+    for name in ['objectiveBound', 'objective_bound', 'bestBound']:
+        value = statistics.get(name)
+        if value is not None:
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                continue
+    return None
+
+
+# Familias cuyo objetivo pondera el makespan: op_limit minimiza
+# W * end + (maxload - minload) y workers_skills BIG * end + maxLoad, con
+# W = BIG = total + 1 y el término secundario entre 0 y total. El resto
+# (maintenance) minimiza end directamente.
+WEIGHTED_OBJECTIVE_TYPES = ('op_limit', 'workers_skills')
+
+
+def extract_makespan_bound(result, model_type, total_work):
+    """
+    Cota inferior del makespan a partir de la cota del objetivo del solver
+
+    En las familias con objetivo ponderado, W * end + s >= B con
+    0 <= s <= total implica end >= ceil((B - total) / W).
+
+    Args:
+        result: Resultado de MiniZinc
+        model_type: Tipo de modelo (op_limit, workers_skills, maintenance)
+        total_work: Suma de las duraciones de la instancia (W = total + 1)
+
+    Returns:
+        Cota entera del makespan o None si el solver no la reporta o no
+        se puede convertir
+    """
+    bound = extract_objective_bound(result)
+    if bound is None or math.isinf(bound) or math.isnan(bound):
+        return None
+    if model_type in WEIGHTED_OBJECTIVE_TYPES:
+        if total_work is None:
+            return None
+        return max(0, math.ceil((bound - total_work) / (total_work + 1) - 1e-9))
+    return max(0, math.ceil(bound - 1e-9))
@@ -4,190 +4,192 @@ Helper para generar PDFs de resultados del Job Shop Scheduler
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib import colors
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak, Image
+from reportlab.platypus import SimpleDocTemplate, Table, LongTable, TableStyle, Paragraph, Spacer, PageBreak, Image
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from reportlab.pdfgen import canvas
 from io import BytesIO
+import time
 import datetime
-import plotly.graph_objects as go
 
+from helpers.schedule_index_helper import get_schedule_index
+from helpers.visualization_helper import get_figure, get_figure_image, render_figure_images
 
-def generate_gantt_figure(results):
-    """
-    Genera la figura de Plotly del diagrama de Gantt
-    Retorna el objeto Figure de Plotly
-    """
-    start_times = results.get('start_times', [])
-    durations = results.get('durations', [])
-    
-    if not start_times or not durations:
-        return None
-    
-    fig = go.Figure()
-    
-    colors_list = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', 
-                   '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf']
-    
-    model_type = results.get('model_type', 'op_limit')
-    jobs_shown = set()
-    
-    for job_idx, (start_row, duration_row) in enumerate(zip(start_times, durations)):
-        for task_idx, (start, duration) in enumerate(zip(start_row, duration_row)):
-            color = colors_list[job_idx % len(colors_list)]
-            y_label = f'Máquina {task_idx+1}'
-            
-            if model_type == 'op_limit':
-                operator = results['operator_assignment'][job_idx][task_idx]
-                hover_text = f'Job {job_idx+1} en Máquina {task_idx+1}<br>Operario: {operator}<br>Inicio: {start}<br>Duración: {duration}'
-            elif model_type == 'workers_skills':
-                worker = results['worker_assignment'][job_idx][task_idx]
-                hover_text = f'Job {job_idx+1} en Máquina {task_idx+1}<br>Trabajador: {worker}<br>Inicio: {start}<br>Duración: {duration}'
-            else:
-                hover_text = f'Job {job_idx+1} en Máquina {task_idx+1}<br>Inicio: {start}<br>Duración: {duration}'
-            
-            show_in_legend = job_idx not in jobs_shown
-            if show_in_legend:
-                jobs_shown.add(job_idx)
-            
-            fig.add_trace(go.Bar(
-                x=[duration],
-                y=[y_label],
-                orientation='h',
-                base=start,
-                marker=dict(color=color, line=dict(color='white', width=1)),
-                name=f'Job {job_idx+1}',
-                showlegend=show_in_legend,
-                text=f'J{job_idx+1}',
-                textposition='inside',
-                hovertext=hover_text,
-                hoverinfo='text',
-                legendgroup=f'Job {job_idx+1}'
-            ))
-    
-    num_machines = len(durations[0]) if durations else 0
-    
-    fig.update_layout(
-        title='Diagrama de Gantt - Job Shop Scheduling (por Máquina)',
-        xaxis_title='Tiempo',
-        yaxis_title='Máquinas',
-        barmode='overlay',
-        height=max(400, 150 + num_machines * 50),
-        hovermode='closest',
-        showlegend=True,
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="right",
-            x=1,
-            title="Jobs",
-            traceorder="normal"
-        ),
-        yaxis=dict(autorange='reversed'),
-        template='plotly_white',
-        font=dict(size=10)
-    )
-    
-    return fig
 
+# Tamaños de letra de las figuras en el PDF (forman parte de la clave de caché)
+GANTT_FONT_SIZE = 10
+COMPARISON_FONT_SIZE = 11
+
+# Modos de las tablas del PDF individual
+TABLE_MODES = ('auto', 'matrix', 'summary')
+
+# A partir de este número de operaciones (jobs × máquinas) 'auto' resume
+SUMMARY_CELL_THRESHOLD = 2500
 
-def plotly_fig_to_image(fig, width=800, height=600):
+# Bloques de las tablas paginadas: máquinas por tabla (ancho de página) y
+# filas por LongTable (partir tablas enormes es cuadrático en ReportLab)
+MAX_MATRIX_COLUMNS = 10
+MAX_TABLE_ROWS = 50
+
+# Altura máxima de una imagen (A4 menos márgenes y título de sección)
+MAX_IMAGE_HEIGHT = 9*inch
+
+RESOURCE_TABLES = {
+    'op_limit': {
+        'label': 'Operario',
+        'prefix': 'Op',
+        'assignment_title': 'Asignación de Operarios',
+        'load_title': 'Carga de Operarios',
+        'header_color': '#3498db',
+        'body_color': colors.lightblue
+    },
+    'workers_skills': {
+        'label': 'Trabajador',
+        'prefix': 'W',
+        'assignment_title': 'Asignación de Trabajadores',
+        'load_title': 'Carga de Trabajadores',
+        'header_color': '#2ecc71',
+        'body_color': colors.lightgreen
+    }
+}
+
+LOAD_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#34495e')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+    ('FONTSIZE', (0, 1), (-1, -1), 9),
+    ('TOPPADDING', (0, 1), (-1, -1), 4),
+    ('BOTTOMPADDING', (0, 1), (-1, -1), 4),
+])
+
+TYPE_NAMES = {
+    'op_limit': 'Operarios Limitados',
+    'workers_skills': 'Habilidades de Operarios',
+    'maintenance': 'Mantenimiento de Máquinas'
+}
+
+
+def resolve_table_mode(table_mode, index):
+    """Modo efectivo de las tablas ('matrix' o 'summary') para un resultado"""
+    if table_mode not in TABLE_MODES:
+        table_mode = 'auto'
+    if table_mode == 'auto':
+        large = index is not None and index.starts.size > SUMMARY_CELL_THRESHOLD
+        return 'summary' if large else 'matrix'
+    return table_mode
+
+
+def matrix_table_style(header_color, body_color):
+    """Estilo de las tablas job × máquina (primera columna con el job)"""
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), header_color),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+        ('BACKGROUND', (0, 1), (0, -1), colors.lightgrey),
+        ('BACKGROUND', (1, 1), (-1, -1), body_color),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('FONTSIZE', (0, 1), (-1, -1), 9),
+        ('TOPPADDING', (0, 1), (-1, -1), 4),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 4),
+    ])
+
+
+def build_long_tables(header, rows, col_widths, style, max_rows=MAX_TABLE_ROWS):
     """
-    Convierte una figura de Plotly a bytes de imagen PNG
+    Divide unas filas en LongTable de max_rows filas con la cabecera repetida
+
+    Returns:
+        Lista de LongTable
     """
-    try:
-        img_bytes = fig.to_image(format="png", width=width, height=height, scale=2)
-        return BytesIO(img_bytes)
-    except Exception as e:
-        print(f"Error generando imagen: {e}")
-        return None
+    tables = []
+    for first in range(0, max(len(rows), 1), max_rows):
+        table = LongTable([header] + rows[first:first + max_rows], colWidths=col_widths, repeatRows=1)
+        table.setStyle(style)
+        tables.append(table)
+    return tables
 
 
-def generate_comparison_makespan_figure(results_list):
+def build_matrix_tables(matrix, cell_format, header_color, body_color, caption_style,
+                        max_columns=MAX_MATRIX_COLUMNS, max_rows=MAX_TABLE_ROWS):
     """
-    Genera la figura de Plotly para comparación de makespan
+    Tablas paginadas de una matriz job × máquina
+
+    Las columnas se dividen en bloques de max_columns máquinas (caben en el
+    ancho de la página) y las filas en LongTable de max_rows jobs. Cada
+    bloque se convierte a texto por separado, así que el tiempo y la memoria
+    crecen linealmente con jobs × máquinas.
+
+    Args:
+        matrix: Array (jobs, máquinas)
+        cell_format: Función que convierte un valor en el texto de la celda
+
+    Returns:
+        Lista de flowables
     """
-    valid_results = [r for r in results_list if r.get('success', False)]
-    
-    if not valid_results:
-        return None
-    
-    fig = go.Figure()
-    
-    fig.add_trace(go.Bar(
-        x=[r['model_name'] for r in valid_results],
-        y=[r['makespan'] for r in valid_results],
-        text=[r['makespan'] for r in valid_results],
-        textposition='auto',
-        marker=dict(color=['#28a745' if i == 0 else '#007bff' for i in range(len(valid_results))]),
-        hovertemplate='<b>%{x}</b><br>Makespan: %{y}<extra></extra>'
-    ))
-    
-    fig.update_layout(
-        title='Comparación de Makespan por Estrategia',
-        xaxis_title='Modelo / Estrategia',
-        yaxis_title='Makespan (unidades de tiempo)',
-        height=450,
-        showlegend=False,
-        xaxis={
-            'tickangle': -45,
-            'automargin': True
-        },
-        margin=dict(l=50, r=50, t=80, b=120),
-        template='plotly_white',
-        font=dict(size=11)
-    )
+    jobs, tasks = matrix.shape
+    style = matrix_table_style(header_color, body_color)
+    flowables = []
     
-    return fig
+    for first_col in range(0, tasks, max_columns):
+        last_col = min(first_col + max_columns, tasks)
+        header = ['Job'] + [f'M{i+1}' for i in range(first_col, last_col)]
+        
+        col_widths = [1*inch] + [0.8*inch] * (last_col - first_col)
+        if len(col_widths) * 0.8 > 6.5:
+            col_width = 6.5 / len(col_widths)
+            col_widths = [col_width*inch] * len(col_widths)
+        
+        if tasks > max_columns:
+            flowables.append(Paragraph(f"<i>Máquinas {first_col+1} a {last_col} de {tasks}</i>", caption_style))
+        
+        block = matrix[:, first_col:last_col].tolist()
+        rows = [[f'Job {job+1}'] + [cell_format(value) for value in row] for job, row in enumerate(block)]
+        flowables.extend(build_long_tables(header, rows, col_widths, style, max_rows))
+        flowables.append(Spacer(1, 0.15*inch))
+    
+    return flowables
 
 
-def generate_comparison_imbalance_figure(results_list):
+def build_machine_summary_tables(index):
     """
-    Genera la figura de Plotly para comparación de desbalance
+    Tabla de utilización por máquina a partir de ScheduleIndex
+
+    Returns:
+        Lista de LongTable (una fila por máquina)
     """
-    valid_results = [r for r in results_list if r.get('success', False) and r.get('imbalance') is not None]
-    
-    if not valid_results:
-        return None
-    
-    fig = go.Figure()
-    
-    fig.add_trace(go.Bar(
-        x=[r['model_name'] for r in valid_results],
-        y=[r['imbalance'] for r in valid_results],
-        text=[r['imbalance'] for r in valid_results],
-        textposition='auto',
-        marker=dict(
-            color=[r['imbalance'] for r in valid_results],
-            colorscale=[[0, '#28a745'], [0.5, '#ffc107'], [1, '#dc3545']],
-            showscale=True,
-            colorbar=dict(title="Desbalance")
-        ),
-        hovertemplate='<b>%{x}</b><br>Desbalance: %{y}<extra></extra>'
-    ))
-    
-    fig.update_layout(
-        title='Comparación de Desbalance de Carga',
-        xaxis_title='Modelo / Estrategia',
-        yaxis_title='Desbalance (Max - Min)',
-        height=450,
-        showlegend=False,
-        xaxis={
-            'tickangle': -45,
-            'automargin': True
-        },
-        margin=dict(l=50, r=80, t=80, b=120),
-        template='plotly_white',
-        font=dict(size=11)
-    )
-    
-    return fig
+    busy = index.machine_busy().tolist()
+    utilization = index.machine_utilization().tolist()
+    operations = (index.durations > 0).sum(axis=0).tolist()
+    first_start = index.starts.min(axis=0).tolist() if index.jobs else [0] * index.tasks
+    last_end = index.ends.max(axis=0).tolist() if index.jobs else [0] * index.tasks
+    
+    rows = [
+        [f'Máquina {machine+1}', str(operations[machine]), str(busy[machine]),
+         f'{utilization[machine] * 100:.1f}%', str(first_start[machine]), str(last_end[machine])]
+        for machine in range(index.tasks)
+    ]
+    header = ['Máquina', 'Operaciones', 'Ocupada', 'Utilización', 'Primer inicio', 'Último fin']
+    col_widths = [1.3*inch, 1*inch, 1*inch, 1*inch, 1.1*inch, 1.1*inch]
+    return build_long_tables(header, rows, col_widths, LOAD_TABLE_STYLE)
 
 
-def generate_single_result_pdf(results):
+def generate_single_result_pdf(results, table_mode='auto'):
     """
     Genera un PDF con los resultados de una ejecución individual
+
+    Args:
+        results: Diccionario con resultados del modelo
+        table_mode: 'matrix' (matrices completas paginadas), 'summary'
+                    (utilización por máquina en lugar de matrices) o 'auto'
+                    (summary a partir de SUMMARY_CELL_THRESHOLD operaciones)
     """
     buffer = BytesIO()
     doc = SimpleDocTemplate(
@@ -261,6 +263,9 @@ def generate_single_result_pdf(results):
         ['Tiempo de Ejecución:', results.get('execution_time', 'N/A')],
     ]
     
+    if results.get('peak_rss_mb') is not None:
+        metrics_data.append(['Memoria Pico:', f"{results['peak_rss_mb']} MB"])
+    
     if results.get('imbalance') is not None:
         metrics_data.append(['Desbalance de Carga:', str(results.get('imbalance', 'N/A'))])
     if results.get('max_load') is not None:
@@ -289,15 +294,23 @@ def generate_single_result_pdf(results):
     
     story.append(Paragraph("Diagrama de Gantt", heading_style))
     
-    gantt_fig = generate_gantt_figure(results)
+    index = get_schedule_index(results)
+    gantt_fig = get_figure('gantt', results, font_size=GANTT_FONT_SIZE)
     if gantt_fig:
         try:
-            num_machines = len(results.get('durations', [[]])[0])
+            num_machines = index.tasks
             img_height = max(400, 150 + num_machines * 50)
-            img_bytes = plotly_fig_to_image(gantt_fig, width=900, height=img_height)
+            img_bytes = get_figure_image('gantt', results, width=900, height=img_height,
+                                         font_size=GANTT_FONT_SIZE)
             
             if img_bytes:
-                img = Image(img_bytes, width=6.5*inch, height=img_height/900*6.5*inch)
+                # Con muchas máquinas la imagen no cabe en la página: se reduce
+                img_width = 6.5*inch
+                pdf_height = img_height/900*img_width
+                if pdf_height > MAX_IMAGE_HEIGHT:
+                    img_width *= MAX_IMAGE_HEIGHT / pdf_height
+                    pdf_height = MAX_IMAGE_HEIGHT
+                img = Image(img_bytes, width=img_width, height=pdf_height)
                 story.append(img)
                 story.append(Spacer(1, 0.2*inch))
             else:
@@ -322,175 +335,47 @@ def generate_single_result_pdf(results):
     
     story.append(Spacer(1, 0.3*inch))
     
-    story.append(Paragraph("Tiempos de Inicio de Tareas", heading_style))
+    table_mode = resolve_table_mode(table_mode, index)
+    model_type = results.get('model_type', '')
+    resource = RESOURCE_TABLES.get(model_type) if index is not None and index.assignment is not None else None
     
-    start_times = results.get('start_times', [])
-    if start_times:
-        num_tasks = len(start_times[0]) if start_times else 0
-        
-        header = ['Job'] + [f'M{i+1}' for i in range(num_tasks)]
-        table_data = [header]
-        
-        for idx, row in enumerate(start_times):
-            table_data.append([f'Job {idx+1}'] + [str(t) for t in row])
-        
-        col_widths = [1*inch] + [0.8*inch] * num_tasks
-        if len(col_widths) * 0.8 > 6.5:
-            col_width = 6.5 / len(col_widths)
-            col_widths = [col_width*inch] * len(col_widths)
-        
-        start_table = Table(table_data, colWidths=col_widths)
-        start_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#34495e')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-            ('BACKGROUND', (0, 1), (0, -1), colors.lightgrey),
-            ('BACKGROUND', (1, 1), (-1, -1), colors.white),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('TOPPADDING', (0, 1), (-1, -1), 4),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 4),
-        ]))
-        
-        story.append(start_table)
+    if index is not None and table_mode == 'summary':
+        story.append(Paragraph("Utilización de Máquinas", heading_style))
+        story.append(Paragraph(
+            f"<i>Resumen de {index.jobs} jobs × {index.tasks} máquinas: se omiten las matrices "
+            "de inicios y asignaciones (exporta con tablas completas para verlas).</i>",
+            normal_style
+        ))
+        story.append(Spacer(1, 0.1*inch))
+        story.extend(build_machine_summary_tables(index))
         story.append(Spacer(1, 0.2*inch))
     
-    model_type = results.get('model_type', '')
-    
-    if model_type == 'op_limit' and results.get('operator_assignment'):
-        story.append(PageBreak())
-        story.append(Paragraph("Asignación de Operarios", heading_style))
+    elif index is not None:
+        story.append(Paragraph("Tiempos de Inicio de Tareas", heading_style))
+        story.extend(build_matrix_tables(index.starts, str, colors.HexColor('#34495e'), colors.white,
+                                         normal_style))
+        story.append(Spacer(1, 0.2*inch))
         
-        operator_assignment = results.get('operator_assignment', [])
-        if operator_assignment:
-            num_tasks = len(operator_assignment[0]) if operator_assignment else 0
-            
-            header = ['Job'] + [f'M{i+1}' for i in range(num_tasks)]
-            table_data = [header]
-            
-            for idx, row in enumerate(operator_assignment):
-                table_data.append([f'Job {idx+1}'] + [f'Op {op}' for op in row])
-            
-            col_widths = [1*inch] + [0.8*inch] * num_tasks
-            if len(col_widths) * 0.8 > 6.5:
-                col_width = 6.5 / len(col_widths)
-                col_widths = [col_width*inch] * len(col_widths)
-            
-            op_table = Table(table_data, colWidths=col_widths)
-            op_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                ('BACKGROUND', (0, 1), (0, -1), colors.lightgrey),
-                ('BACKGROUND', (1, 1), (-1, -1), colors.lightblue),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('FONTSIZE', (0, 1), (-1, -1), 9),
-                ('TOPPADDING', (0, 1), (-1, -1), 4),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 4),
-            ]))
-            
-            story.append(op_table)
+        if resource:
+            story.append(PageBreak())
+            story.append(Paragraph(resource['assignment_title'], heading_style))
+            prefix = resource['prefix']
+            story.extend(build_matrix_tables(index.assignment, lambda value: f'{prefix} {value}',
+                                             colors.HexColor(resource['header_color']), resource['body_color'],
+                                             normal_style))
             story.append(Spacer(1, 0.2*inch))
-        
-        operator_load = results.get('operator_load', [])
-        if operator_load:
-            story.append(Paragraph("Carga de Operarios", heading_style))
-            
-            load_data = [['Operario', 'Carga', 'Porcentaje']]
-            max_load = results.get('max_load', max(operator_load) if operator_load else 1)
-            
-            for idx, load in enumerate(operator_load):
-                percentage = f"{(load / max_load * 100):.1f}%" if max_load > 0 else "0%"
-                load_data.append([f'Operario {idx+1}', str(load), percentage])
-            
-            load_table = Table(load_data, colWidths=[2*inch, 2*inch, 2*inch])
-            load_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#34495e')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('FONTSIZE', (0, 1), (-1, -1), 9),
-                ('TOPPADDING', (0, 1), (-1, -1), 4),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 4),
-            ]))
-            
-            story.append(load_table)
     
-    elif model_type == 'workers_skills' and results.get('worker_assignment'):
-        story.append(PageBreak())
-        story.append(Paragraph("Asignación de Trabajadores", heading_style))
-        
-        worker_assignment = results.get('worker_assignment', [])
-        if worker_assignment:
-            num_tasks = len(worker_assignment[0]) if worker_assignment else 0
-            
-            header = ['Job'] + [f'M{i+1}' for i in range(num_tasks)]
-            table_data = [header]
-            
-            for idx, row in enumerate(worker_assignment):
-                table_data.append([f'Job {idx+1}'] + [f'W {w}' for w in row])
-            
-            col_widths = [1*inch] + [0.8*inch] * num_tasks
-            if len(col_widths) * 0.8 > 6.5:
-                col_width = 6.5 / len(col_widths)
-                col_widths = [col_width*inch] * len(col_widths)
-            
-            worker_table = Table(table_data, colWidths=col_widths)
-            worker_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2ecc71')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                ('BACKGROUND', (0, 1), (0, -1), colors.lightgrey),
-                ('BACKGROUND', (1, 1), (-1, -1), colors.lightgreen),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('FONTSIZE', (0, 1), (-1, -1), 9),
-                ('TOPPADDING', (0, 1), (-1, -1), 4),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 4),
-            ]))
-            
-            story.append(worker_table)
-            story.append(Spacer(1, 0.2*inch))
+    loads = index.resource_loads() if resource else None
+    if loads is not None and len(loads):
+        story.append(Paragraph(resource['load_title'], heading_style))
         
-        worker_load = results.get('worker_load', [])
-        if worker_load:
-            story.append(Paragraph("Carga de Trabajadores", heading_style))
-            
-            load_data = [['Trabajador', 'Carga', 'Porcentaje']]
-            max_load = results.get('max_load', max(worker_load) if worker_load else 1)
-            
-            for idx, load in enumerate(worker_load):
-                percentage = f"{(load / max_load * 100):.1f}%" if max_load > 0 else "0%"
-                load_data.append([f'Trabajador {idx+1}', str(load), percentage])
-            
-            load_table = Table(load_data, colWidths=[2*inch, 2*inch, 2*inch])
-            load_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#34495e')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('FONTSIZE', (0, 1), (-1, -1), 9),
-                ('TOPPADDING', (0, 1), (-1, -1), 4),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 4),
-            ]))
-            
-            story.append(load_table)
+        max_load = results.get('max_load', int(loads.max()))
+        load_rows = [
+            [f"{resource['label']} {idx+1}", str(load), f"{(load / max_load * 100):.1f}%" if max_load > 0 else "0%"]
+            for idx, load in enumerate(loads.tolist())
+        ]
+        story.extend(build_long_tables([resource['label'], 'Carga', 'Porcentaje'], load_rows,
+                                       [2*inch, 2*inch, 2*inch], LOAD_TABLE_STYLE))
     
     doc.build(story)
     
@@ -498,45 +383,10 @@ def generate_single_result_pdf(results):
     return buffer
 
 
-def generate_comparison_pdf(comparison_results):
-    """
-    Genera un PDF con los resultados de comparación de múltiples modelos
-    """
-    buffer = BytesIO()
-    test_file = comparison_results.get('test_file', 'N/A')
-    doc = SimpleDocTemplate(
-        buffer, 
-        pagesize=A4, 
-        topMargin=0.5*inch, 
-        bottomMargin=0.5*inch,
-        title=f"Comparación de Estrategias - {test_file}",
-        author="Job Shop Scheduler",
-        subject=f"Comparación de modelos con {test_file}"
-    )
-    
+def build_comparison_info_section(comparison_results, title_style):
+    """Título y tabla con la información general de la comparación"""
     story = []
-    styles = getSampleStyleSheet()
-    
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=colors.HexColor('#2c3e50'),
-        spaceAfter=30,
-        alignment=TA_CENTER
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=16,
-        textColor=colors.HexColor('#34495e'),
-        spaceAfter=12,
-        spaceBefore=12
-    )
-    
-    title = Paragraph("Comparación de Estrategias - Job Shop Scheduler", title_style)
-    story.append(title)
+    story.append(Paragraph("Comparación de Estrategias - Job Shop Scheduler", title_style))
     story.append(Spacer(1, 0.2*inch))
     
     info_data = [
@@ -565,127 +415,175 @@ def generate_comparison_pdf(comparison_results):
     
     story.append(info_table)
     story.append(Spacer(1, 0.3*inch))
+    return story
+
+
+def build_model_type_section(model_type, results, styles, heading_style, is_last):
+    """Tabla de resultados y distribución de carga de una familia de modelos"""
+    story = []
+    story.append(Paragraph(TYPE_NAMES.get(model_type, model_type), heading_style))
     
-    results_list = comparison_results.get('results', [])
+    table_data = [['Rank', 'Modelo', 'Makespan', 'Tiempo (s)', 'Estado']]
     
-    results_by_type = {}
-    for result in results_list:
-        model_type = result.get('model_type', 'unknown')
-        if model_type not in results_by_type:
-            results_by_type[model_type] = []
-        results_by_type[model_type].append(result)
-    
-    type_names = {
-        'op_limit': 'Operarios Limitados',
-        'workers_skills': 'Habilidades de Operarios',
-        'maintenance': 'Mantenimiento de Máquinas'
-    }
+    if model_type in ['op_limit', 'workers_skills']:
+        table_data[0].extend(['Desbalance', 'Carga Max', 'Carga Min'])
     
-    for model_type, results in results_by_type.items():
-        story.append(Paragraph(type_names.get(model_type, model_type), heading_style))
-        
-        table_data = [['Rank', 'Modelo', 'Makespan', 'Tiempo (s)', 'Estado']]
+    for idx, result in enumerate(results):
+        row = [
+            f'#{idx+1}' if result.get('success', False) else 'X',
+            result.get('model_name', 'N/A'),
+            str(result.get('makespan', '-')) if result.get('success', False) else '-',
+            result.get('execution_time', 'N/A'),
+            result.get('status', 'N/A')
+        ]
         
         if model_type in ['op_limit', 'workers_skills']:
-            table_data[0].extend(['Desbalance', 'Carga Max', 'Carga Min'])
-        
-        for idx, result in enumerate(results):
-            row = [
-                f'#{idx+1}' if result.get('success', False) else 'X',
-                result.get('model_name', 'N/A'),
-                str(result.get('makespan', '-')) if result.get('success', False) else '-',
-                result.get('execution_time', 'N/A'),
-                result.get('status', 'N/A')
-            ]
+            imbalance = result.get('imbalance')
+            max_load = result.get('max_load')
+            min_load = result.get('min_load')
             
-            if model_type in ['op_limit', 'workers_skills']:
-                imbalance = result.get('imbalance')
-                max_load = result.get('max_load')
-                min_load = result.get('min_load')
-                
-                row.append(str(imbalance) if imbalance is not None else 'N/A')
-                row.append(str(max_load) if max_load is not None else 'N/A')
-                row.append(str(min_load) if min_load is not None else 'N/A')
-            
-            table_data.append(row)
-        
-        if model_type in ['op_limit', 'workers_skills']:
-            col_widths = [0.5*inch, 2.2*inch, 0.9*inch, 0.9*inch, 1*inch, 0.8*inch, 0.8*inch, 0.8*inch]
-        else:
-            col_widths = [0.5*inch, 2.5*inch, 1.2*inch, 1.2*inch, 1.5*inch]
-        
-        comparison_table = Table(table_data, colWidths=col_widths)
-        
-        style_commands = [
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#34495e')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 9),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('FONTSIZE', (0, 1), (-1, -1), 8),
-            ('TOPPADDING', (0, 1), (-1, -1), 4),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 4),
-        ]
-        
-        for idx, result in enumerate(results):
-            if result.get('success', False) and idx == 0:
-                style_commands.append(('BACKGROUND', (0, idx+1), (-1, idx+1), colors.lightgreen))
-                style_commands.append(('FONTNAME', (0, idx+1), (-1, idx+1), 'Helvetica-Bold'))
-            elif not result.get('success', False):
-                style_commands.append(('BACKGROUND', (0, idx+1), (-1, idx+1), colors.lightpink))
-            elif idx % 2 == 0:
-                style_commands.append(('BACKGROUND', (0, idx+1), (-1, idx+1), colors.lightgrey))
+            row.append(str(imbalance) if imbalance is not None else 'N/A')
+            row.append(str(max_load) if max_load is not None else 'N/A')
+            row.append(str(min_load) if min_load is not None else 'N/A')
         
-        comparison_table.setStyle(TableStyle(style_commands))
-        
-        story.append(comparison_table)
-        story.append(Spacer(1, 0.2*inch))
-        
-        successful_results = [r for r in results if r.get('success', False)]
-        if successful_results and model_type in ['op_limit', 'workers_skills']:
-            story.append(Paragraph(f"Distribución de Carga - {type_names.get(model_type)}", heading_style))
-            
-            for result in successful_results[:3]:
-                operator_load = result.get('operator_load') or result.get('worker_load')
-                if operator_load:
-                    load_data = [['Recurso', 'Carga']]
-                    prefix = 'Op' if result.get('operator_load') else 'W'
-                    
-                    for idx, load in enumerate(operator_load):
-                        load_data.append([f'{prefix} {idx+1}', str(load)])
-                    
-                    story.append(Paragraph(f"<b>{result.get('model_name', 'N/A')}</b>", styles['Normal']))
-                    
-                    load_table = Table(load_data, colWidths=[2*inch, 2*inch])
-                    load_table.setStyle(TableStyle([
-                        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#95a5a6')),
-                        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                        ('FONTSIZE', (0, 0), (-1, 0), 9),
-                        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                        ('FONTSIZE', (0, 1), (-1, -1), 8),
-                    ]))
-                    
-                    story.append(load_table)
-                    story.append(Spacer(1, 0.1*inch))
+        table_data.append(row)
+    
+    if model_type in ['op_limit', 'workers_skills']:
+        col_widths = [0.5*inch, 2.2*inch, 0.9*inch, 0.9*inch, 1*inch, 0.8*inch, 0.8*inch, 0.8*inch]
+    else:
+        col_widths = [0.5*inch, 2.5*inch, 1.2*inch, 1.2*inch, 1.5*inch]
+    
+    comparison_table = Table(table_data, colWidths=col_widths)
+    
+    style_commands = [
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#34495e')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 9),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('FONTSIZE', (0, 1), (-1, -1), 8),
+        ('TOPPADDING', (0, 1), (-1, -1), 4),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 4),
+    ]
+    
+    for idx, result in enumerate(results):
+        if result.get('success', False) and idx == 0:
+            style_commands.append(('BACKGROUND', (0, idx+1), (-1, idx+1), colors.lightgreen))
+            style_commands.append(('FONTNAME', (0, idx+1), (-1, idx+1), 'Helvetica-Bold'))
+        elif not result.get('success', False):
+            style_commands.append(('BACKGROUND', (0, idx+1), (-1, idx+1), colors.lightpink))
+        elif idx % 2 == 0:
+            style_commands.append(('BACKGROUND', (0, idx+1), (-1, idx+1), colors.lightgrey))
+    
+    comparison_table.setStyle(TableStyle(style_commands))
+    
+    story.append(comparison_table)
+    story.append(Spacer(1, 0.2*inch))
+    
+    successful_results = [r for r in results if r.get('success', False)]
+    if successful_results and model_type in ['op_limit', 'workers_skills']:
+        story.append(Paragraph(f"Distribución de Carga - {TYPE_NAMES.get(model_type)}", heading_style))
         
-        if model_type != list(results_by_type.keys())[-1]:
-            story.append(Spacer(1, 0.3*inch))
+        for result in successful_results[:3]:
+            operator_load = result.get('operator_load') or result.get('worker_load')
+            if operator_load:
+                load_data = [['Recurso', 'Carga']]
+                prefix = 'Op' if result.get('operator_load') else 'W'
+                
+                for idx, load in enumerate(operator_load):
+                    load_data.append([f'{prefix} {idx+1}', str(load)])
+                
+                story.append(Paragraph(f"<b>{result.get('model_name', 'N/A')}</b>", styles['Normal']))
+                
+                load_table = Table(load_data, colWidths=[2*inch, 2*inch])
+                load_table.setStyle(TableStyle([
+                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#95a5a6')),
+                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                    ('FONTSIZE', (0, 0), (-1, 0), 9),
+                    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+                    ('FONTSIZE', (0, 1), (-1, -1), 8),
+                ]))
+                
+                story.append(load_table)
+                story.append(Spacer(1, 0.1*inch))
     
-    # Agregar gráficos de comparación
-    story.append(PageBreak())
-    story.append(Paragraph("Gráficos Comparativos", heading_style))
+    if not is_last:
+        story.append(Spacer(1, 0.3*inch))
+    return story
+
+
+def racing_outcome(entry, cooperative):
+    """Texto de la columna Resultado de una entrada de ronda"""
+    if cooperative:
+        if entry['eliminated']:
+            return 'Error'
+        return 'Mejora' if entry['improved'] else 'Sin mejora'
+    return 'Eliminada' if entry['eliminated'] else 'Continúa'
+
+
+def build_racing_section(racing_rounds, heading_style, cooperative=False):
+    """Tabla con las rondas de eliminación (modo carrera) o de cota compartida (modo cooperativo)"""
+    if not racing_rounds:
+        return []
+    story = [PageBreak(), Paragraph("Rondas con Cota Compartida" if cooperative else "Rondas de Eliminación",
+                                    heading_style)]
+    
+    rounds_data = [['Ronda', 'Presupuesto (s)', 'Modelo', 'Estado', 'Makespan', 'Resultado']]
+    style_commands = [
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#34495e')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 9),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('FONTSIZE', (0, 1), (-1, -1), 8),
+        ('TOPPADDING', (0, 1), (-1, -1), 4),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 4),
+    ]
     
-    results_list = comparison_results.get('results', [])
+    for racing_round in racing_rounds:
+        for entry in racing_round['entries']:
+            rounds_data.append([
+                str(racing_round['round']),
+                str(racing_round['budget']),
+                entry['model_name'],
+                entry['status'],
+                str(entry['makespan']) if entry['makespan'] is not None else '-',
+                racing_outcome(entry, cooperative)
+            ])
+            row_idx = len(rounds_data) - 1
+            if entry['eliminated']:
+                style_commands.append(('BACKGROUND', (0, row_idx), (-1, row_idx), colors.lightpink))
+            elif entry.get('improved'):
+                style_commands.append(('BACKGROUND', (0, row_idx), (-1, row_idx), colors.lightgreen))
+    
+    rounds_table = Table(rounds_data, colWidths=[0.6*inch, 1*inch, 2.4*inch, 1.2*inch, 0.8*inch, 0.9*inch])
+    rounds_table.setStyle(TableStyle(style_commands))
+    story.append(rounds_table)
+    return story
+
+
+def build_comparison_charts_section(results_list, styles, heading_style, images=None):
+    """
+    Gráficos de makespan y desbalance
+
+    Args:
+        images: Imágenes renderizadas en paralelo por render_figure_images
+                antes de montar el documento
+    """
+    story = [PageBreak(), Paragraph("Gráficos Comparativos", heading_style)]
     
     # Gráfico de Makespan
-    makespan_fig = generate_comparison_makespan_figure(results_list)
+    makespan_fig = get_figure('makespan', results_list, font_size=COMPARISON_FONT_SIZE)
     if makespan_fig:
         try:
-            img_bytes = plotly_fig_to_image(makespan_fig, width=900, height=450)
+            img_bytes = get_figure_image('makespan', results_list, width=900, height=450,
+                                         font_size=COMPARISON_FONT_SIZE, images=images)
             if img_bytes:
                 img = Image(img_bytes, width=6.5*inch, height=3.25*inch)
                 story.append(Paragraph("Comparación de Makespan", heading_style))
@@ -706,10 +604,11 @@ def generate_comparison_pdf(comparison_results):
             story.append(note)
     
     # Gráfico de Desbalance
-    imbalance_fig = generate_comparison_imbalance_figure(results_list)
+    imbalance_fig = get_figure('imbalance', results_list, font_size=COMPARISON_FONT_SIZE)
     if imbalance_fig:
         try:
-            img_bytes = plotly_fig_to_image(imbalance_fig, width=900, height=450)
+            img_bytes = get_figure_image('imbalance', results_list, width=900, height=450,
+                                         font_size=COMPARISON_FONT_SIZE, images=images)
             if img_bytes:
                 img = Image(img_bytes, width=6.5*inch, height=3.25*inch)
                 story.append(Paragraph("Comparación de Desbalance de Carga", heading_style))
@@ -718,46 +617,148 @@ def generate_comparison_pdf(comparison_results):
         except Exception as e:
             pass
     
+    return story
+
+
+def build_best_result_section(results_list, heading_style):
+    """Resumen del mejor resultado global"""
     best_result = None
     for result in results_list:
         if result.get('success', False):
             if best_result is None or result.get('makespan', 999999) < best_result.get('makespan', 999999):
                 best_result = result
     
-    if best_result:
-        story.append(PageBreak())
-        story.append(Paragraph("Mejor Resultado Global", heading_style))
-        
-        best_data = [
-            ['Mejor Resultado', ''],
-            ['Modelo:', best_result.get('model_name', 'N/A')],
-            ['Makespan:', str(best_result.get('makespan', 'N/A'))],
-            ['Tiempo de Ejecución:', best_result.get('execution_time', 'N/A')],
-            ['Estado:', best_result.get('status', 'N/A')],
-        ]
-        
-        if best_result.get('imbalance') is not None:
-            best_data.append(['Desbalance:', str(best_result.get('imbalance', 'N/A'))])
-        
-        best_table = Table(best_data, colWidths=[2.5*inch, 4*inch])
-        best_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f39c12')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 14),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#fef5e7')),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-            ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 1), (-1, -1), 11),
-            ('TOPPADDING', (0, 1), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
-        ]))
-        
-        story.append(best_table)
+    if not best_result:
+        return []
+    
+    story = [PageBreak(), Paragraph("Mejor Resultado Global", heading_style)]
+    
+    best_data = [
+        ['Mejor Resultado', ''],
+        ['Modelo:', best_result.get('model_name', 'N/A')],
+        ['Makespan:', str(best_result.get('makespan', 'N/A'))],
+        ['Tiempo de Ejecución:', best_result.get('execution_time', 'N/A')],
+        ['Estado:', best_result.get('status', 'N/A')],
+    ]
+    
+    if best_result.get('imbalance') is not None:
+        best_data.append(['Desbalance:', str(best_result.get('imbalance', 'N/A'))])
+    
+    best_table = Table(best_data, colWidths=[2.5*inch, 4*inch])
+    best_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f39c12')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 14),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#fef5e7')),
+        ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+        ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 1), (-1, -1), 11),
+        ('TOPPADDING', (0, 1), (-1, -1), 8),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
+    ]))
+    
+    story.append(best_table)
+    return story
+
+
+def timed_section(timings, name, builder, *args):
+    """Ejecuta el builder de una sección y guarda su duración en ``timings``"""
+    start = time.perf_counter()
+    flowables = builder(*args)
+    timings[name] = time.perf_counter() - start
+    return flowables
+
+
+def generate_comparison_pdf(comparison_results, timings=None):
+    """
+    Genera un PDF con los resultados de comparación de múltiples modelos
+
+    Las imágenes de los gráficos se renderizan en paralelo en un pool de
+    procesos. Las secciones (tablas por familia, rondas, gráficos, mejor
+    resultado) se construyen una tras otra: son código Python puro de
+    ReportLab y un pool de hilos no las acelera con el GIL.
+
+    Args:
+        comparison_results: Resultados de la comparación (sesión)
+        timings: Diccionario opcional que recibe los segundos de cada
+                 sección ('imagenes', 'informacion', 'tipo_<familia>',
+                 'rondas', 'graficos', 'mejor', 'ensamblado', 'total')
+    """
+    timings = timings if timings is not None else {}
+    total_start = time.perf_counter()
+    
+    buffer = BytesIO()
+    test_file = comparison_results.get('test_file', 'N/A')
+    doc = SimpleDocTemplate(
+        buffer, 
+        pagesize=A4, 
+        topMargin=0.5*inch, 
+        bottomMargin=0.5*inch,
+        title=f"Comparación de Estrategias - {test_file}",
+        author="Job Shop Scheduler",
+        subject=f"Comparación de modelos con {test_file}"
+    )
+    
+    styles = getSampleStyleSheet()
+    
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#2c3e50'),
+        spaceAfter=30,
+        alignment=TA_CENTER
+    )
+    
+    heading_style = ParagraphStyle(
+        'CustomHeading',
+        parent=styles['Heading2'],
+        fontSize=16,
+        textColor=colors.HexColor('#34495e'),
+        spaceAfter=12,
+        spaceBefore=12
+    )
+    
+    results_list = comparison_results.get('results', [])
+    
+    results_by_type = {}
+    for result in results_list:
+        results_by_type.setdefault(result.get('model_type', 'unknown'), []).append(result)
+    
+    # Imágenes de los gráficos en paralelo; se pasan a la sección de gráficos
+    start = time.perf_counter()
+    images = render_figure_images([
+        {'kind': kind, 'data': results_list, 'width': 900, 'height': 450, 'font_size': COMPARISON_FONT_SIZE}
+        for kind in ('makespan', 'imbalance')
+    ])
+    timings['imagenes'] = time.perf_counter() - start
+    
+    last_type = list(results_by_type.keys())[-1] if results_by_type else None
+    sections = [('informacion', build_comparison_info_section, (comparison_results, title_style))]
+    sections += [
+        (f'tipo_{model_type}', build_model_type_section,
+         (model_type, results, styles, heading_style, model_type == last_type))
+        for model_type, results in results_by_type.items()
+    ]
+    sections += [
+        ('rondas', build_racing_section, (comparison_results.get('racing_rounds') or [], heading_style)),
+        ('rondas_cooperativas', build_racing_section,
+         (comparison_results.get('cooperative_rounds') or [], heading_style, True)),
+        ('graficos', build_comparison_charts_section, (results_list, styles, heading_style, images)),
+        ('mejor', build_best_result_section, (results_list, heading_style)),
+    ]
+    
+    story = []
+    for name, builder, args in sections:
+        story.extend(timed_section(timings, name, builder, *args))
     
+    start = time.perf_counter()
     doc.build(story)
+    timings['ensamblado'] = time.perf_counter() - start
+    timings['total'] = time.perf_counter() - total_start
     
     buffer.seek(0)
     return buffer
@@ -0,0 +1,81 @@
+"""
+Helper para la comprobación previa (preflight) de modelo + datos
+
+Antes de lanzar un solver se ejecuta ``minizinc --instance-check-only``, que
+comprueba tipos y parámetros del modelo con los datos sin aplanar ni
+resolver. Así un .dzn incompatible con el modelo se detecta en milisegundos
+en lugar de ocupar un hueco de solver hasta fallar.
+"""
+import os
+import subprocess
+import minizinc
+
+from helpers.cache_helper import LRUCache, hash_files
+from helpers.minizinc_helper import configure_minizinc_driver
+
+
+# Tiempo máximo de la comprobación (segundos)
+PREFLIGHT_TIMEOUT = 30
+
+# Longitud máxima del mensaje de error mostrado al usuario
+PREFLIGHT_MESSAGE_LENGTH = 500
+
+_preflight_cache = LRUCache(maxsize=int(os.environ.get('JOBSHOP_PREFLIGHT_CACHE_SIZE', 256)))
+
+
+def get_minizinc_executable():
+    """Ruta del ejecutable de MiniZinc del driver configurado"""
+    configure_minizinc_driver()
+    driver = minizinc.default_driver
+    executable = getattr(driver, '_executable', None) if driver else None
+    return str(executable) if executable else 'minizinc'
+
+
+def clean_preflight_message(output):
+    """Reduce la salida de MiniZinc a las líneas relevantes del error"""
+    lines = [line.rstrip() for line in output.splitlines() if line.strip()]
+    message = '\n'.join(lines)
+    if len(message) > PREFLIGHT_MESSAGE_LENGTH:
+        message = message[:PREFLIGHT_MESSAGE_LENGTH] + '...'
+    return message
+
+
+def preflight_check(model_path, data_path):
+    """
+    Comprueba que el modelo y los datos sean compatibles sin resolver
+
+    El resultado se guarda en caché por el hash del contenido de ambos
+    archivos, así que repetir la comprobación con los mismos archivos no
+    lanza MiniZinc.
+
+    Args:
+        model_path: Ruta al modelo .mzn
+        data_path: Ruta al archivo de datos .dzn
+
+    Returns:
+        Tupla (ok, mensaje de error o None)
+    """
+    key = hash_files(model_path, data_path)
+    cached = _preflight_cache.get(key)
+    if cached is not None:
+        return cached
+
+    try:
+        completed = subprocess.run(
+            [get_minizinc_executable(), '--instance-check-only', model_path, data_path],
+            capture_output=True,
+            text=True,
+            timeout=PREFLIGHT_TIMEOUT
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        # Si no se puede comprobar no se bloquea la ejecución: el solver
+        # informará del error si lo hay. No se guarda en caché.
+        return True, None
+
+    if completed.returncode == 0:
+        outcome = (True, None)
+    else:
+        outcome = (False, clean_preflight_message(completed.stderr or completed.stdout))
+
+    _preflight_cache.put(key, outcome)
+    return outcome
@@ -0,0 +1,185 @@
+"""
+Helper para lanzar cada resolución con límites de recursos y poder matarla
+
+Cada resolución usa un driver de MiniZinc propio cuyo ejecutable es un
+pequeño script que delega en limited_exec.py: límites de memoria y CPU
+(rlimits), sesión propia para matar MiniZinc y su solver juntos, y registro
+del pico de memoria. Las resoluciones se registran bajo el ``run_token`` de
+la petición y el cliente que la hizo, de modo que cancelar la petición (p.ej.
+al cerrar la pestaña) termina sus procesos y ningún otro cliente puede
+cancelarlos.
+"""
+import os
+import sys
+import json
+import shlex
+import signal
+import shutil
+import tempfile
+import threading
+import contextvars
+from contextlib import contextmanager
+from pathlib import Path
+import minizinc
+
+from helpers.admission_helper import current_client
+
+
+LIMITED_EXEC = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'limited_exec.py')
+
+# Margen de CPU (segundos) sobre timeout x hilos para el aplanado y la salida
+CPU_LIMIT_MARGIN = 60
+
+# Token de la petición en curso (para cancelar sus resoluciones)
+current_run_token = contextvars.ContextVar('current_run_token', default=None)
+
+_running = {}
+# Cliente dueño de cada token (solo él puede cancelar sus resoluciones)
+_owners = {}
+_running_lock = threading.Lock()
+
+
+def limits_supported():
+    """Los rlimits y grupos de procesos solo están disponibles en POSIX"""
+    return os.name == 'posix'
+
+
+def get_memory_limit_mb():
+    """Límite de memoria por proceso (JOBSHOP_SOLVE_MEMORY_MB, 0 = sin límite)"""
+    return int(os.environ.get('JOBSHOP_SOLVE_MEMORY_MB') or 0)
+
+
+def get_cpu_limit_seconds(timeout, threads):
+    """
+    Límite de CPU por proceso
+
+    JOBSHOP_SOLVE_CPU_SECONDS fija el valor; por defecto es el tiempo límite
+    por el número de hilos más un margen, lo que corta aplanados desbocados
+    que no respetan el timeout del solver.
+    """
+    configured = os.environ.get('JOBSHOP_SOLVE_CPU_SECONDS')
+    if configured:
+        return int(configured)
+    return int(timeout * max(1, threads)) + CPU_LIMIT_MARGIN
+
+
+def get_real_executable():
+    """Ejecutable de MiniZinc del driver configurado"""
+    driver = minizinc.default_driver
+    executable = getattr(driver, '_executable', None) if driver else None
+    return str(executable) if executable else (shutil.which('minizinc') or 'minizinc')
+
+
+class LimitedRun:
+    """Driver con límites de una resolución y lectura de sus estadísticas"""
+
+    def __init__(self, workdir, timeout, threads):
+        self.workdir = workdir
+        self.stats_path = os.path.join(workdir, 'stats.json')
+        self.memory_mb = get_memory_limit_mb()
+        self.cpu_seconds = get_cpu_limit_seconds(timeout, threads)
+
+        script_path = os.path.join(workdir, 'minizinc')
+        command = [
+            sys.executable, LIMITED_EXEC,
+            '--executable', get_real_executable(),
+            '--stats', self.stats_path,
+            '--memory-mb', str(self.memory_mb),
+            '--cpu-seconds', str(self.cpu_seconds),
+            '--'
+        ]
+        with open(script_path, 'w') as f:
+            f.write('#!/bin/sh\nexec ' + ' '.join(shlex.quote(part) for part in command) + ' "$@"\n')
+        os.chmod(script_path, 0o700)
+
+        self.driver = minizinc.Driver(Path(script_path))
+
+    def read_stats(self):
+        """Estadísticas del último proceso lanzado (o {} si no terminó)"""
+        try:
+            with open(self.stats_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def kill(self):
+        """Mata el grupo de procesos de la resolución si sigue en marcha"""
+        stats = self.read_stats()
+        if stats.get('running') and stats.get('pid'):
+            try:
+                os.killpg(stats['pid'], signal.SIGKILL)
+            except OSError:
+                pass
+
+    def annotate(self, result):
+        """Añade pico de memoria y CPU a las estadísticas del resultado"""
+        stats = self.read_stats()
+        if result is not None and stats.get('peak_rss_kb') is not None:
+            statistics = getattr(result, 'statistics', None)
+            if statistics is not None:
+                statistics['peakRSSMB'] = round(stats['peak_rss_kb'] / 1024, 1)
+                statistics['processCPUSeconds'] = stats.get('cpu_seconds')
+        return result
+
+
+@contextmanager
+def limited_run(timeout, threads=1):
+    """
+    Prepara un driver con límites para una resolución
+
+    Yields:
+        LimitedRun, o None si la plataforma no admite límites (se usa el
+        driver por defecto)
+    """
+    if not limits_supported():
+        yield None
+        return
+
+    workdir = tempfile.mkdtemp(prefix='jobshop-solve-')
+    run = LimitedRun(workdir, timeout, threads)
+    token = current_run_token.get()
+    with _running_lock:
+        _running.setdefault(token, set()).add(run)
+        _owners.setdefault(token, current_client.get())
+    try:
+        yield run
+    finally:
+        # Ningún proceso debe sobrevivir a su resolución
+        run.kill()
+        with _running_lock:
+            runs = _running.get(token)
+            if runs is not None:
+                runs.discard(run)
+                if not runs:
+                    del _running[token]
+                    _owners.pop(token, None)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def cancel_run(run_token, owner):
+    """
+    Mata todas las resoluciones en curso de una petición
+
+    Args:
+        run_token: Token de la petición
+        owner: Cliente que pide la cancelación
+
+    Returns:
+        Número de resoluciones canceladas, o None si el token no tiene
+        resoluciones en curso de ese cliente
+    """
+    if not run_token:
+        return None
+    with _running_lock:
+        if run_token not in _running or _owners.get(run_token) != owner:
+            return None
+        runs = list(_running[run_token])
+    for run in runs:
+        run.kill()
+    return len(runs)
+
+
+def peak_rss_from_result(result):
+    """Pico de memoria (MB) registrado en las estadísticas de un resultado"""
+    statistics = getattr(result, 'statistics', None) or {}
+    return statistics.get('peakRSSMB')
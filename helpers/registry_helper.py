@@ -0,0 +1,109 @@
+"""
+Helper con el registro de modelos y solvers
+
+Es parte del núcleo sin interfaz (registro + resolución + extracción): no
+importa Flask, Plotly ni ReportLab, de modo que la API asíncrona, los
+benchmarks y los scripts pueden usarlo sin cargar la aplicación web.
+"""
+
+
+MODELS = {
+    'jobshop_op_limit_1': {
+        'name': 'Operarios Limitados - Búsqueda Libre',
+        'file': 'jobshop_op_limit/jobshop_op_limit_1.mzn',
+        'description': 'Job Shop con k operarios. Búsqueda sin seq_search.',
+        'type': 'op_limit',
+        'category': 'Operarios Limitados'
+    },
+    'jobshop_op_limit_2': {
+        'name': 'Operarios Limitados - dom_w_deg + first_fail',
+        'file': 'jobshop_op_limit/jobshop_op_limit_2.mzn',
+        'description': 'Búsqueda: tiempo con dom_w_deg, operarios con first_fail.',
+        'type': 'op_limit',
+        'category': 'Operarios Limitados'
+    },
+    'jobshop_op_limit_3': {
+        'name': 'Operarios Limitados - Operario Primero',
+        'file': 'jobshop_op_limit/jobshop_op_limit_3.mzn',
+        'description': 'Búsqueda: operario primero con first_fail.',
+        'type': 'op_limit',
+        'category': 'Operarios Limitados'
+    },
+    'jobshop_op_limit_4': {
+        'name': 'Operarios Limitados - Intervalos Opcionales',
+        'file': 'jobshop_op_limit/jobshop_op_limit_4.mzn',
+        'description': 'Un disjunctive de tareas opcionales por operario (escala a instancias grandes; solo Gecode).',
+        'type': 'op_limit',
+        'category': 'Operarios Limitados',
+        # Solo Gecode propaga disjunctive con tareas opcionales de forma nativa;
+        # el resto lo descompone por pares, con más restricciones que 1-3
+        'solvers': ['org.gecode.gecode']
+    },
+    'jobshop_workers_skills_1': {
+        'name': 'Habilidades de Operarios - Búsqueda Libre',
+        'file': 'jobshop_workers_skills/jobshop_workers_skills_1.mzn',
+        'description': 'Operarios especializados según habilidades. Búsqueda libre.',
+        'type': 'workers_skills',
+        'category': 'Habilidades de Operarios'
+    },
+    'jobshop_workers_skills_2': {
+        'name': 'Habilidades de Operarios - dom_w_deg + first_fail',
+        'file': 'jobshop_workers_skills/jobshop_workers_skills_2.mzn',
+        'description': 'Búsqueda: tiempo con dom_w_deg, asignación con first_fail.',
+        'type': 'workers_skills',
+        'category': 'Habilidades de Operarios'
+    },
+    'jobshop_maintenance_1': {
+        'name': 'Mantenimiento - Solución Directa',
+        'file': 'jobshop_maintenance/jobshop_maintenance_1.mzn',
+        'description': 'Job Shop con ventanas de mantenimiento. Búsqueda directa.',
+        'type': 'maintenance',
+        'category': 'Mantenimiento de Máquinas'
+    },
+    'jobshop_maintenance_2': {
+        'name': 'Mantenimiento - First-Fail',
+        'file': 'jobshop_maintenance/jobshop_maintenance_2.mzn',
+        'description': 'Con mantenimiento. Búsqueda: first_fail con indomain_min.',
+        'type': 'maintenance',
+        'category': 'Mantenimiento de Máquinas'
+    },
+    'jobshop_maintenance_3': {
+        'name': 'Mantenimiento - Input Order Random',
+        'file': 'jobshop_maintenance/jobshop_maintenance_3.mzn',
+        'description': 'Con mantenimiento. Búsqueda: input_order con indomain_random.',
+        'type': 'maintenance',
+        'category': 'Mantenimiento de Máquinas'
+    },
+    'jobshop_maintenance_4': {
+        'name': 'Mantenimiento - Búsqueda por Jobs',
+        'file': 'jobshop_maintenance/jobshop_maintenance_4.mzn',
+        'description': 'Con mantenimiento. Búsqueda secuencial por cada job.',
+        'type': 'maintenance',
+        'category': 'Mantenimiento de Máquinas'
+    },
+    'jobshop_maintenance_5': {
+        'name': 'Mantenimiento - Disjunctive Global',
+        'file': 'jobshop_maintenance/jobshop_maintenance_5.mzn',
+        'description': 'Un disjunctive por máquina con los paros (fusionados) como tareas fijas.',
+        'type': 'maintenance',
+        'category': 'Mantenimiento de Máquinas'
+    }
+}
+
+SOLVERS = {
+    'org.gecode.gecode': 'Gecode',
+    'org.chuffed.chuffed': 'Chuffed',
+    'org.minizinc.mip.coin-bc': 'COIN-BC',
+    'org.minizinc.mip.highs': 'HiGHS',
+}
+
+
+def model_supports_solver(model_info, solver_key):
+    """Indica si un modelo se ofrece con un solver (clave 'solvers' opcional del registro)"""
+    solvers = model_info.get('solvers')
+    return solvers is None or solver_key in solvers
+
+
+def models_of_type(model_type):
+    """Claves de los modelos de una familia, en el orden del registro"""
+    return [key for key, model in MODELS.items() if model['type'] == model_type]
@@ -0,0 +1,320 @@
+"""
+Helper con la representación compacta de una programación (Schedule)
+
+Los resultados viajaban como diccionarios de listas anidadas que cada capa
+(Gantt, CSV, PDF, sesión) recorría y copiaba. Schedule guarda inicios,
+duraciones y asignaciones como arrays int32 de NumPy con ``__slots__``, se
+convierte sin copias al formato de diccionario de las plantillas y se
+serializa en un binario compacto para la sesión.
+"""
+import os
+import gzip
+import json
+import zlib
+import struct
+import hashlib
+import numpy as np
+
+from helpers.cache_helper import LRUCache
+
+
+# Claves de los resultados que pasan a vivir en el Schedule
+SCHEDULE_KEYS = ('start_times', 'durations', 'operator_assignment', 'worker_assignment',
+                 'operator_load', 'worker_load')
+
+MODEL_TYPES = ('op_limit', 'workers_skills', 'maintenance')
+
+ASSIGNMENT_KEYS = {'op_limit': 'operator_assignment', 'workers_skills': 'worker_assignment'}
+LOAD_KEYS = {'op_limit': 'operator_load', 'workers_skills': 'worker_load'}
+
+# Clave del índice precalculado (schedule_index_helper); no se serializa
+INDEX_KEY = 'schedule_index'
+
+# Cabecera: magic, versión, tipo, flags, jobs, tasks, num_resources, num_breaks
+HEADER = struct.Struct('<4sBBBxIIiI')
+MAGIC = b'JSS1'
+VERSION = 1
+
+FLAG_ASSIGNMENT = 1
+FLAG_BREAKS = 2
+
+# Longitud del identificador de resultados (prefijo del sha256 del binario)
+RESULT_ID_LENGTH = 16
+
+# JSON columnar comprimido de cada resultado, por result_id
+_payload_cache = LRUCache(maxsize=int(os.environ.get('JOBSHOP_SCHEDULE_CACHE_SIZE', 128)))
+
+
+def as_int32_matrix(values, shape=None):
+    """Convierte una matriz (lista anidada o array) a int32 sin copiar si ya lo es"""
+    array = np.asarray(values, dtype=np.int32)
+    if shape is not None:
+        array = array.reshape(shape)
+    return array
+
+
+def resource_loads(assignment, durations, num_resources):
+    """
+    Carga (suma de duraciones) de cada operario/trabajador
+
+    Las asignaciones fuera de 1..num_resources (0 o negativas en resultados
+    parciales o voraces) se ignoran.
+
+    Args:
+        assignment: Array (jobs, tasks) con el recurso (base 1) o None
+        durations: Array (jobs, tasks) de duraciones
+        num_resources: Número de operarios/trabajadores
+
+    Returns:
+        Array int64 de longitud num_resources o None sin asignación
+    """
+    if assignment is None or not num_resources:
+        return None
+    flat = np.asarray(assignment).ravel()
+    valid = (flat >= 1) & (flat <= num_resources)
+    loads = np.bincount(flat[valid], weights=np.asarray(durations).ravel()[valid], minlength=num_resources + 1)
+    return loads[1:].astype(np.int64)
+
+
+class Schedule:
+    """
+    Programación de una instancia con arrays int32
+
+    Attributes:
+        model_type: Familia del modelo (op_limit, workers_skills, maintenance)
+        starts: Inicios, array (jobs, tasks)
+        durations: Duraciones, array (jobs, tasks)
+        assignment: Operario/trabajador por operación, array (jobs, tasks) o None
+        num_resources: Número de operarios/trabajadores (para las cargas)
+        breaks: Paros (máquina base 1, inicio, fin), array (n, 3) o None
+    """
+
+    __slots__ = ('model_type', 'starts', 'durations', 'assignment', 'num_resources', 'breaks')
+
+    def __init__(self, model_type, starts, durations, assignment=None, num_resources=None, breaks=None):
+        self.model_type = model_type
+        self.starts = as_int32_matrix(starts)
+        self.durations = as_int32_matrix(durations, self.starts.shape)
+        self.assignment = as_int32_matrix(assignment, self.starts.shape) if assignment is not None else None
+        if num_resources is None and self.assignment is not None and self.assignment.size:
+            num_resources = int(self.assignment.max())
+        self.num_resources = num_resources
+        self.breaks = as_int32_matrix(breaks).reshape(-1, 3) if breaks is not None else None
+
+    @property
+    def jobs(self):
+        return self.starts.shape[0]
+
+    @property
+    def tasks(self):
+        return self.starts.shape[1] if self.starts.ndim == 2 else 0
+
+    @property
+    def ends(self):
+        """Fin de cada operación"""
+        return self.starts + self.durations
+
+    @property
+    def makespan(self):
+        return int(self.ends.max()) if self.starts.size else 0
+
+    def resource_loads(self):
+        """Carga de cada operario/trabajador (ver resource_loads) o None sin asignación"""
+        return resource_loads(self.assignment, self.durations, self.num_resources)
+
+    @classmethod
+    def from_results(cls, results, breaks=None):
+        """
+        Construye un Schedule a partir de un diccionario de resultados
+
+        Returns:
+            Schedule o None si los resultados no contienen inicios y duraciones
+        """
+        starts = results.get('start_times')
+        durations = results.get('durations')
+        if starts is None or durations is None or len(starts) == 0:
+            return None
+
+        model_type = results.get('model_type')
+        assignment = results.get(ASSIGNMENT_KEYS.get(model_type, ''))
+        load = results.get(LOAD_KEYS.get(model_type, ''))
+        num_resources = len(load) if load is not None and len(load) else None
+        return cls(model_type, starts, durations, assignment, num_resources, breaks)
+
+    def to_results(self):
+        """
+        Campos de resultados en el formato de las plantillas, sin copiar
+
+        Los arrays se devuelven tal cual (vistas): se pueden recorrer por
+        filas, indexar y medir con len como las listas anidadas.
+        """
+        results = {
+            'start_times': self.starts,
+            'durations': self.durations
+        }
+        assignment_key = ASSIGNMENT_KEYS.get(self.model_type)
+        if assignment_key and self.assignment is not None:
+            results[assignment_key] = self.assignment
+            loads = self.resource_loads()
+            if loads is not None:
+                results[LOAD_KEYS[self.model_type]] = loads
+        return results
+
+    def to_columns(self):
+        """
+        Programación en formato columnar para el cliente
+
+        Una fila por operación en orden (job, tarea), como listas planas de
+        enteros: start, duration, machine, job y resource (None sin
+        asignación). Máquinas y jobs en base 0; recursos en base 1.
+        """
+        jobs, machines = np.indices(self.starts.shape)
+        columns = {
+            'model_type': self.model_type,
+            'jobs': self.jobs,
+            'tasks': self.tasks,
+            'makespan': self.makespan,
+            'start': self.starts.ravel().tolist(),
+            'duration': self.durations.ravel().tolist(),
+            'machine': machines.ravel().tolist(),
+            'job': jobs.ravel().tolist(),
+            'resource': self.assignment.ravel().tolist() if self.assignment is not None else None
+        }
+        if self.breaks is not None:
+            columns['breaks'] = self.breaks.tolist()
+        return columns
+
+    def to_bytes(self):
+        """
+        Serialización binaria compacta (cabecera + arrays int32 comprimidos)
+
+        Los valores pequeños dejan bytes altos a cero, por lo que zlib reduce
+        el tamaño muy por debajo del JSON equivalente.
+        """
+        flags = 0
+        arrays = [self.starts, self.durations]
+        if self.assignment is not None:
+            flags |= FLAG_ASSIGNMENT
+            arrays.append(self.assignment)
+        if self.breaks is not None:
+            flags |= FLAG_BREAKS
+            arrays.append(self.breaks)
+
+        header = HEADER.pack(
+            MAGIC, VERSION, MODEL_TYPES.index(self.model_type) if self.model_type in MODEL_TYPES else 255,
+            flags, self.jobs, self.tasks,
+            self.num_resources if self.num_resources is not None else -1,
+            len(self.breaks) if self.breaks is not None else 0
+        )
+        payload = b''.join(np.ascontiguousarray(array, dtype='<i4').tobytes() for array in arrays)
+        return header + zlib.compress(payload)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Reconstruye un Schedule serializado con to_bytes
+
+        Raises:
+            ValueError: si los datos no son una programación serializada
+        """
+        if len(data) < HEADER.size:
+            raise ValueError('Datos de programación truncados')
+        magic, version, type_index, flags, jobs, tasks, num_resources, num_breaks = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('Formato de programación no reconocido')
+
+        payload = np.frombuffer(zlib.decompress(data[HEADER.size:]), dtype='<i4')
+        size = jobs * tasks
+
+        def take(offset, count, shape):
+            return payload[offset:offset + count].astype(np.int32, copy=False).reshape(shape), offset + count
+
+        starts, offset = take(0, size, (jobs, tasks))
+        durations, offset = take(offset, size, (jobs, tasks))
+        assignment = breaks = None
+        if flags & FLAG_ASSIGNMENT:
+            assignment, offset = take(offset, size, (jobs, tasks))
+        if flags & FLAG_BREAKS:
+            breaks, offset = take(offset, num_breaks * 3, (num_breaks, 3))
+
+        schedule = cls.__new__(cls)
+        schedule.model_type = MODEL_TYPES[type_index] if type_index < len(MODEL_TYPES) else None
+        schedule.starts = starts
+        schedule.durations = durations
+        schedule.assignment = assignment
+        schedule.num_resources = num_resources if num_resources >= 0 else None
+        schedule.breaks = breaks
+        return schedule
+
+
+def hash_schedule_bytes(data):
+    """Identificador de una programación serializada (prefijo del sha256)"""
+    return hashlib.sha256(data).hexdigest()[:RESULT_ID_LENGTH]
+
+
+def get_result_id(results):
+    """
+    Identificador por contenido de la programación de unos resultados
+
+    Usa 'result_id' si ya viene de pack_results; si no, lo calcula.
+
+    Returns:
+        Cadena hexadecimal o None si los resultados no tienen programación
+    """
+    if not results:
+        return None
+    if results.get('result_id'):
+        return results['result_id']
+    schedule = Schedule.from_results(results)
+    return hash_schedule_bytes(schedule.to_bytes()) if schedule is not None else None
+
+
+def pack_results(results):
+    """
+    Prepara unos resultados para la sesión
+
+    Las matrices se sustituyen por el Schedule serializado ('schedule') y se
+    descarta el índice precalculado; el resto de campos (makespan, estado,
+    métricas) se conservan. 'result_id' identifica la programación por su
+    contenido (ver schedule_payload).
+    """
+    schedule = Schedule.from_results(results)
+    if schedule is None:
+        return results
+    packed = {key: value for key, value in results.items()
+              if key not in SCHEDULE_KEYS and key != INDEX_KEY}
+    packed['schedule'] = schedule.to_bytes()
+    packed['result_id'] = hash_schedule_bytes(packed['schedule'])
+    return packed
+
+
+def unpack_results(packed):
+    """Inverso de pack_results: añade las matrices (como arrays) a los resultados"""
+    if not packed or 'schedule' not in packed:
+        return packed
+    results = {key: value for key, value in packed.items() if key != 'schedule'}
+    results.update(Schedule.from_bytes(packed['schedule']).to_results())
+    return results
+
+
+def schedule_payload(packed):
+    """
+    JSON columnar (Schedule.to_columns) comprimido con gzip de unos resultados
+    empaquetados
+
+    Se genera una vez por result_id y se guarda en una caché LRU: las
+    visitas repetidas a la página de resultados no vuelven a serializar.
+
+    Returns:
+        Bytes gzip o None si los resultados no tienen programación
+    """
+    if not packed or 'schedule' not in packed:
+        return None
+    result_id = packed.get('result_id')
+    payload = _payload_cache.get(result_id) if result_id else None
+    if payload is None:
+        columns = Schedule.from_bytes(packed['schedule']).to_columns()
+        payload = gzip.compress(json.dumps(columns, separators=(',', ':')).encode('utf-8'))
+        if result_id:
+            _payload_cache.put(result_id, payload)
+    return payload
@@ -0,0 +1,213 @@
+"""
+Helper con los índices precalculados de una programación
+
+El Gantt, el CSV, el PDF, la validación y las analíticas reconstruían las
+mismas vistas recorriendo job×tarea con bucles anidados. ScheduleIndex
+calcula una sola vez, con argsort de NumPy, las secuencias ordenadas por
+máquina y por operario/trabajador y la lista de eventos en orden temporal.
+El índice se guarda en los resultados (clave INDEX_KEY) y todas las capas
+leen de él; pack_results lo descarta al guardar en la sesión.
+"""
+import numpy as np
+
+from helpers.schedule_helper import Schedule, INDEX_KEY, resource_loads
+
+
+# Tipos de evento: a igual tiempo los fines van antes que los inicios
+EVENT_END = 0
+EVENT_START = 1
+
+
+class ScheduleIndex:
+    """
+    Índices ordenados de una programación
+
+    Attributes:
+        starts, durations, ends: Arrays int32 (jobs, tasks)
+        assignment: Recurso (base 1) por operación, array (jobs, tasks) o None
+        num_resources: Número de operarios/trabajadores
+        machine_order: Array (jobs, tasks); la columna m contiene los jobs
+                       de la máquina m ordenados por inicio
+        resource_order: Índices planos (job * tasks + tarea) ordenados por
+                        (recurso, inicio) o None sin asignación
+        resource_ids: Recurso de cada posición de resource_order
+        event_order: Índices de eventos ordenados por (tiempo, tipo); los
+                     índices < jobs*tasks son inicios y el resto fines
+    """
+
+    __slots__ = ('starts', 'durations', 'ends', 'assignment', 'num_resources',
+                 'machine_order', 'resource_order', 'resource_ids', 'event_order')
+
+    def __init__(self, starts, durations, assignment=None, num_resources=None):
+        self.starts = np.asarray(starts, dtype=np.int32)
+        if self.starts.ndim != 2:
+            self.starts = self.starts.reshape(len(self.starts), -1)
+        self.durations = np.asarray(durations, dtype=np.int32).reshape(self.starts.shape)
+        self.ends = self.starts + self.durations
+        self.assignment = None
+        if assignment is not None and len(assignment):
+            self.assignment = np.asarray(assignment, dtype=np.int32).reshape(self.starts.shape)
+        if num_resources is None and self.assignment is not None and self.assignment.size:
+            num_resources = int(self.assignment.max())
+        self.num_resources = num_resources
+
+        # Orden estable: a igual inicio se respeta el orden de los jobs
+        self.machine_order = np.argsort(self.starts, axis=0, kind='stable')
+
+        self.resource_order = self.resource_ids = None
+        if self.assignment is not None:
+            flat_resources = self.assignment.ravel()
+            self.resource_order = np.lexsort((self.starts.ravel(), flat_resources))
+            self.resource_ids = flat_resources[self.resource_order]
+
+        size = self.starts.size
+        times = np.concatenate((self.starts.ravel(), self.ends.ravel()))
+        kinds = np.concatenate((np.full(size, EVENT_START, dtype=np.int8),
+                                np.full(size, EVENT_END, dtype=np.int8)))
+        self.event_order = np.lexsort((kinds, times))
+
+    @classmethod
+    def from_schedule(cls, schedule):
+        """Construye el índice de un Schedule"""
+        return cls(schedule.starts, schedule.durations, schedule.assignment, schedule.num_resources)
+
+    @property
+    def jobs(self):
+        return self.starts.shape[0]
+
+    @property
+    def tasks(self):
+        return self.starts.shape[1]
+
+    @property
+    def makespan(self):
+        return int(self.ends.max()) if self.starts.size else 0
+
+    def machine_sequence(self, machine):
+        """
+        Operaciones de una máquina en orden de inicio
+
+        Args:
+            machine: Máquina (base 0, coincide con el índice de tarea)
+
+        Returns:
+            Tupla (jobs, inicios, fines) de arrays
+        """
+        jobs = self.machine_order[:, machine]
+        return jobs, self.starts[jobs, machine], self.ends[jobs, machine]
+
+    def resource_sequence(self, resource):
+        """
+        Operaciones de un operario/trabajador en orden de inicio
+
+        Args:
+            resource: Recurso (base 1, como en las asignaciones)
+
+        Returns:
+            Tupla (jobs, tareas) de arrays (vacíos sin asignación)
+        """
+        if self.resource_order is None:
+            empty = np.empty(0, dtype=np.intp)
+            return empty, empty
+        low, high = np.searchsorted(self.resource_ids, [resource, resource + 1])
+        return np.divmod(self.resource_order[low:high], self.tasks)
+
+    def resource_loads(self):
+        """Carga de cada operario/trabajador (ver schedule_helper.resource_loads) o None sin asignación"""
+        return resource_loads(self.assignment, self.durations, self.num_resources)
+
+    def machine_busy(self):
+        """Tiempo ocupado de cada máquina"""
+        return self.durations.sum(axis=0)
+
+    def machine_utilization(self):
+        """Fracción del makespan que cada máquina está ocupada"""
+        makespan = self.makespan
+        if not makespan:
+            return np.zeros(self.tasks)
+        return self.machine_busy() / makespan
+
+    def events(self):
+        """
+        Lista de eventos en orden temporal
+
+        Returns:
+            Tupla (tiempos, tipos, jobs, tareas) de arrays; tipos vale
+            EVENT_START o EVENT_END
+        """
+        size = self.starts.size
+        is_start = self.event_order < size
+        operations = np.where(is_start, self.event_order, self.event_order - size)
+        times = np.concatenate((self.starts.ravel(), self.ends.ravel()))[self.event_order]
+        kinds = np.where(is_start, EVENT_START, EVENT_END).astype(np.int8)
+        jobs, tasks = np.divmod(operations, max(self.tasks, 1))
+        return times, kinds, jobs, tasks
+
+    def _overlaps(self, groups):
+        """
+        Pares de operaciones solapadas dentro de cada grupo (máquina o recurso)
+
+        Las operaciones de duración cero no ocupan el recurso y se ignoran.
+
+        Returns:
+            Lista de tuplas (grupo, (job, tarea), (job, tarea))
+        """
+        operations = np.flatnonzero(self.durations.ravel() > 0)
+        group_ids = groups.ravel()[operations]
+        starts = self.starts.ravel()[operations]
+        ends = self.ends.ravel()[operations]
+
+        order = np.lexsort((ends, starts, group_ids))
+        operations, group_ids = operations[order], group_ids[order]
+        starts, ends = starts[order], ends[order]
+
+        clashes = np.flatnonzero((group_ids[:-1] == group_ids[1:]) & (ends[:-1] > starts[1:]))
+        return [
+            (int(group_ids[pos]),
+             divmod(int(operations[pos]), self.tasks),
+             divmod(int(operations[pos + 1]), self.tasks))
+            for pos in clashes
+        ]
+
+    def machine_overlaps(self):
+        """Solapes por máquina (máquina base 0), ver _overlaps"""
+        machines = np.broadcast_to(np.arange(self.tasks, dtype=np.int32), self.starts.shape)
+        return self._overlaps(machines)
+
+    def resource_overlaps(self):
+        """Solapes por operario/trabajador (recurso base 1), ver _overlaps"""
+        if self.assignment is None:
+            return []
+        return self._overlaps(self.assignment)
+
+    def precedence_violations(self):
+        """
+        Operaciones que terminan después del inicio de la siguiente tarea del job
+
+        Returns:
+            Lista de tuplas (job, tarea) base 0
+        """
+        violations = np.argwhere(self.ends[:, :-1] > self.starts[:, 1:])
+        return [(int(job), int(task)) for job, task in violations]
+
+
+def get_schedule_index(results):
+    """
+    Índice de unos resultados, construido la primera vez y cacheado en ellos
+
+    El índice refleja los resultados en el momento de construirse: quien
+    modifique start_times o las asignaciones debe eliminar INDEX_KEY.
+
+    Returns:
+        ScheduleIndex o None si los resultados no contienen una programación
+    """
+    if not results:
+        return None
+    index = results.get(INDEX_KEY)
+    if index is None:
+        schedule = Schedule.from_results(results)
+        if schedule is None:
+            return None
+        index = ScheduleIndex.from_schedule(schedule)
+        results[INDEX_KEY] = index
+    return index
@@ -0,0 +1,212 @@
+"""
+Helper para construir y reparar programaciones (schedules) sin solver
+"""
+from helpers.schedule_index_helper import ScheduleIndex
+
+
+def push_past_breaks(start, duration, machine_breaks):
+    """
+    Retrasa el inicio de una operación hasta que no se solape con ningún paro
+
+    Args:
+        start: Inicio candidato
+        duration: Duración de la operación
+        machine_breaks: Lista de tuplas (inicio, fin) de paros de la máquina,
+                        ordenada por inicio
+
+    Returns:
+        Primer inicio >= start compatible con los paros
+    """
+    if duration <= 0:
+        return start
+
+    moved = True
+    while moved:
+        moved = False
+        for brk_a, brk_b in machine_breaks:
+            if start < brk_b and brk_a < start + duration:
+                start = brk_b
+                moved = True
+    return start
+
+
+def group_breaks_by_machine(breaks):
+    """Agrupa los paros (máquina, inicio, fin) por máquina con índice base 0"""
+    by_machine = {}
+    for machine, brk_a, brk_b in breaks or []:
+        by_machine.setdefault(machine - 1, []).append((brk_a, brk_b))
+    for machine_breaks in by_machine.values():
+        machine_breaks.sort()
+    return by_machine
+
+
+def list_schedule(durations, priority, assignment=None, breaks=None,
+                  machine_release=None, resource_release=None, job_release=None,
+                  resource_choices=None):
+    """
+    Programación por lista: despacha las operaciones en el orden dado
+
+    Cada operación (job, tarea) usa la máquina de su columna y, si hay
+    asignación, el operario/trabajador indicado. Se programa en el primer
+    instante en que están libres el job, la máquina y el recurso, y fuera de
+    los paros de mantenimiento de la máquina.
+
+    Args:
+        durations: Matriz de duraciones [job][tarea]
+        priority: Lista de tuplas (job, tarea) con base 0; dentro de cada job
+                  las tareas deben aparecer en orden
+        assignment: Matriz [job][tarea] con el recurso asignado (base 1) o None
+        breaks: Lista de paros (máquina base 1, inicio, fin)
+        machine_release: Lista con el instante en que se libera cada máquina
+        resource_release: Diccionario recurso -> instante de liberación
+        job_release: Lista con el instante de liberación de cada job
+        resource_choices: Función opcional (job, tarea) -> recursos admisibles;
+                          las operaciones con asignación None reciben el
+                          recurso admisible que antes quede libre y la matriz
+                          ``assignment`` se completa en el sitio
+
+    Returns:
+        Matriz de tiempos de inicio [job][tarea]
+    """
+    num_jobs = len(durations)
+    num_tasks = len(durations[0]) if durations else 0
+
+    job_ready = list(job_release) if job_release else [0] * num_jobs
+    machine_ready = list(machine_release) if machine_release else [0] * num_tasks
+    resource_ready = dict(resource_release or {})
+    breaks_by_machine = group_breaks_by_machine(breaks)
+
+    start_times = [[0] * num_tasks for _ in range(num_jobs)]
+
+    for job, task in priority:
+        duration = durations[job][task]
+        start = max(job_ready[job], machine_ready[task])
+
+        resource = assignment[job][task] if assignment else None
+        if resource is None and assignment and resource_choices:
+            candidates = sorted(resource_choices(job, task))
+            if candidates:
+                resource = min(candidates, key=lambda r: max(start, resource_ready.get(r, 0)))
+                assignment[job][task] = resource
+        if resource is not None:
+            start = max(start, resource_ready.get(resource, 0))
+
+        start = push_past_breaks(start, duration, breaks_by_machine.get(task, []))
+
+        start_times[job][task] = start
+        job_ready[job] = start + duration
+        machine_ready[task] = start + duration
+        if resource is not None:
+            resource_ready[resource] = start + duration
+
+    return start_times
+
+
+def compute_makespan(start_times, durations):
+    """Calcula el makespan de una programación"""
+    return max(
+        (start + duration
+         for start_row, duration_row in zip(start_times, durations)
+         for start, duration in zip(start_row, duration_row)),
+        default=0
+    )
+
+
+def compute_resource_loads(assignment, durations, num_resources):
+    """
+    Calcula la carga (suma de duraciones) de cada operario/trabajador
+
+    Args:
+        assignment: Matriz [job][tarea] con el recurso asignado (base 1)
+        durations: Matriz de duraciones [job][tarea]
+        num_resources: Número de recursos
+
+    Returns:
+        Lista de cargas indexada por recurso (base 0)
+    """
+    loads = [0] * num_resources
+    for assign_row, duration_row in zip(assignment, durations):
+        for resource, duration in zip(assign_row, duration_row):
+            if 1 <= resource <= num_resources:
+                loads[resource - 1] += duration
+    return loads
+
+
+def build_results_from_schedule(start_times, durations, model_type, assignment=None, num_resources=None):
+    """
+    Construye los campos de resultados (como los controladores) a partir de
+    una programación calculada fuera del solver
+
+    Returns:
+        Diccionario con start_times, makespan y, según el tipo, asignaciones
+        y métricas de carga
+    """
+    results = {
+        'start_times': [list(row) for row in start_times],
+        'makespan': compute_makespan(start_times, durations)
+    }
+
+    if model_type in ('op_limit', 'workers_skills') and assignment:
+        if num_resources is None:
+            num_resources = max(max(row) for row in assignment)
+        loads = compute_resource_loads(assignment, durations, num_resources)
+        max_load = max(loads) if loads else 0
+        min_load = min(loads) if loads else 0
+
+        if model_type == 'op_limit':
+            results['operator_assignment'] = [list(row) for row in assignment]
+            results['operator_load'] = loads
+            results['imbalance'] = max_load - min_load
+        else:
+            results['worker_assignment'] = [list(row) for row in assignment]
+            results['worker_load'] = loads
+        results['max_load'] = max_load
+        results['min_load'] = min_load
+
+    return results
+
+
+def validate_schedule(start_times, durations, assignment=None, breaks=None, num_resources=None, skills=None):
+    """
+    Valida una programación completa contra las restricciones del problema
+
+    Comprueba precedencias dentro de cada job, no solapamiento por máquina y
+    por operario/trabajador, paros de mantenimiento, rango de los recursos y
+    habilidades requeridas.
+
+    Returns:
+        Lista de mensajes con las violaciones encontradas (vacía si es válida)
+    """
+    errors = []
+    num_jobs = len(durations)
+    num_tasks = len(durations[0]) if num_jobs else 0
+    if not num_tasks:
+        return errors
+
+    index = ScheduleIndex(start_times, durations, assignment, num_resources)
+
+    for job, task in index.precedence_violations():
+        errors.append(f'Precedencia violada en Job {job+1}, tarea {task+1}')
+
+    for machine, op_a, op_b in index.machine_overlaps():
+        errors.append(f'Solape en Máquina {machine+1}: Job {op_a[0]+1} T{op_a[1]+1} y Job {op_b[0]+1} T{op_b[1]+1}')
+
+    if index.assignment is not None:
+        for job in range(num_jobs):
+            for task in range(num_tasks):
+                resource = assignment[job][task]
+                if num_resources is not None and not 1 <= resource <= num_resources:
+                    errors.append(f'Recurso {resource} fuera de rango en Job {job+1}, tarea {task+1}')
+                if skills and resource not in skills[task]:
+                    errors.append(f'Recurso {resource} sin habilidad para la tarea {task+1} (Job {job+1})')
+        for resource, op_a, op_b in index.resource_overlaps():
+            errors.append(f'Solape en recurso {resource}: Job {op_a[0]+1} T{op_a[1]+1} y Job {op_b[0]+1} T{op_b[1]+1}')
+
+    for task, machine_breaks in group_breaks_by_machine(breaks).items():
+        for job in range(num_jobs):
+            start = start_times[job][task]
+            duration = durations[job][task]
+            if push_past_breaks(start, duration, machine_breaks) != start:
+                errors.append(f'Job {job+1} se solapa con un paro de la Máquina {task+1}')
+
+    return errors
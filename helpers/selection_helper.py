@@ -0,0 +1,237 @@
+"""
+Helper de selección automática de modelo y solver
+
+Elegir entre las variantes de MODELS y los SOLVERS a ojo, o lanzando una
+comparación completa, multiplica la carga de solvers. La selección
+compara las características de la instancia (features_helper) con las de
+las instancias ya resueltas del historial y elige la configuración
+(modelo + solver) que fue más rápida en las instancias más parecidas
+(k vecinos más cercanos).
+
+Coste de una resolución (menor es mejor), al estilo PAR-2:
+- óptimo demostrado: tiempo de resolución;
+- solución sin demostrar: PENALTY_FACTOR × límite, aumentado por la
+  distancia relativa a la mejor solución conocida de la instancia;
+- sin solución o error: el doble de lo anterior.
+Los costes se dividen por el límite de tiempo de la resolución (coste
+absoluto: 1 es agotar el límite) para que las instancias grandes no
+dominen. No se comparan con la mejor configuración de la instancia: una
+configuración que es la única ejecutada en una instancia puntuaría
+siempre como la mejor aunque nunca hubiera encontrado solución.
+"""
+import math
+import sqlite3
+import threading
+import numpy as np
+
+from helpers.features_helper import features_from_dzn, feature_vector, FEATURE_NAMES
+from helpers.history_helper import (get_history_path, instance_features, selection_runs, history_version,
+                                    SOLVED_STATUSES, PROOF_STATUS)
+from helpers.registry_helper import model_supports_solver
+
+
+DEFAULT_NEIGHBOURS = 5
+
+# Penalización (múltiplo del límite de tiempo) de las resoluciones sin óptimo
+PENALTY_FACTOR = 2.0
+
+# Límite supuesto para las resoluciones sin timeout registrado
+DEFAULT_TIMEOUT = 60.0
+
+# Fracción del límite de tiempo que recibe la segunda opción
+SECOND_CHOICE_FRACTION = 0.25
+MIN_SECOND_CHOICE_TIMEOUT = 5
+
+DEFAULT_SOLVER = 'org.gecode.gecode'
+
+OPTIMAL_STATUSES = ('OPTIMAL_SOLUTION', PROOF_STATUS)
+
+
+def run_cost(run, best_makespan):
+    """
+    Coste de una resolución (ver docstring del módulo)
+
+    Args:
+        run: Fila de selection_runs
+        best_makespan: Mejor makespan conocido de la instancia o None
+    """
+    limit = run.get('timeout') or DEFAULT_TIMEOUT
+    if run['status'] in OPTIMAL_STATUSES:
+        return max(run.get('solve_time') or 0.0, 0.001)
+    if run['status'] in SOLVED_STATUSES and run.get('makespan') is not None:
+        gap = (run['makespan'] - best_makespan) / best_makespan if best_makespan else 0.0
+        return PENALTY_FACTOR * limit * (1.0 + max(gap, 0.0))
+    return 2 * PENALTY_FACTOR * limit
+
+
+class SelectionModel:
+    """
+    Vecinos más cercanos sobre las instancias resueltas de una familia
+
+    Attributes:
+        model_type: Familia de modelos
+        hashes: Hash de cada instancia de entrenamiento
+        vectors: Características estandarizadas, array (instancias, FEATURE_NAMES)
+        costs: Por instancia, {(model_key, solver): log del coste / límite}
+    """
+
+    def __init__(self, model_type, features, runs):
+        self.model_type = model_type
+
+        best = {}
+        for run in runs:
+            if run['status'] in SOLVED_STATUSES and run.get('makespan') is not None:
+                current = best.get(run['instance_hash'])
+                best[run['instance_hash']] = run['makespan'] if current is None else min(current, run['makespan'])
+
+        # Coste medio (relativo al límite) de cada configuración en cada instancia con características
+        totals = {}
+        for run in runs:
+            if run['instance_hash'] not in features:
+                continue
+            key = (run['model_key'], run['solver'])
+            cost = run_cost(run, best.get(run['instance_hash'])) / (run.get('timeout') or DEFAULT_TIMEOUT)
+            configurations = totals.setdefault(run['instance_hash'], {})
+            total, count = configurations.get(key, (0.0, 0))
+            configurations[key] = (total + cost, count + 1)
+
+        self.hashes = sorted(totals)
+        self.costs = [
+            {key: math.log(total / count) for key, (total, count) in totals[instance_hash].items()}
+            for instance_hash in self.hashes
+        ]
+
+        raw = np.array([feature_vector(features[h]) for h in self.hashes]).reshape(-1, len(FEATURE_NAMES))
+        self.mean = raw.mean(axis=0) if len(raw) else np.zeros(len(FEATURE_NAMES))
+        scale = raw.std(axis=0) if len(raw) else np.ones(len(FEATURE_NAMES))
+        self.scale = np.where(scale > 0, scale, 1.0)
+        self.vectors = (raw - self.mean) / self.scale
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def rank(self, features, neighbours=DEFAULT_NEIGHBOURS, configurations=None):
+        """
+        Ordena las configuraciones por coste esperado (log del coste / límite)
+
+        Cada vecino pondera con el inverso de su distancia; una
+        configuración solo se puntúa con los vecinos que la ejecutaron.
+
+        Args:
+            features: Diccionario de extract_features de la instancia
+            configurations: Configuraciones admitidas (model_key, solver) o None
+
+        Returns:
+            Lista de diccionarios (model_key, solver, score, support)
+            ordenada de mejor a peor; vacía sin historial
+        """
+        if not self.hashes:
+            return []
+        vector = (feature_vector(features) - self.mean) / self.scale
+        distances = np.sqrt(((self.vectors - vector) ** 2).sum(axis=1))
+        nearest = np.argsort(distances, kind='stable')[:neighbours]
+
+        scores = {}
+        for position in nearest:
+            weight = 1.0 / (distances[position] + 1e-3)
+            for key, cost in self.costs[position].items():
+                if configurations is not None and key not in configurations:
+                    continue
+                total, weights, support = scores.get(key, (0.0, 0.0, 0))
+                scores[key] = (total + weight * cost, weights + weight, support + 1)
+
+        ranking = [
+            {'model_key': key[0], 'solver': key[1], 'score': float(total / weights), 'support': support}
+            for key, (total, weights, support) in scores.items()
+        ]
+        # A igual puntuación, la configuración con más vecinos que la respaldan
+        ranking.sort(key=lambda entry: (entry['score'], -entry['support'], entry['model_key'], entry['solver']))
+        return ranking
+
+
+_models = {}
+_models_lock = threading.Lock()
+
+
+def get_selection_model(model_type):
+    """
+    Modelo de selección de una familia, reconstruido si cambia el historial
+
+    Returns:
+        SelectionModel (vacío si el historial está desactivado o falla)
+    """
+    if not get_history_path():
+        return SelectionModel(model_type, {}, [])
+    try:
+        version = history_version()
+        with _models_lock:
+            cached = _models.get(model_type)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+        model = SelectionModel(model_type, instance_features(model_type), selection_runs(model_type))
+    except (sqlite3.Error, OSError) as e:
+        print(f"Error consultando el historial: {e}")
+        return SelectionModel(model_type, {}, [])
+    with _models_lock:
+        _models[model_type] = (version, model)
+    return model
+
+
+def second_choice_timeout(timeout):
+    """Límite de la segunda opción: SECOND_CHOICE_FRACTION del total (mínimo MIN_SECOND_CHOICE_TIMEOUT)"""
+    return max(MIN_SECOND_CHOICE_TIMEOUT, int(timeout * SECOND_CHOICE_FRACTION))
+
+
+def select_configuration(dzn_content, model_type, models_config, solvers, timeout,
+                         second_choice=False, neighbours=DEFAULT_NEIGHBOURS):
+    """
+    Elige modelo y solver para una instancia
+
+    Sin historial de la familia se usa el primer modelo del registro con
+    DEFAULT_SOLVER. Con segunda opción, la mejor configuración recibe el
+    límite menos second_choice_timeout y la segunda el resto, de modo que
+    el total no supera ``timeout``.
+
+    Returns:
+        Diccionario con 'plan' (lista de tuplas (model_key, solver, timeout)),
+        'ranking' (las primeras configuraciones), 'source' ('history' o
+        'default'), 'neighbours' (instancias de la familia en el historial)
+        y 'features'
+    """
+    allowed = {(key, solver) for key, model in models_config.items() if model['type'] == model_type
+               for solver in solvers if model_supports_solver(model, solver)}
+    features = features_from_dzn(dzn_content, model_type)
+    model = get_selection_model(model_type)
+    ranking = model.rank(features, neighbours, allowed)
+
+    if ranking:
+        source = 'history'
+        choices = [(entry['model_key'], entry['solver']) for entry in ranking[:2]]
+    else:
+        source = 'default'
+        default_model = next(key for key, value in models_config.items() if value['type'] == model_type)
+        choices = [(default_model, DEFAULT_SOLVER if DEFAULT_SOLVER in solvers else next(iter(solvers)))]
+
+    if second_choice and len(choices) > 1 and timeout > second_choice_timeout(timeout):
+        short = second_choice_timeout(timeout)
+        plan = [(*choices[0], timeout - short), (*choices[1], short)]
+    else:
+        plan = [(*choices[0], timeout)]
+
+    return {
+        'plan': plan,
+        'ranking': ranking[:5],
+        'source': source,
+        'neighbours': len(model),
+        'features': features
+    }
+
+
+def describe_selection(selection, models_config, solvers):
+    """Texto breve de la configuración elegida para los mensajes y resultados"""
+    parts = []
+    for model_key, solver, timeout in selection['plan']:
+        parts.append(f"{models_config[model_key]['name']} + {solvers.get(solver, solver)} ({timeout}s)")
+    origin = (f"historial de {selection['neighbours']} instancias" if selection['source'] == 'history'
+              else 'sin historial, configuración por defecto')
+    return f"{' y después '.join(parts)} [{origin}]"
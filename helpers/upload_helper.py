@@ -0,0 +1,169 @@
+"""
+Helper de ingesta de instancias .dzn con almacenamiento direccionado por contenido
+
+Las subidas se leen por bloques con un tamaño máximo, se calcula su hash
+sha256 mientras se escriben y se guardan una sola vez en
+``<carpeta>/<hash[:2]>/<hash>.dzn``. Al ingerir se valida y se extraen las
+dimensiones una única vez (``<hash>.json``). La sesión solo guarda el hash:
+las subidas duplicadas no ocupan espacio y el hash sirve de clave de caché
+(coincide con hash_content del historial).
+"""
+import os
+import re
+import json
+import hashlib
+import tempfile
+
+from helpers.data_helper import parse_durations_from_dzn, parse_int_from_dzn, strip_dzn_comments
+
+
+DEFAULT_MAX_UPLOAD_BYTES = 2 * 1024 * 1024
+
+# Tamaño de la vista previa que se muestra en la página principal
+PREVIEW_BYTES = 20000
+
+CHUNK_SIZE = 65536
+
+HASH_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+
+class UploadRejected(Exception):
+    """Subida rechazada (tamaño, codificación o contenido no válido)"""
+
+
+def get_max_upload_bytes():
+    """Tamaño máximo de una subida (JOBSHOP_MAX_UPLOAD_BYTES)"""
+    return int(os.environ.get('JOBSHOP_MAX_UPLOAD_BYTES') or DEFAULT_MAX_UPLOAD_BYTES)
+
+
+def instance_path(store_folder, content_hash, extension='.dzn'):
+    """
+    Ruta de una instancia almacenada a partir de su hash
+
+    Raises:
+        UploadRejected: si el hash no tiene el formato esperado (evita rutas
+                        arbitrarias a partir de datos de la sesión)
+    """
+    if not content_hash or not HASH_PATTERN.match(content_hash):
+        raise UploadRejected('Identificador de instancia no válido')
+    return os.path.join(store_folder, content_hash[:2], content_hash + extension)
+
+
+def describe_instance(content):
+    """
+    Valida un .dzn y extrae sus dimensiones
+
+    Returns:
+        Diccionario con jobs, tasks y los parámetros de familia presentes
+        (k, W, Nbreaks)
+
+    Raises:
+        UploadRejected: si no contiene una matriz de duraciones rectangular
+    """
+    try:
+        durations = parse_durations_from_dzn(strip_dzn_comments(content))
+    except ValueError:
+        raise UploadRejected('La matriz de duraciones contiene valores no enteros')
+
+    if not durations:
+        raise UploadRejected('El archivo no contiene una matriz de duraciones (d = [| ... |])')
+    tasks = len(durations[0])
+    if any(len(row) != tasks for row in durations):
+        raise UploadRejected('Las filas de la matriz de duraciones tienen longitudes distintas')
+
+    metadata = {'jobs': len(durations), 'tasks': tasks}
+    for name in ['k', 'W', 'Nbreaks']:
+        value = parse_int_from_dzn(content, name)
+        if value is not None:
+            metadata[name] = value
+    return metadata
+
+
+def ingest_stream(stream, store_folder, max_bytes=None):
+    """
+    Ingiere una instancia leyendo ``stream`` por bloques
+
+    Args:
+        stream: Objeto con read(n) (p.ej. FileStorage.stream)
+        store_folder: Carpeta raíz del almacén direccionado por contenido
+        max_bytes: Tamaño máximo (por defecto get_max_upload_bytes())
+
+    Returns:
+        Diccionario con hash, size, duplicate y las dimensiones de la instancia
+
+    Raises:
+        UploadRejected: si excede el tamaño o el contenido no es válido
+    """
+    max_bytes = max_bytes or get_max_upload_bytes()
+    os.makedirs(store_folder, exist_ok=True)
+
+    digest = hashlib.sha256()
+    size = 0
+    fd, temp_path = tempfile.mkstemp(suffix='.part', dir=store_folder)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            for chunk in iter(lambda: stream.read(CHUNK_SIZE), b''):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadRejected(f'El archivo supera el tamaño máximo ({max_bytes // 1024} KB)')
+                digest.update(chunk)
+                f.write(chunk)
+
+        content_hash = digest.hexdigest()
+        final_path = instance_path(store_folder, content_hash)
+
+        # Instancia ya almacenada: solo se devuelven sus metadatos
+        if os.path.exists(final_path):
+            metadata = load_instance_metadata(store_folder, content_hash)
+            if metadata is not None:
+                return {**metadata, 'duplicate': True}
+
+        with open(temp_path, 'rb') as f:
+            try:
+                content = f.read().decode('utf-8')
+            except UnicodeDecodeError:
+                raise UploadRejected('El archivo no está codificado en UTF-8')
+
+        metadata = {'hash': content_hash, 'size': size, **describe_instance(content)}
+
+        os.makedirs(os.path.dirname(final_path), exist_ok=True)
+        os.replace(temp_path, final_path)
+        with open(instance_path(store_folder, content_hash, '.json'), 'w') as f:
+            json.dump(metadata, f)
+        return {**metadata, 'duplicate': False}
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def ingest_file(path, store_folder, max_bytes=None):
+    """Ingiere un archivo local (p.ej. un test precargado), ver ingest_stream"""
+    with open(path, 'rb') as f:
+        return ingest_stream(f, store_folder, max_bytes)
+
+
+def load_instance_metadata(store_folder, content_hash):
+    """Metadatos guardados al ingerir una instancia o None si no existe"""
+    try:
+        with open(instance_path(store_folder, content_hash, '.json'), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError, UploadRejected):
+        return None
+
+
+def read_instance_preview(store_folder, content_hash, limit=PREVIEW_BYTES):
+    """
+    Primeros ``limit`` bytes de una instancia para la vista previa
+
+    Returns:
+        Texto (con aviso de truncado si procede) o None si no existe
+    """
+    try:
+        with open(instance_path(store_folder, content_hash), 'rb') as f:
+            data = f.read(limit + 1)
+    except (OSError, UploadRejected):
+        return None
+    preview = data[:limit].decode('utf-8', errors='replace')
+    if len(data) > limit:
+        preview += '\n% ... (vista previa truncada)'
+    return preview
@@ -1,82 +1,104 @@
 """
 Helper para generación de visualizaciones (gráficos de Gantt y comparaciones)
+
+Los fragmentos HTML no incluyen plotly.js: las plantillas cargan la copia
+local de static/vendor (plotly_js_url).
+
+Cada tipo de figura ('gantt', 'makespan', 'imbalance') tiene un único
+builder. get_figure y get_figure_image guardan figuras e imágenes PNG en
+cachés LRU acotadas, con claves por hash de los datos y parámetros de
+renderizado. La vista HTML, el PDF individual y el de comparación comparten
+la construcción, y una exportación repetida no vuelve a pasar por kaleido.
 """
+import os
+import json
+import hashlib
+import logging
+import threading
+import multiprocessing
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
 import plotly.graph_objects as go
 
+from helpers.cache_helper import LRUCache
+from helpers.schedule_helper import get_result_id
+from helpers.schedule_index_helper import get_schedule_index
+
+
+GANTT_COLORS = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd',
+                '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf']
+
+# Etiqueta del recurso en el hover según el tipo de modelo
+RESOURCE_LABELS = {'op_limit': 'Operario', 'workers_skills': 'Trabajador'}
+
+logger = logging.getLogger(__name__)
+
+_figure_cache = LRUCache(maxsize=int(os.environ.get('JOBSHOP_FIGURE_CACHE_SIZE', 64)))
+_image_cache = LRUCache(maxsize=int(os.environ.get('JOBSHOP_IMAGE_CACHE_SIZE', 32)))
 
-def generate_gantt_chart(results):
+# Pool de procesos para kaleido (cada proceso mantiene su propio navegador)
+_render_pool = None
+_render_pool_lock = threading.Lock()
+
+
+def build_gantt_figure(results, font_size=None):
     """
-    Genera un diagrama de Gantt interactivo con Plotly
-    Muestra las máquinas en el eje Y y los trabajos como barras coloreadas
-    
+    Construye la figura de Plotly del diagrama de Gantt (máquinas en el eje Y)
+
+    Lee de ScheduleIndex y genera una traza por job con todas sus
+    operaciones, en lugar de una traza por operación. La página de
+    resultados dibuja el mismo Gantt en el navegador (results.html).
+
     Args:
         results: Diccionario con resultados del modelo
-    
+        font_size: Tamaño de letra (None usa el de la plantilla)
+
     Returns:
-        HTML string del gráfico de Gantt
+        Figure de Plotly o None si no hay programación
     """
-    start_times = results.get('start_times', [])
-    durations = results.get('durations', [])
-    
-    if not start_times or not durations:
-        return '<p>No se pudo generar el diagrama de Gantt.</p>'
-    
+    index = get_schedule_index(results)
+    if index is None or index.starts.size == 0:
+        return None
+
     fig = go.Figure()
-    
-    colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', 
-              '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf']
-    
+
     model_type = results.get('model_type', 'op_limit')
-    
-    # Rastrear qué jobs ya se mostraron en la leyenda
-    jobs_shown = set()
-    
-    # Iterar por cada job y cada máquina
-    for job_idx, (start_row, duration_row) in enumerate(zip(start_times, durations)):
-        
-        for task_idx, (start, duration) in enumerate(zip(start_row, duration_row)):
-            color = colors[job_idx % len(colors)]
-            
-            # El eje Y representa las máquinas
-            y_label = f'Máquina {task_idx+1}'
-            
-            if model_type == 'op_limit':
-                operator = results['operator_assignment'][job_idx][task_idx]
-                hover_text = f'Job {job_idx+1} en Máquina {task_idx+1}<br>Operario: {operator}<br>Inicio: {start}<br>Duración: {duration}'
-            elif model_type == 'workers_skills':
-                worker = results['worker_assignment'][job_idx][task_idx]
-                hover_text = f'Job {job_idx+1} en Máquina {task_idx+1}<br>Trabajador: {worker}<br>Inicio: {start}<br>Duración: {duration}'
-            else:
-                hover_text = f'Job {job_idx+1} en Máquina {task_idx+1}<br>Inicio: {start}<br>Duración: {duration}'
-            
-            # Mostrar en leyenda solo la primera vez que aparece cada job
-            show_in_legend = job_idx not in jobs_shown
-            if show_in_legend:
-                jobs_shown.add(job_idx)
-            
-            fig.add_trace(go.Bar(
-                x=[duration],
-                y=[y_label],
-                orientation='h',
-                base=start,
-                marker=dict(color=color, line=dict(color='white', width=1)),
-                name=f'Job {job_idx+1}',
-                showlegend=show_in_legend,
-                text=f'J{job_idx+1}',
-                textposition='inside',
-                hovertext=hover_text,
-                hoverinfo='text',
-                legendgroup=f'Job {job_idx+1}'
-            ))
-    
-    num_machines = len(durations[0]) if durations else 0
-    
+    resource_label = RESOURCE_LABELS.get(model_type) if index.assignment is not None else None
+    machine_labels = [f'Máquina {task+1}' for task in range(index.tasks)]
+
+    for job_idx in range(index.jobs):
+        starts = index.starts[job_idx].tolist()
+        durations = index.durations[job_idx].tolist()
+        resources = index.assignment[job_idx].tolist() if resource_label else None
+
+        hover_texts = []
+        for task_idx, (start, duration) in enumerate(zip(starts, durations)):
+            resource_line = f'<br>{resource_label}: {resources[task_idx]}' if resource_label else ''
+            hover_texts.append(f'Job {job_idx+1} en Máquina {task_idx+1}{resource_line}'
+                               f'<br>Inicio: {start}<br>Duración: {duration}')
+
+        fig.add_trace(go.Bar(
+            x=durations,
+            y=machine_labels,
+            orientation='h',
+            base=starts,
+            marker=dict(color=GANTT_COLORS[job_idx % len(GANTT_COLORS)], line=dict(color='white', width=1)),
+            name=f'Job {job_idx+1}',
+            text=f'J{job_idx+1}',
+            textposition='inside',
+            hovertext=hover_texts,
+            hoverinfo='text',
+            legendgroup=f'Job {job_idx+1}'
+        ))
+
     fig.update_layout(
         title='Diagrama de Gantt - Job Shop Scheduling (por Máquina)',
         xaxis_title='Tiempo',
         yaxis_title='Máquinas',
         barmode='overlay',
-        height=max(400, 150 + num_machines * 50),
+        height=max(400, 150 + index.tasks * 50),
         hovermode='closest',
         showlegend=True,
         legend=dict(
@@ -88,21 +110,28 @@ def generate_gantt_chart(results):
             title="Jobs",
             traceorder="normal"
         ),
-        yaxis=dict(autorange='reversed'),
+        yaxis=dict(autorange='reversed', categoryorder='array', categoryarray=machine_labels),
         template='plotly_white'
     )
-    
-    return fig.to_html(full_html=False, include_plotlyjs='cdn')
+    if font_size:
+        fig.update_layout(font=dict(size=font_size))
 
+    return fig
 
-def generate_comparison_chart(results_list):
-    """Genera gráfico de barras comparativo de makespan"""
-    fig = go.Figure()
-    
-    valid_results = [r for r in results_list if r['success']]
+
+def build_makespan_figure(results_list, font_size=None):
+    """
+    Construye la figura de barras comparativa de makespan
+
+    Returns:
+        Figure de Plotly o None si no hay resultados válidos
+    """
+    valid_results = [r for r in results_list if r.get('success', False)]
     
     if not valid_results:
-        return '<p>No hay resultados válidos para mostrar.</p>'
+        return None
+    
+    fig = go.Figure()
     
     fig.add_trace(go.Bar(
         x=[r['model_name'] for r in valid_results],
@@ -126,16 +155,23 @@ def generate_comparison_chart(results_list):
         margin=dict(l=50, r=50, t=80, b=120),
         template='plotly_white'
     )
+    if font_size:
+        fig.update_layout(font=dict(size=font_size))
     
-    return fig.to_html(full_html=False, include_plotlyjs='cdn')
+    return fig
 
 
-def generate_imbalance_chart(results_list):
-    """Genera gráfico de barras comparativo de desbalance"""
-    valid_results = [r for r in results_list if r['success'] and r.get('imbalance') is not None]
+def build_imbalance_figure(results_list, font_size=None):
+    """
+    Construye la figura de barras comparativa de desbalance
+
+    Returns:
+        Figure de Plotly o None si no hay datos de desbalance
+    """
+    valid_results = [r for r in results_list if r.get('success', False) and r.get('imbalance') is not None]
     
     if not valid_results:
-        return '<p>No hay datos de desbalance disponibles.</p>'
+        return None
     
     fig = go.Figure()
     
@@ -166,5 +202,208 @@ def generate_imbalance_chart(results_list):
         margin=dict(l=50, r=80, t=80, b=120),
         template='plotly_white'
     )
+    if font_size:
+        fig.update_layout(font=dict(size=font_size))
+    
+    return fig
+
+
+FIGURE_BUILDERS = {
+    'gantt': build_gantt_figure,
+    'makespan': build_makespan_figure,
+    'imbalance': build_imbalance_figure
+}
+
+
+def figure_data_key(kind, data):
+    """
+    Hash de los datos que determinan una figura
+
+    El Gantt usa el result_id de la programación; los gráficos de
+    comparación, un hash de (modelo, makespan, desbalance, éxito) por fila.
+
+    Returns:
+        Cadena hexadecimal o None si no se puede identificar (sin caché)
+    """
+    if kind == 'gantt':
+        return get_result_id(data)
+    rows = [(r.get('model_name'), r.get('makespan'), r.get('imbalance'), bool(r.get('success')))
+            for r in data]
+    return hashlib.sha256(json.dumps(rows, default=str).encode('utf-8')).hexdigest()[:16]
+
+
+def get_figure(kind, data, font_size=None):
+    """
+    Figura de un tipo para unos datos, construida una vez y cacheada
+
+    La figura devuelta se comparte entre peticiones: no debe modificarse.
+
+    Args:
+        kind: Tipo de figura (clave de FIGURE_BUILDERS)
+        data: Resultados (Gantt) o lista de resultados (comparación)
+        font_size: Tamaño de letra (forma parte de la clave)
+
+    Returns:
+        Figure de Plotly o None si no hay datos que dibujar
+    """
+    data_key = figure_data_key(kind, data)
+    key = (kind, data_key, font_size)
+    if data_key is not None:
+        fig = _figure_cache.get(key)
+        if fig is not None:
+            return fig
+
+    fig = FIGURE_BUILDERS[kind](data, font_size=font_size)
+    if fig is not None and data_key is not None:
+        _figure_cache.put(key, fig)
+    return fig
+
+
+def image_cache_key(kind, data, width, height, scale=2, font_size=None):
+    """Clave de la caché de imágenes (None si los datos no se pueden identificar)"""
+    data_key = figure_data_key(kind, data)
+    if data_key is None:
+        return None
+    return (kind, data_key, font_size, width, height, scale)
+
+
+def get_figure_image(kind, data, width, height, scale=2, font_size=None, images=None):
+    """
+    Imagen PNG de una figura, renderizada con kaleido una vez por parámetros
+
+    Args:
+        images: Imágenes ya renderizadas por render_figure_images (se
+                consultan antes que la caché)
+
+    Returns:
+        BytesIO con el PNG o None si no hay figura o falla el renderizado
+    """
+    key = image_cache_key(kind, data, width, height, scale, font_size)
+    png = None
+    if key is not None:
+        png = images.get(key) if images else None
+        if png is None:
+            png = _image_cache.get(key)
+
+    if png is None:
+        fig = get_figure(kind, data, font_size)
+        if fig is None:
+            return None
+        try:
+            png = fig.to_image(format="png", width=width, height=height, scale=scale)
+        except Exception as e:
+            logger.warning('Error generando imagen: %s', e)
+            return None
+        if key is not None:
+            _image_cache.put(key, png)
+
+    return BytesIO(png)
+
+
+def get_render_workers():
+    """Procesos de renderizado de imágenes (JOBSHOP_RENDER_WORKERS, por defecto hasta 4)"""
+    return max(1, int(os.environ.get('JOBSHOP_RENDER_WORKERS') or min(4, os.cpu_count() or 1)))
+
+
+def get_render_pool():
+    """
+    Pool de procesos compartido para renderizar imágenes con kaleido
+
+    kaleido serializa las peticiones de un mismo proceso, así que el
+    paralelismo requiere procesos. Se usa 'spawn' para no heredar los hilos
+    del servidor y el pool se reutiliza entre exportaciones (arrancar kaleido
+    cuesta más que renderizar).
+    """
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is None:
+            _render_pool = ProcessPoolExecutor(max_workers=get_render_workers(),
+                                               mp_context=multiprocessing.get_context('spawn'))
+        return _render_pool
+
+
+def discard_render_pool():
+    """Descarta un pool roto (p.ej. un proceso murió); el siguiente uso crea otro"""
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is not None:
+            _render_pool.shutdown(wait=False, cancel_futures=True)
+            _render_pool = None
+
+
+def render_figure_png(figure_json, width, height, scale):
+    """Renderiza una figura serializada (fig.to_json) a PNG; se ejecuta en el pool"""
+    import plotly.io as pio
+    return pio.from_json(figure_json).to_image(format="png", width=width, height=height, scale=scale)
+
+
+def render_figure_images(requests):
+    """
+    Renderiza en paralelo las imágenes que aún no están en caché
+
+    Las imágenes se devuelven además de guardarse en la caché: un lote
+    mayor que la caché LRU expulsaría las primeras antes de usarlas. El
+    llamador pasa el diccionario a get_figure_image (images=...). Si el pool
+    falla se deja el renderizado a get_figure_image.
+
+    Args:
+        requests: Lista de diccionarios con los argumentos de get_figure_image
+                  (kind, data, width, height y opcionalmente scale, font_size)
+
+    Returns:
+        Diccionario {clave de imagen: PNG} con las imágenes del lote
+        disponibles (ya cacheadas o renderizadas ahora)
+    """
+    images = {}
+    pending = {}
+    for request in requests:
+        kind, data = request['kind'], request['data']
+        width, height = request['width'], request['height']
+        scale, font_size = request.get('scale', 2), request.get('font_size')
+        key = image_cache_key(kind, data, width, height, scale, font_size)
+        if key is None or key in pending or key in images:
+            continue
+        png = _image_cache.get(key)
+        if png is not None:
+            images[key] = png
+            continue
+        fig = get_figure(kind, data, font_size)
+        if fig is not None:
+            pending[key] = (fig.to_json(), width, height, scale)
+
+    if len(pending) < 2 or get_render_workers() < 2:
+        return images
+
+    try:
+        executor = get_render_pool()
+        futures = {executor.submit(render_figure_png, *args): key for key, args in pending.items()}
+        for future in as_completed(futures):
+            try:
+                images[futures[future]] = future.result()
+                _image_cache.put(futures[future], images[futures[future]])
+            except BrokenProcessPool:
+                raise
+            except Exception as e:
+                logger.warning('Error generando imagen: %s', e)
+    except (BrokenProcessPool, OSError) as e:
+        logger.warning('Error en el pool de renderizado: %s', e)
+        discard_render_pool()
+    return images
+
+
+def generate_comparison_chart(results_list):
+    """Genera gráfico de barras comparativo de makespan"""
+    fig = get_figure('makespan', results_list)
+    if fig is None:
+        return '<p>No hay resultados válidos para mostrar.</p>'
+    
+    return fig.to_html(full_html=False, include_plotlyjs=False)
+
+
+def generate_imbalance_chart(results_list):
+    """Genera gráfico de barras comparativo de desbalance"""
+    fig = get_figure('imbalance', results_list)
+    if fig is None:
+        return '<p>No hay datos de desbalance disponibles.</p>'
     
-    return fig.to_html(full_html=False, include_plotlyjs='cdn')
+    return fig.to_html(full_html=False, include_plotlyjs=False)
@@ -0,0 +1,252 @@
+"""
+Helper para re-resolver una instancia partiendo de un resultado anterior
+"""
+from helpers.data_helper import parse_instance_from_dzn
+from helpers.scheduling_helper import list_schedule, build_results_from_schedule
+from helpers.cache_helper import hash_content
+from helpers.history_helper import best_known
+
+
+# Modos de cota histórica: 'bound' (end <= mejor) o 'improve' (end < mejor)
+HISTORY_BOUND_MODES = {
+    'bound': 'Cota con la mejor solución conocida',
+    'improve': 'Buscar solo soluciones mejores'
+}
+
+
+def get_previous_assignment(previous_results, model_type):
+    """Obtiene la matriz de asignación de recursos de un resultado previo"""
+    if model_type == 'op_limit':
+        return previous_results.get('operator_assignment')
+    if model_type == 'workers_skills':
+        return previous_results.get('worker_assignment')
+    return None
+
+
+def assignment_is_valid(assignment, instance):
+    """Verifica que una asignación previa siga siendo válida con los datos nuevos"""
+    model_type = instance['model_type']
+
+    if model_type == 'op_limit':
+        k = instance.get('k') or 0
+        return all(1 <= op <= k for row in assignment for op in row)
+
+    if model_type == 'workers_skills':
+        skills = instance.get('skills') or []
+        if len(skills) != instance['tasks']:
+            return False
+        return all(worker in skills[task]
+                   for row in assignment
+                   for task, worker in enumerate(row))
+
+    return True
+
+
+def repair_previous_schedule(previous_results, instance):
+    """
+    Adapta una programación anterior a los datos (posiblemente editados)
+
+    Conserva el orden relativo de las operaciones en cada máquina y recurso
+    y las asignaciones de operarios/trabajadores, y recalcula los inicios con
+    las duraciones nuevas mediante programación por lista. El resultado es
+    factible para el modelo, por lo que su makespan es una cota superior
+    válida para ``end``.
+
+    Args:
+        previous_results: Diccionario de resultados de una ejecución anterior
+        instance: Instancia parseada con parse_instance_from_dzn
+
+    Returns:
+        Diccionario de resultados reparados o None si no es reutilizable
+    """
+    model_type = instance['model_type']
+    durations = instance['durations']
+    previous_starts = previous_results.get('start_times')
+    if previous_starts is None:
+        previous_starts = []
+
+    if previous_results.get('model_type') != model_type:
+        return None
+
+    # Las dimensiones deben coincidir para reutilizar el orden anterior
+    if (len(previous_starts) != instance['jobs'] or
+            any(len(row) != instance['tasks'] for row in previous_starts)):
+        return None
+
+    assignment = get_previous_assignment(previous_results, model_type)
+    if assignment is not None:
+        # Copia mutable (list_schedule completa la asignación); admite arrays de Schedule
+        assignment = [[int(resource) for resource in row] for row in assignment]
+    if model_type in ('op_limit', 'workers_skills'):
+        if assignment is None or len(assignment) == 0 or not assignment_is_valid(assignment, instance):
+            return None
+
+    priority = sorted(
+        ((job, task) for job in range(instance['jobs']) for task in range(instance['tasks'])),
+        key=lambda op: (previous_starts[op[0]][op[1]], op[0], op[1])
+    )
+
+    start_times = list_schedule(
+        durations,
+        priority,
+        assignment=assignment,
+        breaks=instance.get('breaks')
+    )
+
+    num_resources = instance.get('k') if model_type == 'op_limit' else instance.get('W')
+    return build_results_from_schedule(start_times, durations, model_type, assignment, num_resources)
+
+
+def build_warm_start(previous_results, dzn_content, model_type):
+    """
+    Prepara un arranque en caliente a partir de un resultado anterior
+
+    Los modelos del repositorio definen su propio ``solve``, así que la
+    solución anterior se transmite como cota superior sobre ``end`` (válida
+    para cualquier solver) y la programación reparada queda disponible como
+    solución inmediata si el solver no mejora en el tiempo límite.
+
+    Returns:
+        Diccionario con 'bound', 'constraints' y 'results', o None
+    """
+    if not previous_results:
+        return None
+
+    instance = parse_instance_from_dzn(dzn_content, model_type)
+    repaired = repair_previous_schedule(previous_results, instance)
+    if repaired is None:
+        return None
+
+    bound = repaired['makespan']
+    repaired['durations'] = instance['durations']
+
+    return {
+        'bound': bound,
+        'constraints': [bound_constraint(bound)],
+        'results': repaired
+    }
+
+
+def bound_constraint(bound, strict=False):
+    """Restricción MiniZinc que acota ``end`` (estricta para buscar solo mejoras)"""
+    return f'constraint end {"<" if strict else "<="} {int(bound)};'
+
+
+def parse_history_bound(form):
+    """Modo de cota histórica de un formulario ('bound', 'improve' o None)"""
+    mode = form.get('history_bound') or None
+    return mode if mode in HISTORY_BOUND_MODES else None
+
+
+def build_history_start(dzn_content, model_type, mode):
+    """
+    Prepara una cota a partir de la mejor solución conocida de la instancia
+
+    La instancia se busca en el historial por su hash de contenido. En modo
+    'bound' se añade ``end <= mejor``; en modo 'improve' la cota es estricta,
+    de modo que UNSATISFIABLE demuestra que la mejor conocida es óptima.
+
+    Returns:
+        Diccionario con 'bound', 'strict', 'mode', 'constraints', 'results'
+        (la programación histórica) y 'source', o None si no hay historial
+    """
+    if mode not in HISTORY_BOUND_MODES:
+        return None
+
+    best = best_known(hash_content(dzn_content), model_type)
+    if best is None or not best.get('schedule'):
+        return None
+
+    instance = parse_instance_from_dzn(dzn_content, model_type)
+    schedule = best['schedule']
+    num_resources = instance.get('k') if model_type == 'op_limit' else instance.get('W')
+    results = build_results_from_schedule(schedule['s'], instance['durations'], model_type,
+                                          schedule.get('a'), num_resources)
+    results['durations'] = instance['durations']
+
+    strict = mode == 'improve'
+    bound = results['makespan']
+    return {
+        'bound': bound,
+        'strict': strict,
+        'mode': mode,
+        'constraints': [bound_constraint(bound, strict)],
+        'results': results,
+        'source': {
+            'run_id': best['id'],
+            'model_key': best['model_key'],
+            'solver': best['solver'],
+            'created_at': best['created_at'],
+            'proven_optimal': best['proven_optimal']
+        }
+    }
+
+
+def bounded_outcome(status, history_start):
+    """
+    Interpreta el estado de una resolución acotada con la mejor conocida
+
+    Args:
+        status: Estado del solver sin prefijo (p.ej. 'UNSATISFIABLE')
+        history_start: Resultado de build_history_start
+
+    Returns:
+        'improved', 'proved_optimal' (UNSAT con cota estricta),
+        'no_improvement' o None si no había cota histórica
+    """
+    if not history_start:
+        return None
+    if status in ('OPTIMAL_SOLUTION', 'SATISFIED', 'ALL_SOLUTIONS'):
+        return 'improved'
+    if status == 'UNSATISFIABLE' and history_start['strict']:
+        return 'proved_optimal'
+    return 'no_improvement'
+
+
+def fallback_results(status, warm_start, history_start):
+    """
+    Programación de partida que se muestra cuando una resolución acotada no mejora
+
+    Con una cota sobre ``end`` tanto UNKNOWN como UNSATISFIABLE significan que
+    el solver no encontró nada mejor (la cota puede ser demasiado ajustada,
+    p.ej. por la ruptura de simetrías de op_limit); la programación de
+    partida sigue siendo válida. Se usa la de menor makespan.
+
+    Args:
+        status: Estado del solver sin prefijo
+        warm_start: Resultado de build_warm_start o None
+        history_start: Resultado de build_history_start o None
+
+    Returns:
+        Diccionario de resultados con status 'WARM_START' o 'BEST_KNOWN', o
+        None si la resolución no estaba acotada o terminó con otro estado
+    """
+    if status not in ('UNKNOWN', 'UNSATISFIABLE'):
+        return None
+    fallback = min((start for start in (warm_start, history_start) if start),
+                   key=lambda start: start['bound'], default=None)
+    if fallback is None:
+        return None
+    return {
+        'status': 'WARM_START' if fallback is warm_start else 'BEST_KNOWN',
+        'execution_time': 'N/A',
+        **fallback['results']
+    }
+
+
+def strict_bound(history_start):
+    """Cota estricta aplicada (para registrar pruebas de optimalidad) o None"""
+    if history_start and history_start['strict']:
+        return history_start['bound']
+    return None
+
+
+def describe_history_start(history_start, outcome):
+    """Resumen serializable de la cota histórica para los resultados"""
+    return {
+        'mode': history_start['mode'],
+        'bound': history_start['bound'],
+        'strict': history_start['strict'],
+        'outcome': outcome,
+        **history_start['source']
+    }
@@ -0,0 +1,158 @@
+"""
+Tests del control de admisión (helpers/admission_helper.py)
+"""
+import time
+import asyncio
+import threading
+
+import pytest
+
+from helpers.admission_helper import AdmissionController, AdmissionRejected, current_max_wait
+
+
+def wait_until(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def start_waiter(admission, client, order, hold=None):
+    """Lanza un hilo que espera hueco, anota el cliente al obtenerlo y lo libera"""
+    def run():
+        with admission.admit(client):
+            order.append(client)
+            if hold is not None:
+                hold.wait()
+
+    queued = admission.queued
+    thread = threading.Thread(target=run)
+    thread.start()
+    wait_until(lambda: admission.queued > queued or client in order)
+    return thread
+
+
+def test_slots_limit_running_solvers():
+    admission = AdmissionController(2, max_queue=0, sync_wait=0.1)
+
+    with admission.admit('a'), admission.admit('b'):
+        assert admission.in_use == 2
+        with pytest.raises(AdmissionRejected):
+            with admission.admit('c'):
+                pass
+    assert admission.in_use == 0
+
+
+def test_full_queue_rejects_immediately():
+    admission = AdmissionController(1, max_queue=1, max_wait=5)
+    release = threading.Event()
+    order = []
+
+    with admission.admit('a'):
+        thread = start_waiter(admission, 'b', order, hold=release)
+        start = time.monotonic()
+        with pytest.raises(AdmissionRejected):
+            with admission.admit('c'):
+                pass
+        assert time.monotonic() - start < 1
+    release.set()
+    thread.join()
+    assert order == ['b']
+
+
+def test_ensure_capacity_counts_free_slots_and_queue():
+    admission = AdmissionController(2, max_queue=1)
+
+    admission.ensure_capacity(3)
+    with pytest.raises(AdmissionRejected):
+        admission.ensure_capacity(4)
+
+
+def test_sync_wait_caps_queue_wait():
+    admission = AdmissionController(1, max_queue=4, max_wait=30, sync_wait=0.1)
+
+    with admission.admit('a'):
+        start = time.monotonic()
+        with pytest.raises(AdmissionRejected):
+            with admission.admit('b'):
+                pass
+        assert time.monotonic() - start < 1
+        # El ticket expirado sale de la cola
+        assert admission.queued == 0
+
+
+def test_request_max_wait_overrides_sync_wait():
+    admission = AdmissionController(1, max_queue=4, max_wait=30, sync_wait=0.05)
+    holder = admission.admit('a')
+    holder.__enter__()
+    threading.Timer(0.2, holder.__exit__, (None, None, None)).start()
+
+    token = current_max_wait.set(2)
+    try:
+        with admission.admit('b'):
+            assert admission.in_use == 1
+    finally:
+        current_max_wait.reset(token)
+
+
+def test_waiting_clients_are_served_round_robin():
+    admission = AdmissionController(1, max_queue=8, max_wait=5)
+    order = []
+    threads = []
+
+    with admission.admit('a'):
+        threads.append(start_waiter(admission, 'a', order))
+        threads.append(start_waiter(admission, 'a', order))
+        threads.append(start_waiter(admission, 'b', order))
+    for thread in threads:
+        thread.join()
+
+    # El segundo ticket de 'a' espera su turno detrás de 'b'
+    assert order == ['a', 'b', 'a']
+
+
+def test_client_slots_let_other_clients_through():
+    admission = AdmissionController(2, max_queue=8, max_wait=5, client_slots=1)
+    release = threading.Event()
+    order = []
+
+    with admission.admit('a'):
+        thread_a = start_waiter(admission, 'a', order, hold=release)
+        thread_b = start_waiter(admission, 'b', order, hold=release)
+        wait_until(lambda: order == ['b'])
+        assert admission.queued == 1
+    wait_until(lambda: order == ['b', 'a'])
+    release.set()
+    thread_a.join()
+    thread_b.join()
+
+
+def test_async_waiter_is_woken_by_thread_release():
+    admission = AdmissionController(1, max_queue=4, max_wait=5)
+    holder = admission.admit('a')
+    holder.__enter__()
+
+    async def scenario():
+        threading.Timer(0.05, holder.__exit__, (None, None, None)).start()
+        start = time.monotonic()
+        async with admission.admit_async('b'):
+            assert admission.in_use == 1
+        return time.monotonic() - start
+
+    waited = asyncio.run(scenario())
+    assert 0.03 < waited < 1
+    assert admission.in_use == 0
+
+
+def test_async_wait_times_out_and_leaves_queue():
+    admission = AdmissionController(1, max_queue=4, max_wait=0.1)
+
+    async def scenario():
+        with admission.admit('a'):
+            with pytest.raises(AdmissionRejected):
+                async with admission.admit_async('b'):
+                    pass
+
+    asyncio.run(scenario())
+    assert admission.queued == 0
+    assert admission.in_use == 0
@@ -0,0 +1,100 @@
+"""
+Tests de los presupuestos de la comparación por carrera (controllers/controller_comparison.py)
+"""
+import math
+
+import controllers.controller_comparison as controller_comparison
+
+
+class FakeClock:
+    """Reloj simulado: cada tanda de workers avanza el presupuesto completo"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+
+def fake_parallel(clock, calls):
+    def run(models, test_filename, solver_key, timeout, models_config, models_folder, max_workers=4, **kwargs):
+        calls.append((len(models), timeout))
+        clock.now += math.ceil(len(models) / max_workers) * timeout
+        return [{'model_key': key, 'model_name': key, 'status': 'SATISFIED', 'success': True,
+                 'makespan': 10 + index, 'bound': None}
+                for index, key in enumerate(models)]
+    return run
+
+
+def test_racing_wall_time_stays_within_budget(monkeypatch):
+    clock = FakeClock()
+    calls = []
+    monkeypatch.setattr(controller_comparison, 'time', clock)
+    monkeypatch.setattr(controller_comparison, 'run_comparison_parallel', fake_parallel(clock, calls))
+
+    models = [f'm{i}' for i in range(10)]
+    results, rounds = controller_comparison.run_comparison_racing(
+        models, 'test.dzn', 'gecode', 60, {}, 'models', max_workers=2
+    )
+
+    assert clock.now <= 60
+    assert len(rounds) >= 2
+    # La primera ronda reparte su tiempo entre las 5 tandas de 2 workers
+    assert calls[0][0] == 10
+    assert calls[0][1] * 5 <= 60
+    assert results[0]['model_key'] == 'm0'
+
+
+def test_racing_single_wave_keeps_doubling_schedule(monkeypatch):
+    clock = FakeClock()
+    calls = []
+    monkeypatch.setattr(controller_comparison, 'time', clock)
+    monkeypatch.setattr(controller_comparison, 'run_comparison_parallel', fake_parallel(clock, calls))
+
+    controller_comparison.run_comparison_racing(
+        [f'm{i}' for i in range(8)], 'test.dzn', 'gecode', 70, {}, 'models', max_workers=8
+    )
+
+    assert [timeout for _, timeout in calls] == [10, 20, 40]
+    assert clock.now <= 70
+
+
+
+def test_cooperative_rounds_fit_in_budget(monkeypatch):
+    clock = FakeClock()
+    models_config = {f'm{i}': {'name': f'm{i}', 'type': 'maintenance', 'category': 'c', 'file': 'x.mzn'}
+                     for i in range(6)}
+
+    def fake_slice(model_key, test_path, solver_key, budget, *args, **kwargs):
+        return {'status': 'UNKNOWN', 'elapsed': budget, 'row': None}
+
+    monkeypatch.setattr(controller_comparison, 'time', clock)
+    monkeypatch.setattr(controller_comparison, 'preflight_models', lambda selected, *args: (list(selected), []))
+    monkeypatch.setattr(controller_comparison, 'load_history_start', lambda *args: None)
+    monkeypatch.setattr(controller_comparison.os.path, 'exists', lambda path: True)
+    monkeypatch.setattr(controller_comparison, 'run_cooperative_slice', fake_slice)
+
+    results, rounds = controller_comparison.run_comparison_cooperative(
+        list(models_config), 'test.dzn', 'gecode', 70, models_config, 'models', max_workers=2
+    )
+
+    # 6 modelos con 2 workers: cada ronda son 3 tandas de su presupuesto
+    assert sum(3 * cooperative_round['budget'] for cooperative_round in rounds) <= 70 + 0.1
+    assert len(results) == 6
+
+
+def test_preflight_rejects_models_not_offered_with_solver():
+    from helpers.registry_helper import MODELS
+
+    models = ['jobshop_op_limit_1', 'jobshop_op_limit_4']
+    runnable, rejected = controller_comparison.preflight_models(
+        models, 'missing.dzn', MODELS, 'models', 'org.chuffed.chuffed'
+    )
+    assert runnable == ['jobshop_op_limit_1']
+    assert [row['model_key'] for row in rejected] == ['jobshop_op_limit_4']
+    assert rejected[0]['status'] == 'ERROR: Solver no soportado'
+
+    runnable, rejected = controller_comparison.preflight_models(
+        models, 'missing.dzn', MODELS, 'models', 'org.gecode.gecode'
+    )
+    assert runnable == models and rejected == []
@@ -0,0 +1,39 @@
+"""
+Tests del horizonte rodante (controllers/controller_rolling_horizon.py)
+"""
+import os
+
+import pytest
+
+from controllers.controller_rolling_horizon import parse_window_options, build_window_model
+
+
+def test_window_options_are_parsed():
+    assert parse_window_options({'window_size': '8', 'window_overlap': '3'}) == (8, 3)
+    assert parse_window_options({}) == (10, 2)
+
+
+@pytest.mark.parametrize('form', [
+    {'window_size': 'abc', 'window_overlap': '2'},
+    {'window_size': '10', 'window_overlap': ''},
+    {'window_size': '0', 'window_overlap': '0'},
+    {'window_size': '-3', 'window_overlap': '0'},
+    {'window_size': '5', 'window_overlap': '5'},
+    {'window_size': '5', 'window_overlap': '-1'},
+])
+def test_invalid_window_options_are_rejected(form):
+    with pytest.raises(ValueError):
+        parse_window_options(form)
+
+
+def test_window_model_widens_horizon_and_drops_symmetry():
+    model_path = os.path.join(os.path.dirname(__file__), '..', 'models', 'jobshop_op_limit', 'jobshop_op_limit_4.mzn')
+    with open(model_path) as f:
+        source = build_window_model(f.read(), 37)
+
+    assert 'int: horizon = 37 + total;' in source
+    assert 'array[JOB, TASK] of var 0..horizon: s;' in source
+    assert 'int: ub_end = horizon;' in source
+    assert 'constraint o[1,1] = 1;' not in source
+    # Las cargas siguen sumando el trabajo total
+    assert 'constraint sum(p in OP)(carga[p]) = total;' in source
@@ -0,0 +1,80 @@
+"""
+Tests del presupuesto de núcleos (helpers/core_budget_helper.py)
+"""
+import time
+import asyncio
+import threading
+
+import pytest
+
+from helpers.admission_helper import AdmissionController, AdmissionRejected, current_max_wait
+from helpers.core_budget_helper import CoreBudget
+
+
+def test_reserve_clamps_to_budget():
+    budget = CoreBudget(4, sync_wait=0.1)
+
+    with budget.reserve(16) as cores:
+        assert cores == 4
+        assert budget.available == 0
+    assert budget.available == 4
+
+
+def test_reserve_times_out_with_admission_rejection():
+    budget = CoreBudget(2, sync_wait=0.1)
+
+    with budget.reserve(2):
+        start = time.monotonic()
+        with pytest.raises(AdmissionRejected):
+            with budget.reserve(1):
+                pass
+        assert time.monotonic() - start < 1
+    assert budget.available == 2
+
+
+def test_reserve_uses_request_max_wait():
+    budget = CoreBudget(1, sync_wait=5)
+    token = current_max_wait.set(0.1)
+    try:
+        with budget.reserve(1):
+            start = time.monotonic()
+            with pytest.raises(AdmissionRejected):
+                with budget.reserve(1):
+                    pass
+            assert time.monotonic() - start < 1
+    finally:
+        current_max_wait.reset(token)
+
+
+def test_reserve_waits_for_release():
+    budget = CoreBudget(1, sync_wait=5)
+    holder = budget.reserve(1)
+    holder.__enter__()
+    threading.Timer(0.05, holder.__exit__, (None, None, None)).start()
+
+    with budget.reserve(1) as cores:
+        assert cores == 1
+
+
+def test_core_timeout_releases_admission_slot():
+    admission = AdmissionController(1, max_queue=0, max_wait=1, sync_wait=0.1)
+    budget = CoreBudget(1, sync_wait=0.1)
+
+    with budget.reserve(1):
+        with pytest.raises(AdmissionRejected):
+            with admission.admit('a'), budget.reserve(1):
+                pass
+    assert admission.in_use == 0
+
+
+def test_reserve_async_times_out():
+    budget = CoreBudget(1, max_wait=0.1)
+
+    async def scenario():
+        async with budget.reserve_async(1):
+            with pytest.raises(AdmissionRejected):
+                async with budget.reserve_async(1):
+                    pass
+
+    asyncio.run(scenario())
+    assert budget.available == 1
@@ -0,0 +1,112 @@
+"""
+Tests del mejor conocido y de las pruebas de optimalidad (helpers/history_helper.py)
+"""
+import pytest
+
+from helpers.cache_helper import hash_content
+from helpers.history_helper import PROOF_STATUS, best_known, record_run, record_solve, strategy_history
+
+
+DZN = """jobs = 2;
+tasks = 2;
+
+d = [| 3, 2
+ | 1, 4 |];
+"""
+
+
+class FakeStatus:
+    def __init__(self, name):
+        self.name = name
+
+    def __str__(self):
+        return f'Status.{self.name}'
+
+
+class FakeResult:
+    """Resultado de MiniZinc mínimo: estado, estadísticas y solución"""
+
+    def __init__(self, status, end=None, objective_bound=None):
+        self.status = FakeStatus(status)
+        self.solution = {'end': end, 's': [[0, 3], [0, 3]]} if end is not None else None
+        self.statistics = {'solveTime': 0.5}
+        if objective_bound is not None:
+            self.statistics['objectiveBound'] = objective_bound
+
+    def __getitem__(self, name):
+        return self.solution[name]
+
+
+@pytest.fixture
+def history(tmp_path, monkeypatch):
+    db_path = str(tmp_path / 'history.sqlite3')
+    monkeypatch.setenv('JOBSHOP_HISTORY_DB', db_path)
+    data_path = tmp_path / 'instance.dzn'
+    data_path.write_text(DZN)
+    return str(data_path), hash_content(DZN.encode('utf-8')), db_path
+
+
+def test_bounded_unknown_is_not_a_proof(history):
+    data_path, instance_hash, db_path = history
+    record_solve(data_path, 'm', 'maintenance', 'gecode', FakeResult('SATISFIED', end=9))
+
+    record_solve(data_path, 'm', 'maintenance', 'gecode', FakeResult('UNKNOWN'), strict_bound=9)
+
+    assert strategy_history(path=db_path)[0]['status'] == 'UNKNOWN'
+    assert best_known(instance_hash, 'maintenance', path=db_path)['proven_optimal'] is False
+
+
+def test_solver_bound_on_feasible_run_is_not_a_proof(history):
+    data_path, instance_hash, db_path = history
+
+    # Una cota del solver que alcanza el makespan no basta sin OPTIMAL ni prueba
+    record_solve(data_path, 'm', 'maintenance', 'gecode', FakeResult('SATISFIED', end=9, objective_bound=9))
+
+    best = best_known(instance_hash, 'maintenance', path=db_path)
+    assert best['makespan'] == 9 and best['bound'] == 9
+    assert best['proven_optimal'] is False
+
+
+def test_unsat_strict_bound_proves_best_known(history):
+    data_path, instance_hash, db_path = history
+    record_solve(data_path, 'm', 'maintenance', 'gecode', FakeResult('SATISFIED', end=9))
+
+    record_solve(data_path, 'm', 'maintenance', 'gecode', FakeResult('UNSATISFIABLE'), strict_bound=9)
+
+    proof = strategy_history(path=db_path)[0]
+    assert proof['status'] == PROOF_STATUS and proof['bound'] == 9
+    assert best_known(instance_hash, 'maintenance', path=db_path)['proven_optimal'] is True
+
+
+def test_proof_below_best_known_does_not_prove_it(history):
+    data_path, instance_hash, db_path = history
+    record_solve(data_path, 'm', 'maintenance', 'gecode', FakeResult('SATISFIED', end=12))
+
+    record_solve(data_path, 'm', 'maintenance', 'gecode', FakeResult('UNSATISFIABLE'), strict_bound=10)
+
+    assert best_known(instance_hash, 'maintenance', path=db_path)['proven_optimal'] is False
+
+
+def test_best_known_only_improves(history):
+    _, instance_hash, db_path = history
+
+    # Ni una solución peor ni un makespan sin solución válida desplazan al mejor
+    runs = [('SATISFIED', 30, 30), ('SATISFIED', 25, 25), ('SATISFIED', 28, 25),
+            ('UNKNOWN', 20, 25), ('ERROR', 10, 25)]
+    for status, makespan, expected in runs:
+        record_run(instance_hash, 'm', 'gecode', status, makespan=makespan, model_type='maintenance',
+                   path=db_path)
+        assert best_known(instance_hash, 'maintenance', path=db_path)['makespan'] == expected
+
+    best = best_known(instance_hash, 'maintenance', path=db_path)
+    assert best['makespan'] == 25
+    assert best['proven_optimal'] is False
+
+
+def test_best_known_is_limited_to_the_family(history):
+    _, instance_hash, db_path = history
+    record_run(instance_hash, 'm', 'gecode', 'OPTIMAL_SOLUTION', makespan=7, model_type='op_limit',
+               path=db_path)
+
+    assert best_known(instance_hash, 'maintenance', path=db_path) is None
+    assert best_known(instance_hash, 'op_limit', path=db_path)['proven_optimal'] is True
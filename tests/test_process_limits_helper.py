@@ -0,0 +1,51 @@
+"""
+Tests de la cancelación de resoluciones por token (helpers/process_limits_helper.py)
+"""
+import pytest
+
+import helpers.process_limits_helper as process_limits_helper
+from helpers.admission_helper import current_client
+from helpers.process_limits_helper import cancel_run, current_run_token, limited_run
+
+
+class FakeRun:
+    def __init__(self, workdir, timeout, threads):
+        self.killed = 0
+
+    def kill(self):
+        self.killed += 1
+
+
+@pytest.fixture
+def fake_runs(monkeypatch):
+    monkeypatch.setattr(process_limits_helper, 'LimitedRun', FakeRun)
+    monkeypatch.setattr(process_limits_helper, 'limits_supported', lambda: True)
+
+
+def test_only_owner_can_cancel_run(fake_runs):
+    client = current_client.set('owner')
+    token = current_run_token.set('token-1')
+    try:
+        with limited_run(10) as run:
+            assert cancel_run('token-1', 'intruder') is None
+            assert run.killed == 0
+            assert cancel_run('token-1', 'owner') == 1
+            assert run.killed == 1
+    finally:
+        current_run_token.reset(token)
+        current_client.reset(client)
+
+
+def test_finished_or_unknown_tokens_are_not_found(fake_runs):
+    client = current_client.set('owner')
+    token = current_run_token.set('token-2')
+    try:
+        with limited_run(10):
+            pass
+    finally:
+        current_run_token.reset(token)
+        current_client.reset(client)
+
+    assert cancel_run('token-2', 'owner') is None
+    assert cancel_run('unknown', 'owner') is None
+    assert cancel_run(None, 'owner') is None
@@ -0,0 +1,121 @@
+"""
+Tests de la programación compacta (helpers/schedule_helper.py)
+"""
+import zlib
+
+import numpy as np
+import pytest
+
+from helpers.schedule_helper import (
+    HEADER, Schedule, get_result_id, pack_results, resource_loads, unpack_results
+)
+
+
+RESULTS = {
+    'model_type': 'op_limit',
+    'makespan': 9,
+    'status': 'OPTIMAL_SOLUTION',
+    'start_times': [[0, 3, 5], [0, 4, 7]],
+    'durations': [[3, 2, 4], [4, 1, 2]],
+    'operator_assignment': [[1, 2, 1], [2, 1, 2]],
+    'operator_load': [8, 8],
+}
+
+
+def assert_same_schedule(left, right):
+    assert left.model_type == right.model_type
+    assert left.num_resources == right.num_resources
+    for name in ('starts', 'durations', 'assignment', 'breaks'):
+        left_array, right_array = getattr(left, name), getattr(right, name)
+        if left_array is None or right_array is None:
+            assert left_array is right_array is None
+        else:
+            assert left_array.dtype == right_array.dtype == np.int32
+            np.testing.assert_array_equal(left_array, right_array)
+
+
+def test_from_results_uses_int32_arrays():
+    schedule = Schedule.from_results(RESULTS)
+
+    assert schedule.starts.dtype == np.int32
+    assert schedule.starts.shape == (2, 3)
+    assert schedule.num_resources == 2
+    assert schedule.makespan == 9
+
+
+def test_bytes_round_trip_preserves_schedule():
+    breaks = [[1, 2, 4], [3, 10, 12]]
+    schedule = Schedule.from_results(RESULTS, breaks=breaks)
+
+    data = schedule.to_bytes()
+    restored = Schedule.from_bytes(data)
+
+    assert_same_schedule(schedule, restored)
+    # La carga útil son los arrays int32 comprimidos con zlib
+    payload = zlib.decompress(data[HEADER.size:])
+    assert len(payload) == 4 * (3 * schedule.starts.size + len(breaks) * 3)
+
+
+def test_round_trip_without_assignment():
+    schedule = Schedule('maintenance', [[0, 2]], [[2, 3]])
+
+    restored = Schedule.from_bytes(schedule.to_bytes())
+
+    assert_same_schedule(schedule, restored)
+    assert restored.resource_loads() is None
+
+
+def test_from_bytes_rejects_foreign_data():
+    with pytest.raises(ValueError):
+        Schedule.from_bytes(b'JSS')
+    with pytest.raises(ValueError):
+        Schedule.from_bytes(b'XXXX' + Schedule.from_results(RESULTS).to_bytes()[4:])
+
+
+def test_pack_results_round_trip():
+    packed = pack_results(RESULTS)
+
+    assert 'start_times' not in packed and 'operator_load' not in packed
+    assert packed['makespan'] == 9 and packed['status'] == 'OPTIMAL_SOLUTION'
+    assert packed['result_id'] == get_result_id(RESULTS)
+
+    unpacked = unpack_results(packed)
+    for key in ('start_times', 'durations', 'operator_assignment', 'operator_load'):
+        np.testing.assert_array_equal(unpacked[key], RESULTS[key])
+    assert 'schedule' not in unpacked
+
+
+def test_equal_schedules_share_result_id():
+    copy = {key: [list(row) for row in value] if key in ('start_times', 'durations', 'operator_assignment')
+            else value for key, value in RESULTS.items()}
+    changed = dict(copy, start_times=[[0, 3, 5], [0, 4, 8]])
+
+    assert pack_results(copy)['schedule'] == pack_results(RESULTS)['schedule']
+    assert get_result_id(copy) == get_result_id(RESULTS)
+    assert get_result_id(changed) != get_result_id(RESULTS)
+
+
+def test_pack_results_leaves_results_without_schedule():
+    results = {'status': 'UNKNOWN', 'makespan': None}
+
+    assert pack_results(results) is results
+    assert unpack_results(results) is results
+    assert get_result_id(results) is None
+
+
+def test_resource_loads_ignores_unassigned_operations():
+    assignment = np.array([[1, 0, 2], [-1, 2, 3]])
+    durations = np.array([[3, 5, 4], [7, 1, 2]])
+
+    loads = resource_loads(assignment, durations, 2)
+
+    # El 0, el -1 y el 3 (fuera de 1..2) no suman carga
+    np.testing.assert_array_equal(loads, [3, 5])
+    assert loads.dtype == np.int64
+
+
+def test_resource_loads_without_assignment():
+    durations = np.ones((2, 2))
+
+    assert resource_loads(None, durations, 2) is None
+    assert resource_loads(np.ones((2, 2)), durations, 0) is None
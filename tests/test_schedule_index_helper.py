@@ -0,0 +1,97 @@
+"""
+Tests de los índices precalculados de una programación (helpers/schedule_index_helper.py)
+"""
+import numpy as np
+
+from helpers.schedule_helper import INDEX_KEY
+from helpers.schedule_index_helper import EVENT_END, EVENT_START, ScheduleIndex, get_schedule_index
+
+
+# 3 jobs x 2 máquinas sin solapes; el job 2 usa la máquina 0 entre los jobs 1 y 0
+STARTS = [[4, 7], [0, 2], [2, 4]]
+DURATIONS = [[3, 1], [2, 2], [2, 3]]
+ASSIGNMENT = [[1, 2], [1, 2], [1, 2]]
+
+
+def test_machine_sequence_orders_jobs_by_start():
+    index = ScheduleIndex(STARTS, DURATIONS)
+
+    jobs, starts, ends = index.machine_sequence(0)
+    assert jobs.tolist() == [1, 2, 0]
+    assert starts.tolist() == [0, 2, 4]
+    assert ends.tolist() == [2, 4, 7]
+
+    jobs, starts, _ = index.machine_sequence(1)
+    assert jobs.tolist() == [1, 2, 0]
+    assert starts.tolist() == [2, 4, 7]
+
+
+def test_machine_sequence_ties_keep_job_order():
+    index = ScheduleIndex([[0, 5], [0, 1]], [[1, 1], [1, 1]])
+
+    assert index.machine_sequence(0)[0].tolist() == [0, 1]
+
+
+def test_resource_sequence_orders_operations_by_start():
+    index = ScheduleIndex(STARTS, DURATIONS, ASSIGNMENT)
+
+    jobs, tasks = index.resource_sequence(1)
+    assert list(zip(jobs.tolist(), tasks.tolist())) == [(1, 0), (2, 0), (0, 0)]
+    jobs, tasks = index.resource_sequence(2)
+    assert list(zip(jobs.tolist(), tasks.tolist())) == [(1, 1), (2, 1), (0, 1)]
+    assert index.resource_sequence(3)[0].size == 0
+    np.testing.assert_array_equal(index.resource_loads(), [7, 6])
+
+
+def test_events_put_ends_before_starts_at_same_time():
+    index = ScheduleIndex(STARTS, DURATIONS)
+
+    times, kinds, jobs, tasks = index.events()
+    assert times.tolist() == sorted(times.tolist())
+    # En t=2 termina el job 1 en la máquina 0 antes de que empiecen los demás
+    at_two = [(int(kind), int(job), int(task)) for time, kind, job, task in zip(times, kinds, jobs, tasks)
+              if time == 2]
+    assert at_two[0] == (EVENT_END, 1, 0)
+    assert all(kind == EVENT_START for kind, _, _ in at_two[1:])
+
+
+def test_valid_schedule_has_no_overlaps():
+    index = ScheduleIndex(STARTS, DURATIONS, ASSIGNMENT)
+
+    assert index.machine_overlaps() == []
+    assert index.resource_overlaps() == []
+    assert index.precedence_violations() == []
+
+
+def test_overlaps_are_detected_per_machine_and_resource():
+    # El job 0 entra en la máquina 1 (t=4) antes de que el job 1 la libere (t=5)
+    starts = [[1, 4], [0, 1]]
+    durations = [[3, 2], [1, 4]]
+    index = ScheduleIndex(starts, durations, [[1, 2], [1, 2]])
+
+    assert index.machine_overlaps() == [(1, (1, 1), (0, 1))]
+    # El operario 2 lleva esas mismas operaciones; el 1 encadena sin solape
+    assert index.resource_overlaps() == [(2, (1, 1), (0, 1))]
+
+
+def test_touching_and_zero_length_operations_do_not_overlap():
+    index = ScheduleIndex([[0, 2], [2, 2]], [[2, 0], [1, 3]])
+
+    assert index.machine_overlaps() == []
+
+
+def test_precedence_violations_report_job_and_task():
+    index = ScheduleIndex([[0, 2], [0, 5]], [[3, 1], [2, 1]])
+
+    assert index.precedence_violations() == [(0, 0)]
+
+
+def test_get_schedule_index_is_cached_in_results():
+    results = {'model_type': 'op_limit', 'start_times': STARTS, 'durations': DURATIONS,
+               'operator_assignment': ASSIGNMENT, 'operator_load': [7, 6]}
+
+    index = get_schedule_index(results)
+    assert results[INDEX_KEY] is index
+    assert get_schedule_index(results) is index
+    assert index.num_resources == 2
+    assert get_schedule_index({'status': 'UNKNOWN'}) is None
@@ -0,0 +1,39 @@
+"""
+Tests del ranking de la selección automática (helpers/selection_helper.py)
+"""
+from helpers.features_helper import FEATURE_NAMES
+from helpers.selection_helper import SelectionModel
+
+
+def make_features(offset):
+    return {name: 1.0 + offset for name in FEATURE_NAMES}
+
+
+def make_run(instance_hash, model_key, status, solve_time, makespan=None, timeout=60):
+    return {'instance_hash': instance_hash, 'model_key': model_key, 'solver': 'gecode', 'status': status,
+            'makespan': makespan, 'solve_time': solve_time, 'timeout': timeout}
+
+
+def test_single_config_timeouts_do_not_outrank_fast_proof():
+    # Cada configuración es la única ejecutada en sus instancias
+    features = {'a': make_features(0.0), 'b': make_features(0.01), 'c': make_features(0.02)}
+    runs = [
+        make_run('a', 'timeouts', 'UNKNOWN', 60.0),
+        make_run('b', 'timeouts', 'UNKNOWN', 60.0),
+        make_run('c', 'fast', 'OPTIMAL_SOLUTION', 1.0, makespan=10),
+    ]
+    ranking = SelectionModel('op_limit', features, runs).rank(make_features(0.01))
+
+    assert [entry['model_key'] for entry in ranking] == ['fast', 'timeouts']
+    assert ranking[0]['score'] < ranking[1]['score']
+
+
+def test_unsolved_runs_cost_more_than_unproved_solutions():
+    features = {'a': make_features(0.0)}
+    runs = [
+        make_run('a', 'solved', 'SATISFIED', 60.0, makespan=10),
+        make_run('a', 'failed', 'ERROR', 0.5),
+    ]
+    ranking = SelectionModel('op_limit', features, runs).rank(make_features(0.0))
+
+    assert [entry['model_key'] for entry in ranking] == ['solved', 'failed']
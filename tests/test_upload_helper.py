@@ -0,0 +1,96 @@
+"""
+Tests de la ingesta de instancias (helpers/upload_helper.py)
+"""
+import io
+import os
+import hashlib
+
+import pytest
+
+from helpers.upload_helper import (
+    UploadRejected, ingest_stream, instance_path, load_instance_metadata, read_instance_preview
+)
+
+
+DZN = b"""% instancia de prueba
+jobs = 2;
+tasks = 3;
+k = 2;
+
+d = [| 3, 2, 1
+ | 1, 4, 2 |];
+"""
+
+
+def stored_files(folder):
+    return sorted(os.path.relpath(os.path.join(root, name), folder)
+                  for root, _, names in os.walk(folder) for name in names)
+
+
+def test_ingest_stores_by_content_hash(tmp_path):
+    info = ingest_stream(io.BytesIO(DZN), str(tmp_path))
+
+    content_hash = hashlib.sha256(DZN).hexdigest()
+    assert info['hash'] == content_hash
+    assert info['size'] == len(DZN)
+    assert (info['jobs'], info['tasks'], info['k']) == (2, 3, 2)
+    assert info['duplicate'] is False
+    with open(instance_path(str(tmp_path), content_hash), 'rb') as f:
+        assert f.read() == DZN
+    assert load_instance_metadata(str(tmp_path), content_hash)['jobs'] == 2
+
+
+def test_duplicate_upload_is_stored_once(tmp_path):
+    first = ingest_stream(io.BytesIO(DZN), str(tmp_path))
+    files = stored_files(str(tmp_path))
+
+    second = ingest_stream(io.BytesIO(DZN), str(tmp_path))
+
+    assert second['duplicate'] is True
+    assert second['hash'] == first['hash']
+    assert stored_files(str(tmp_path)) == files
+
+
+def test_oversized_upload_is_rejected_without_leftovers(tmp_path):
+    with pytest.raises(UploadRejected, match='tamaño máximo'):
+        ingest_stream(io.BytesIO(DZN), str(tmp_path), max_bytes=len(DZN) - 1)
+
+    assert stored_files(str(tmp_path)) == []
+
+
+def test_non_utf8_upload_is_rejected(tmp_path):
+    with pytest.raises(UploadRejected, match='UTF-8'):
+        ingest_stream(io.BytesIO(DZN.replace(b'prueba', b'\xff\xfe')), str(tmp_path))
+
+    assert stored_files(str(tmp_path)) == []
+
+
+def test_ragged_duration_matrix_is_rejected(tmp_path):
+    ragged = b'jobs = 2;\ntasks = 3;\nd = [| 3, 2, 1\n | 1, 4 |];\n'
+
+    with pytest.raises(UploadRejected, match='longitudes distintas'):
+        ingest_stream(io.BytesIO(ragged), str(tmp_path))
+
+
+def test_missing_duration_matrix_is_rejected(tmp_path):
+    with pytest.raises(UploadRejected, match='matriz de duraciones'):
+        ingest_stream(io.BytesIO(b'jobs = 2;\n'), str(tmp_path))
+
+
+@pytest.mark.parametrize('content_hash', [
+    None, '', '../' * 20 + 'etc/passwd', 'A' * 64, 'a' * 63, 'a' * 64 + '/..',
+])
+def test_instance_path_rejects_malformed_hashes(tmp_path, content_hash):
+    with pytest.raises(UploadRejected):
+        instance_path(str(tmp_path), content_hash)
+
+    assert load_instance_metadata(str(tmp_path), content_hash) is None
+    assert read_instance_preview(str(tmp_path), content_hash) is None
+
+
+def test_instance_path_stays_inside_store(tmp_path):
+    content_hash = 'ab' + 'c' * 62
+
+    path = instance_path(str(tmp_path), content_hash)
+
+    assert path == os.path.join(str(tmp_path), 'ab', content_hash + '.dzn')
@@ -0,0 +1,44 @@
+"""
+Tests del arranque en caliente y de la programación de respaldo (helpers/warmstart_helper.py)
+"""
+from helpers.warmstart_helper import build_warm_start, fallback_results
+
+
+DZN = """jobs = 2;
+tasks = 2;
+k = 2;
+
+d = [| 3, 2
+ | 1, 4 |];
+"""
+
+PREVIOUS = {
+    'model_type': 'op_limit',
+    'start_times': [[0, 3], [0, 5]],
+    'operator_assignment': [[1, 1], [2, 2]],
+}
+
+
+def test_bounded_unsat_returns_warm_start_schedule():
+    warm_start = build_warm_start(PREVIOUS, DZN, 'op_limit')
+
+    results = fallback_results('UNSATISFIABLE', warm_start, None)
+
+    assert results['status'] == 'WARM_START'
+    assert results['makespan'] == warm_start['bound']
+    assert [list(row) for row in results['start_times']] == [list(row) for row in warm_start['results']['start_times']]
+
+
+def test_fallback_only_applies_to_bounded_solves_without_solution():
+    warm_start = build_warm_start(PREVIOUS, DZN, 'op_limit')
+
+    assert fallback_results('UNKNOWN', warm_start, None)['status'] == 'WARM_START'
+    assert fallback_results('SATISFIED', warm_start, None) is None
+    assert fallback_results('UNSATISFIABLE', None, None) is None
+
+
+def test_fallback_prefers_lowest_bound():
+    warm_start = build_warm_start(PREVIOUS, DZN, 'op_limit')
+    history_start = {'bound': warm_start['bound'] - 1, 'results': {'makespan': warm_start['bound'] - 1}}
+
+    assert fallback_results('UNSATISFIABLE', warm_start, history_start)['status'] == 'BEST_KNOWN'